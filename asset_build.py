@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Asset Builder for Anurag Mishra's Portfolio Website
+This module minifies the site's HTML, CSS and JavaScript and gives the
+stylesheet and script content-hashed filenames, so the built site in dist/
+can be served with long-lived cache headers.
+
+The minifiers are deliberately conservative: they only remove comments and
+whitespace that cannot change how the page renders or how the script runs.
+"""
+
+import os
+import re
+import shutil
+import hashlib
+from html.parser import HTMLParser
+
+# Output directory for the built site; sources are never modified
+DIST_DIR = 'dist'
+
+# Length of the content hash embedded in fingerprinted filenames
+FINGERPRINT_LENGTH = 8
+
+# Elements whose text content must be kept exactly as written
+PRESERVE_WHITESPACE = {'pre', 'textarea'}
+
+# Characters around which CSS never needs whitespace. ':' is excluded on the
+# left because "a :hover" and "a:hover" are different selectors.
+_CSS_TIGHT = set('{};,>')
+
+def minify_css(source):
+    """
+    Strip comments and redundant whitespace from a stylesheet
+    """
+    out = []
+    i = 0
+    length = len(source)
+    pending_space = False
+    while i < length:
+        char = source[i]
+        if char == '/' and source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = length if end < 0 else end + 2
+            pending_space = True
+            continue
+        if char in '"\'':
+            end = i + 1
+            while end < length and source[end] != char:
+                end += 2 if source[end] == '\\' else 1
+            if pending_space and out and out[-1][-1] not in _CSS_TIGHT and out[-1][-1] != ':':
+                out.append(' ')
+            pending_space = False
+            out.append(source[i:end + 1])
+            i = end + 1
+            continue
+        if char.isspace():
+            pending_space = True
+            i += 1
+            continue
+        if pending_space and out and char not in _CSS_TIGHT \
+                and out[-1][-1] not in _CSS_TIGHT and out[-1][-1] != ':':
+            out.append(' ')
+        pending_space = False
+        # Drop the last declaration's semicolon before a closing brace
+        if char == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(char)
+        i += 1
+    return ''.join(out)
+
+# Tokens after which a '/' starts a regular expression rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete',
+                   'void', 'throw', 'case', 'do', 'else'}
+
+def _regex_allowed(out):
+    # Look back past whitespace at the previous significant token
+    text = ''.join(out[-8:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in _REGEX_PRECEDERS:
+        return True
+    match = re.search(r'[A-Za-z_$][\w$]*$', text)
+    return bool(match) and match.group(0) in _REGEX_KEYWORDS
+
+def minify_js(source):
+    """
+    Strip comments, indentation, trailing whitespace and blank lines from a script
+
+    Line breaks are kept so automatic semicolon insertion behaves exactly as
+    in the source. Strings, template literals and regular expressions are
+    copied verbatim.
+    """
+    out = []
+    i = 0
+    length = len(source)
+    # Stack of open template literals; each entry is the brace depth of the
+    # ${...} expression currently being scanned inside it
+    templates = []
+    while i < length:
+        char = source[i]
+        if templates and templates[-1] is None:
+            # Inside template literal text
+            start = i
+            while i < length:
+                if source[i] == '\\':
+                    i += 2
+                elif source[i] == '`':
+                    templates.pop()
+                    i += 1
+                    break
+                elif source.startswith('${', i):
+                    templates[-1] = 0
+                    i += 2
+                    break
+                else:
+                    i += 1
+            out.append(source[start:i])
+            continue
+        if char == '`':
+            templates.append(None)
+            out.append(char)
+            i += 1
+            continue
+        if templates and char == '{':
+            templates[-1] += 1
+        elif templates and char == '}':
+            if templates[-1] == 0:
+                templates[-1] = None
+                out.append(char)
+                i += 1
+                continue
+            templates[-1] -= 1
+        if char in '"\'':
+            end = i + 1
+            while end < length and source[end] != char and source[end] != '\n':
+                end += 2 if source[end] == '\\' else 1
+            out.append(source[i:end + 1])
+            i = end + 1
+            continue
+        if char == '/' and source.startswith('//', i):
+            end = source.find('\n', i)
+            i = length if end < 0 else end
+            continue
+        if char == '/' and source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            newline = '\n' in source[i:end]
+            i = length if end < 0 else end + 2
+            out.append('\n' if newline else ' ')
+            continue
+        if char == '/' and _regex_allowed(out):
+            end = i + 1
+            in_class = False
+            while end < length and source[end] != '\n':
+                if source[end] == '\\':
+                    end += 2
+                    continue
+                if source[end] == '[':
+                    in_class = True
+                elif source[end] == ']':
+                    in_class = False
+                elif source[end] == '/' and not in_class:
+                    break
+                end += 1
+            out.append(source[i:end + 1])
+            i = end + 1
+            continue
+        if char == '\n':
+            # Trailing whitespace and blank lines never matter
+            while out and out[-1] in (' ', '\t', '\r'):
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append(char)
+            i += 1
+            continue
+        if char in ' \t\r':
+            # Indentation and repeated spaces never matter
+            if not out or out[-1] in ('\n', ' ', '\t', '\r'):
+                i += 1
+                continue
+        out.append(char)
+        i += 1
+    return ''.join(out).strip()
+
+def _collapse_tag(raw):
+    # Collapse whitespace between attributes but never inside quoted values
+    collapsed = re.sub(r'("[^"]*"|\'[^\']*\')|\s+', lambda m: m.group(1) or ' ', raw)
+    return re.sub(r'\s+(/?>)$', r'\1', collapsed)
+
+class _HTMLMinifier(HTMLParser):
+    """
+    Re-emit an HTML document without comments or redundant whitespace
+
+    Start tags are copied as written apart from rewritten URLs; inline
+    <style> and <script> bodies are passed through the CSS and JS minifiers.
+    """
+
+    def __init__(self, rewrites):
+        super().__init__(convert_charrefs=False)
+        self.rewrites = rewrites
+        self.out = []
+        self.stack = []
+
+    def handle_decl(self, decl):
+        self.out.append(f'<!{decl}>')
+
+    def handle_starttag(self, tag, attrs):
+        raw = self.get_starttag_text()
+        for name, value in attrs:
+            if name in ('href', 'src') and value in self.rewrites:
+                raw = re.sub(rf'(\s{name}\s*=\s*)(["\']?){re.escape(value)}\2',
+                             lambda m: f'{m.group(1)}{m.group(2)}{self.rewrites[value]}{m.group(2)}',
+                             raw, count=1)
+        self.out.append(_collapse_tag(raw))
+        if tag in PRESERVE_WHITESPACE or tag in ('script', 'style'):
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if self.stack and self.stack[-1] == tag:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        if self.stack and self.stack[-1] == tag:
+            self.stack.pop()
+        self.out.append(f'</{tag}>')
+
+    def handle_data(self, data):
+        if self.stack and self.stack[-1] == 'style':
+            self.out.append(minify_css(data))
+        elif self.stack and self.stack[-1] == 'script':
+            self.out.append(minify_js(data))
+        elif self.stack:
+            self.out.append(data)
+        else:
+            text = re.sub(r'\s+', ' ', data)
+            # A dropped comment must not leave two collapsed gaps side by side
+            if text.startswith(' ') and self.out and self.out[-1].endswith(' '):
+                text = text[1:]
+            if text:
+                self.out.append(text)
+
+    def handle_entityref(self, name):
+        self.out.append(f'&{name};')
+
+    def handle_charref(self, name):
+        self.out.append(f'&#{name};')
+
+    def handle_comment(self, data):
+        # Keep conditional comments, which some browsers still interpret
+        if data.startswith('[if') or data.startswith('<![endif'):
+            self.out.append(f'<!--{data}-->')
+
+    def handle_pi(self, data):
+        self.out.append(f'<?{data}>')
+
+    def unknown_decl(self, data):
+        self.out.append(f'<![{data}]>')
+
+def minify_html(source, rewrites=None):
+    """
+    Minify an HTML document, replacing href/src values found in `rewrites`
+    """
+    minifier = _HTMLMinifier(rewrites or {})
+    minifier.feed(source)
+    minifier.close()
+    html = ''.join(minifier.out)
+    # Text already collapsed whitespace between tags to one space, which is
+    # kept: next to an inline or inline-block element it is a visible gap.
+    # Only the document head, which never renders, and the gaps around
+    # <html>, <head> and <body> themselves lose it entirely.
+    head_end = html.find('</head>')
+    if head_end != -1:
+        head_end += len('</head>')
+        html = re.sub(r'>\s+<', '><', html[:head_end]) + html[head_end:]
+    html = re.sub(r'(<(?:html|head|body)\b[^>]*>)\s+', r'\1', html)
+    return re.sub(r'>\s+<(?=/?(?:html|head|body)\b)', '><', html).strip()
+
+def fingerprint(path, content):
+    """
+    Return `path` with a content hash inserted before its extension,
+    e.g. styles.css -> styles.3f9a1c2e.css
+    """
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:FINGERPRINT_LENGTH]
+    root, ext = os.path.splitext(path)
+    return f'{root}.{digest}{ext}'
+
+def strip_fingerprint(path):
+    """
+    Undo fingerprint(): styles.3f9a1c2e.css -> styles.css
+    """
+    return re.sub(rf'\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}(\.[^.]+)$', r'\1', path)
+
+def build_site(dist_dir=DIST_DIR, html_files=('index.html',),
+               fingerprinted=('styles.css', 'script.js'), copied=('resources',)):
+    """
+    Build the minified, fingerprinted site into `dist_dir`
+
+    Returns a list of {"source", "output", "original", "minified"} records,
+    one per minified file.
+    """
+    minifiers = {'.css': minify_css, '.js': minify_js}
+    if os.path.isdir(dist_dir):
+        shutil.rmtree(dist_dir)
+    os.makedirs(dist_dir)
+
+    report = []
+    rewrites = {}
+    for source in fingerprinted:
+        with open(source, 'r', encoding='utf-8') as f:
+            original = f.read()
+        minified = minifiers[os.path.splitext(source)[1]](original)
+        output = fingerprint(source, minified)
+        with open(os.path.join(dist_dir, output), 'w', encoding='utf-8') as f:
+            f.write(minified)
+        rewrites[source] = output
+        report.append({
+            "source": source,
+            "output": output,
+            "original": len(original.encode('utf-8')),
+            "minified": len(minified.encode('utf-8')),
+        })
+
+    for source in html_files:
+        with open(source, 'r', encoding='utf-8') as f:
+            original = f.read()
+        minified = minify_html(original, rewrites)
+        with open(os.path.join(dist_dir, source), 'w', encoding='utf-8') as f:
+            f.write(minified)
+        report.append({
+            "source": source,
+            "output": source,
+            "original": len(original.encode('utf-8')),
+            "minified": len(minified.encode('utf-8')),
+        })
+
+    for path in copied:
+        if os.path.isdir(path):
+            shutil.copytree(path, os.path.join(dist_dir, path))
+        elif os.path.isfile(path):
+            shutil.copy2(path, os.path.join(dist_dir, path))
+
+    return report
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Build Benchmarks for Anurag Mishra's Portfolio Website
+This module times the build pipeline's main steps (content rendering, the
+resume PDF, the HTML checks and a full deploy) on a copy of the real site
+and on synthetic copies with the content model's projects and the
+stylesheet scaled up. Each run's median, p95 and peak memory are appended
+to a JSON history file and compared with the previous run, so slowdowns
+show up as regressions instead of going unnoticed.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import platform
+import statistics
+import subprocess
+import contextlib
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory is then read from /proc or left at 0
+    resource = None
+
+from load_test import percentile
+from link_checker import collect_links, classify, save_link_cache, LINK_CACHE_FILE
+from site_content import render_site, CONTENT_FILE, SITE_PAGE, TEMPLATE_DIR, RENDER_CACHE_FILE
+
+# Where every benchmark run is appended
+BENCHMARK_HISTORY_FILE = os.path.join('.deploy-cache', 'benchmark-history.json')
+
+# Input sizes, as multiples of the real site's projects and stylesheet
+DEFAULT_SCALES = (1, 10, 100, 1000)
+
+# Timed runs per case (after one untimed warm-up run), and the wall time
+# after which a case stops repeating once it has MIN_REPEAT runs
+DEFAULT_REPEAT = 5
+MIN_REPEAT = 3
+CASE_TIME_LIMIT = 120.0
+
+# A median time or peak memory this much above the baseline is a regression
+REGRESSION_THRESHOLD = 0.10
+
+# Left out when the site is copied for a benchmark
+COPY_IGNORED = ('.git', 'dist', '.deploy-cache', '__pycache__', 'resumes', '*.pdf')
+
+def _quietly(func, *args, **kwargs):
+    # Stage functions print as they go; a benchmark only wants their timing
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        return func(*args, **kwargs)
+
+def _bench_render_content():
+    # Without the render cache every region is rendered again
+    if os.path.exists(RENDER_CACHE_FILE):
+        os.remove(RENDER_CACHE_FILE)
+    render_site()
+
+def _bench_create_resume():
+    import generate_resume
+    result = generate_resume.create_resume('resume.pdf', compact=True)
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+
+def _bench_html_checks():
+    import deploy
+    parts = {}
+    for check in (deploy.validate_html, deploy.check_links, deploy.check_link_graph_stage):
+        started = time.perf_counter()
+        _quietly(check)
+        parts[check.__name__] = time.perf_counter() - started
+    return parts
+
+def _bench_deploy():
+    import deploy
+    argv = sys.argv
+    sys.argv = ['deploy.py', '--force']
+    try:
+        _quietly(deploy.main)
+    except SystemExit:
+        # An over-budget synthetic site blocks the deploy; it still ran every stage
+        pass
+    finally:
+        sys.argv = argv
+    with open(deploy.STAGE_EVENTS_FILE, 'r') as f:
+        events = json.load(f)
+    return {event["stage"]: event["duration"] for event in events}
+
+# The benchmarked steps, in the order they are run and reported. A step
+# may return {part: seconds} to have its parts (a deploy's stages) timed too.
+CASES = {
+    'render_content': _bench_render_content,
+    'create_resume': _bench_create_resume,
+    'html_checks': _bench_html_checks,
+    'deploy': _bench_deploy,
+}
+
+# Largest default scale per step. Critical CSS extraction grows with rules
+# times elements, so a full deploy of the 100x site already takes many
+# minutes per run; pass explicit scales to go further.
+MAX_DEFAULT_SCALE = {'deploy': 10}
+
+def scale_projects(projects, scale):
+    """
+    Return `scale` copies of every project, the first keeping its real id
+
+    Later copies get numbered ids and names, so the page and the resume
+    grow with the scale while the roles' project orders stay valid.
+    """
+    scaled = []
+    for copy in range(scale):
+        for project in projects:
+            if copy:
+                project = dict(project, id=f"{project['id']}-{copy + 1}",
+                               name=f"{project['name']} #{copy + 1}")
+            scaled.append(project)
+    return scaled
+
+def write_synthetic_site(workdir, scale, root='.'):
+    """
+    Copy the site into `workdir` with its projects and stylesheet scaled
+    `scale` times, and render the page from the scaled content
+
+    External links are recorded as working in the copy's link cache, so
+    the benchmark never touches the network.
+    """
+    shutil.copytree(root, workdir, ignore=shutil.ignore_patterns(*COPY_IGNORED))
+    if scale > 1:
+        content_path = os.path.join(workdir, CONTENT_FILE)
+        with open(content_path, 'r', encoding='utf-8') as f:
+            model = json.load(f)
+        model["projects"] = scale_projects(model["projects"], scale)
+        with open(content_path, 'w', encoding='utf-8') as f:
+            json.dump(model, f, indent=2, ensure_ascii=False)
+
+        css_path = os.path.join(workdir, 'styles.css')
+        with open(css_path, 'r', encoding='utf-8') as f:
+            css = f.read()
+        with open(css_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join([css] * scale))
+
+    page = os.path.join(workdir, SITE_PAGE)
+    render_site(page, os.path.join(workdir, CONTENT_FILE), os.path.join(workdir, TEMPLATE_DIR),
+                os.path.join(workdir, RENDER_CACHE_FILE))
+
+    links, _ = collect_links(page)
+    now = time.time()
+    save_link_cache({link.url.split('#')[0]: {"status": 200, "final_url": link.url, "state": 'ok',
+                                              "error": None, "checked": now}
+                     for link in links if classify(link.url) == 'external'},
+                    os.path.join(workdir, LINK_CACHE_FILE))
+
+def input_sizes(workdir):
+    """
+    Return the byte sizes of the inputs that grow with the scale
+    """
+    return {path: os.path.getsize(os.path.join(workdir, path))
+            for path in (SITE_PAGE, 'styles.css', CONTENT_FILE)}
+
+def peak_rss_kb():
+    """
+    Return the peak RSS in KiB of this process or any child it waited for
+
+    On Linux the process's own peak is read from /proc as VmHWM, which
+    starts afresh when a process execs; ru_maxrss carries over the peak of
+    the process that spawned it. Without the resource module (Windows)
+    only /proc is read, and 0 means unknown.
+    """
+    if resource is None:
+        own = children = 0
+    else:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    own = int(line.split()[1])
+    except OSError:
+        pass
+    if sys.platform == 'darwin':
+        # macOS reports bytes
+        own, children = own // 1024, children // 1024
+    return max(own, children)
+
+def _run_case(job):
+    # Runs in a fresh process started in the benchmark's copy of the site,
+    # so the peak RSS belongs to this case alone
+    name, workdir, repeat, time_limit = job
+    os.chdir(workdir)
+    func = CASES[name]
+    func()
+    times = []
+    parts = {}
+    started = time.perf_counter()
+    while len(times) < repeat:
+        run_started = time.perf_counter()
+        timings = func() or {}
+        times.append(time.perf_counter() - run_started)
+        for part, seconds in timings.items():
+            parts.setdefault(part, []).append(seconds)
+        if len(times) >= min(MIN_REPEAT, repeat) and time.perf_counter() - started > time_limit:
+            break
+    return {"times": times, "parts": parts, "peak_rss_kb": peak_rss_kb()}
+
+def summarize(times):
+    """
+    Return {"runs", "median", "p95", "min"} in seconds for a list of run times
+    """
+    ordered = sorted(times)
+    return {
+        "runs": len(ordered),
+        "median": round(statistics.median(ordered), 6),
+        "p95": round(percentile(ordered, 95), 6),
+        "min": round(ordered[0], 6),
+    }
+
+def run_benchmarks(cases=tuple(CASES), scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT,
+                   time_limit=CASE_TIME_LIMIT, max_scale=MAX_DEFAULT_SCALE, progress=None):
+    """
+    Run every case at every scale, up to the case's entry in `max_scale`
+
+    Each scale gets its own copy of the site in a temporary directory, and
+    each case runs in its own spawned process. `progress` is called with
+    (case, scale, result) as each finishes. Returns {"<case>@<scale>x":
+    {"case", "scale", "runs", "median", "p95", "min", "peak_rss_kb",
+    "inputs", "parts"}} where parts summarises each part's times the same
+    way.
+    """
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        raise ValueError(f"unknown benchmark: {', '.join(unknown)} (known: {', '.join(CASES)})")
+    root = os.path.abspath('.')
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='portfolio-benchmark-') as workroot:
+        for scale in scales:
+            names = [name for name in cases if scale <= max_scale.get(name, scale)]
+            if not names:
+                continue
+            workdir = os.path.join(workroot, f'scale-{scale}')
+            write_synthetic_site(workdir, scale, root)
+            sizes = input_sizes(workdir)
+            for name in names:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    measured = pool.submit(_run_case, (name, workdir, repeat, time_limit)).result()
+                result = dict(summarize(measured["times"]), case=name, scale=scale,
+                              peak_rss_kb=measured["peak_rss_kb"], inputs=sizes,
+                              parts={part: summarize(times) for part, times in measured["parts"].items()})
+                results[f"{name}@{scale}x"] = result
+                if progress is not None:
+                    progress(name, scale, result)
+            shutil.rmtree(workdir)
+    return results
+
+def load_history(path=BENCHMARK_HISTORY_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def save_history(history, path=BENCHMARK_HISTORY_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2)
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def history_entry(results, repeat):
+    """
+    Wrap a run's results with what is needed to judge them later: when,
+    on which commit, and on which interpreter and machine
+    """
+    return {
+        "timestamp": datetime.now().isoformat(timespec='seconds'),
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare_with_baseline(results, history, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare each result with the latest earlier run that has the same key
+
+    Returns {key: {"baseline", "median_change", "p95_change",
+    "memory_change", "regressed"}} for the keys with a baseline; changes
+    are fractions (0.25 is 25 % slower or larger). A result regresses when
+    its median time or peak memory grew by more than `threshold`.
+    """
+    comparisons = {}
+    for key, result in results.items():
+        baseline = next((entry for entry in reversed(history) if key in entry["results"]), None)
+        if baseline is None:
+            continue
+        before = baseline["results"][key]
+
+        def change(field):
+            return result[field] / before[field] - 1 if before[field] else 0.0
+
+        median_change = change("median")
+        memory_change = change("peak_rss_kb")
+        comparisons[key] = {
+            "baseline": baseline["timestamp"],
+            "median_change": median_change,
+            "p95_change": change("p95"),
+            "memory_change": memory_change,
+            "regressed": median_change > threshold or memory_change > threshold,
+        }
+    return comparisons
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Critical CSS for Anurag Mishra's Portfolio Website
+This module matches stylesheet rules against the parsed page so that rules
+which can never apply are dropped, and the rules needed to paint the first
+screen can be inlined while the full stylesheet loads without blocking.
+
+Matching is conservative: anything that depends on runtime state (hover,
+focus, structural pseudo-classes, or class names that script.js may add)
+is assumed to match.
+"""
+
+import os
+import re
+
+from html_analysis import parse_html
+from asset_build import fingerprint, strip_fingerprint
+
+# One simple selector inside a compound selector
+_SIMPLE = re.compile(r'''
+    (?P<type>\*|[A-Za-z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[(?P<attr>[\w-]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?P<val>"[^"]*"|'[^']*'|[^\]\s]+))?\s*\]
+  | (?P<pseudo>::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?)
+''', re.VERBOSE)
+
+def parse_css(source):
+    """
+    Split a stylesheet into a list of top-level blocks
+
+    Each block is ("rule", selectors, body) or ("at", prelude, children)
+    where children is a nested block list for grouping rules such as @media,
+    or None for at-rules whose body is kept as-is (@keyframes, @font-face).
+    """
+    blocks, _ = _parse_blocks(source, 0)
+    return blocks
+
+def _skip_string(source, i):
+    quote = source[i]
+    i += 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == '\\' else 1
+    return i + 1
+
+def _find_block_end(source, i):
+    # Index just past the '}' that closes the block opened before `i`
+    depth = 1
+    while i < len(source) and depth:
+        char = source[i]
+        if char in '"\'':
+            i = _skip_string(source, i)
+            continue
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = len(source) if end < 0 else end + 2
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        i += 1
+    return i
+
+def _parse_blocks(source, i):
+    blocks = []
+    start = i
+    while i < len(source):
+        char = source[i]
+        if char in '"\'':
+            i = _skip_string(source, i)
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = len(source) if end < 0 else end + 2
+            start = i
+        elif char == ';':
+            # Statement at-rule such as @import or @charset
+            prelude = source[start:i].strip()
+            if prelude:
+                blocks.append(('at', prelude + ';', None))
+            i += 1
+            start = i
+        elif char == '{':
+            prelude = source[start:i].strip()
+            end = _find_block_end(source, i + 1)
+            body = source[i + 1:end - 1]
+            if prelude.startswith('@') and re.match(r'@(media|supports|layer|container|document)\b', prelude):
+                children, _ = _parse_blocks(body, 0)
+                blocks.append(('at', prelude, children))
+            elif prelude.startswith('@'):
+                blocks.append(('at', prelude, body))
+            else:
+                blocks.append(('rule', prelude, body))
+            i = end
+            start = i
+        elif char == '}':
+            return blocks, i + 1
+        else:
+            i += 1
+    return blocks, i
+
+def serialize_css(blocks):
+    """
+    Turn a block list from parse_css back into CSS text
+    """
+    out = []
+    for kind, head, body in blocks:
+        if kind == 'rule':
+            out.append(f'{head}{{{body}}}')
+        elif body is None:
+            out.append(head)
+        elif isinstance(body, list):
+            inner = serialize_css(body)
+            if inner:
+                out.append(f'{head}{{{inner}}}')
+        else:
+            out.append(f'{head}{{{body}}}')
+    return ''.join(out)
+
+def split_selector_list(selectors):
+    """
+    Split "a, b:is(c, d)" into ["a", "b:is(c, d)"] at top-level commas
+    """
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(selectors):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(selectors[start:i].strip())
+            start = i + 1
+    parts.append(selectors[start:].strip())
+    return [part for part in parts if part]
+
+def parse_selector(selector):
+    """
+    Parse a complex selector into [(combinator, compound), ...] from left to
+    right, where compound is a list of (kind, value) simple selectors
+    """
+    parts = []
+    combinator = None
+    i = 0
+    while i < len(selector):
+        char = selector[i]
+        if char.isspace():
+            if combinator is None and parts:
+                combinator = ' '
+            i += 1
+            continue
+        if char in '>+~':
+            combinator = char
+            i += 1
+            continue
+        compound = []
+        while i < len(selector) and not selector[i].isspace() and selector[i] not in '>+~':
+            match = _SIMPLE.match(selector, i)
+            if not match:
+                # Unsupported syntax: treat the compound as unconstrained
+                compound.append(('unknown', selector[i:]))
+                i = len(selector)
+                break
+            if match.group('attr'):
+                value = match.group('val')
+                if value and value[0] in '"\'':
+                    value = value[1:-1]
+                compound.append(('attr', (match.group('attr'), match.group('op'), value)))
+            elif match.group('pseudo'):
+                compound.append(('pseudo', match.group('pseudo')))
+            else:
+                kind = match.lastgroup
+                compound.append((kind, match.group(kind)))
+            i = match.end()
+        parts.append((combinator if parts else None, compound))
+        combinator = None
+    return parts
+
+def _attr_matches(element, name, op, value):
+    actual = element.attrs.get(name)
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == '=':
+        return actual == value
+    if op == '~=':
+        return value in actual.split()
+    if op == '|=':
+        return actual == value or actual.startswith(value + '-')
+    if op == '^=':
+        return actual.startswith(value)
+    if op == '$=':
+        return actual.endswith(value)
+    return value in actual
+
+class SelectorMatcher:
+    """
+    Match selectors against an HTMLDocument from html_analysis
+
+    `dynamic_names` are class names and ids that scripts may add at runtime;
+    a compound selector mentioning any of them may match any element. Names
+    ending in '-' are prefixes, e.g. "notification-" from a template literal
+    like `notification-${type}`.
+    """
+
+    def __init__(self, document, dynamic_names=()):
+        self.document = document
+        self.dynamic = set(dynamic_names)
+        self.dynamic_prefixes = tuple(name for name in self.dynamic if name.endswith('-'))
+        self.children = {}
+        for element in document.elements:
+            self.children.setdefault(element.parent, []).append(element)
+        self._parsed = {}
+
+    def _previous_siblings(self, element):
+        siblings = self.children.get(element.parent, [])
+        position = siblings.index(element)
+        return reversed(siblings[:position])
+
+    def _compound_matches(self, element, compound):
+        for kind, value in compound:
+            if kind in ('cls', 'id') and (value in self.dynamic or value.startswith(self.dynamic_prefixes)):
+                return True
+        for kind, value in compound:
+            if kind == 'type':
+                if value != '*' and element.tag != value.lower():
+                    return False
+            elif kind == 'id':
+                if element.attrs.get('id') != value:
+                    return False
+            elif kind == 'cls':
+                if value not in element.classes():
+                    return False
+            elif kind == 'attr':
+                if not _attr_matches(element, *value):
+                    return False
+            elif kind == 'pseudo' and value == ':root':
+                if element.tag != 'html':
+                    return False
+        return True
+
+    def _matches_from(self, element, parts, index):
+        combinator, compound = parts[index]
+        if not self._compound_matches(element, compound):
+            return False
+        if index == 0:
+            return True
+        if combinator == '>':
+            return element.parent is not None and self._matches_from(element.parent, parts, index - 1)
+        if combinator == ' ':
+            return any(self._matches_from(ancestor, parts, index - 1) for ancestor in element.ancestors())
+        siblings = self._previous_siblings(element)
+        if combinator == '+':
+            previous = next(siblings, None)
+            return previous is not None and self._matches_from(previous, parts, index - 1)
+        return any(self._matches_from(sibling, parts, index - 1) for sibling in siblings)
+
+    def matches(self, element, selector):
+        parts = self._parsed.get(selector)
+        if parts is None:
+            parts = self._parsed[selector] = parse_selector(selector)
+        return bool(parts) and self._matches_from(element, parts, len(parts) - 1)
+
+    def matching_elements(self, selector, elements=None):
+        if elements is None:
+            elements = self.document.elements
+        return [element for element in elements if self.matches(element, selector)]
+
+def _referenced_names(body):
+    # Animation names referenced from declarations
+    names = set()
+    for match in re.finditer(r'animation(?:-name)?\s*:\s*([^;}]+)', body):
+        names.update(re.findall(r'[A-Za-z_][\w-]*', match.group(1)))
+    return names
+
+def split_critical(blocks, matcher, critical_matcher, critical_elements):
+    """
+    Prune and split a parsed stylesheet
+
+    Returns (kept, critical, stats): `kept` drops every rule whose selectors
+    `matcher` finds no element for, `critical` keeps only rules that
+    `critical_matcher` (which should ignore runtime class names) matches
+    against `critical_elements`, plus any @keyframes either set animates.
+    """
+    stats = {"rules": 0, "dropped": 0, "critical": 0}
+
+    def visit(blocks):
+        kept, critical = [], []
+        for kind, head, body in blocks:
+            if kind == 'rule':
+                stats["rules"] += 1
+                selectors = split_selector_list(head)
+                if not any(matcher.matching_elements(selector) for selector in selectors):
+                    stats["dropped"] += 1
+                    continue
+                kept.append((kind, head, body))
+                if any(critical_matcher.matches(element, selector)
+                       for selector in selectors for element in critical_elements):
+                    stats["critical"] += 1
+                    critical.append((kind, head, body))
+            elif isinstance(body, list):
+                inner_kept, inner_critical = visit(body)
+                if inner_kept:
+                    kept.append((kind, head, inner_kept))
+                if inner_critical:
+                    critical.append((kind, head, inner_critical))
+            else:
+                kept.append((kind, head, body))
+        return kept, critical
+
+    kept, critical = visit(blocks)
+
+    def strip_keyframes(blocks, used):
+        result = []
+        for kind, head, body in blocks:
+            name = re.match(r'@(?:-\w+-)?keyframes\s+([\w-]+)', head) if kind == 'at' else None
+            if name and name.group(1) not in used:
+                continue
+            result.append((kind, head, body))
+        return result
+
+    used_anywhere = _referenced_names(serialize_css(kept)) | matcher.dynamic
+    used_critically = _referenced_names(serialize_css(critical))
+    keyframes = [block for block in kept
+                 if block[0] == 'at' and re.match(r'@(?:-\w+-)?keyframes\b', block[1])]
+    kept = strip_keyframes(kept, used_anywhere)
+    critical = critical + strip_keyframes(keyframes, used_critically)
+    return kept, critical, stats
+
+def critical_elements_through(document, element_id):
+    """
+    Return every element up to and including the subtree of `element_id`,
+    i.e. what is painted on the first screen (head, navigation, hero)
+    """
+    anchor = document.ids.get(element_id)
+    if anchor is None:
+        return []
+    last = anchor.index
+    for element in document.elements[anchor.index + 1:]:
+        if anchor in element.ancestors():
+            last = element.index
+        else:
+            break
+    return document.elements[:last + 1]
+
+def dynamic_names(script_source):
+    """
+    Collect every name-like token inside a script's string and template literals
+
+    Any of them could be a class name or id added at runtime, so rules
+    mentioning them are never pruned. A token cut short by a template
+    interpolation keeps its trailing '-' and acts as a prefix.
+    """
+    names = set()
+    for literal in re.findall(r"'[^'\n]*'|\"[^\"\n]*\"|`[^`]*`", script_source):
+        names.update(re.findall(r'[A-Za-z_][\w-]*', literal))
+    return names
+
+def defer_stylesheet(html, href, new_href, critical_css):
+    """
+    Replace the render-blocking <link> to `href` with an inline <style> of
+    the critical rules plus a non-blocking preload of `new_href`
+    """
+    pattern = re.compile(r'<link\b[^>]*\bhref=(["\']?)' + re.escape(href) + r'\1[^>]*>')
+    replacement = (
+        f'<style>{critical_css}</style>'
+        f'<link rel="preload" href="{new_href}" as="style" '
+        f'onload="this.onload=null;this.rel=\'stylesheet\'">'
+        f'<noscript><link rel="stylesheet" href="{new_href}"></noscript>'
+    )
+    return pattern.sub(lambda m: replacement, html, count=1)
+
+def _is_local(url):
+    return not re.match(r'^(?:[a-z]+:)?//', url, re.IGNORECASE)
+
+def inline_critical_css(dist_dir, section_id='home'):
+    """
+    Prune the built site's stylesheet and inline the rules for the first screen
+
+    Rules that match nothing are dropped from the stylesheet, which is then
+    re-fingerprinted and loaded without blocking rendering. The deferred sheet
+    keeps the critical rules too, so the cascade order is unchanged once it
+    applies. Returns a stats dict, or None if the page has no render-blocking
+    local stylesheet left to defer.
+    """
+    html_path = os.path.join(dist_dir, 'index.html')
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    document = parse_html(html_path)
+
+    link = next((element for element in document.find_all('link', rel='stylesheet')
+                 if _is_local(element.attrs.get('href') or '')), None)
+    if link is None:
+        return None
+    href = link.attrs['href']
+    css_path = os.path.join(dist_dir, href)
+    with open(css_path, 'r', encoding='utf-8') as f:
+        css = f.read()
+
+    scripts = []
+    for element in document.find_all('script'):
+        src = element.attrs.get('src')
+        if src and _is_local(src) and os.path.isfile(os.path.join(dist_dir, src)):
+            with open(os.path.join(dist_dir, src), 'r', encoding='utf-8') as f:
+                scripts.append(f.read())
+    scripts.extend(run.text for run in document.text
+                   if run.element is not None and run.element.tag == 'script')
+
+    matcher = SelectorMatcher(document, dynamic_names('\n'.join(scripts)))
+    critical_matcher = SelectorMatcher(document)
+    critical_elements = critical_elements_through(document, section_id)
+    kept, critical, stats = split_critical(parse_css(css), matcher, critical_matcher, critical_elements)
+
+    kept_css = serialize_css(kept)
+    critical_css = serialize_css(critical)
+    new_href = fingerprint(strip_fingerprint(href), kept_css)
+    if new_href != href:
+        os.remove(css_path)
+    with open(os.path.join(dist_dir, new_href), 'w', encoding='utf-8') as f:
+        f.write(kept_css)
+
+    new_html = defer_stylesheet(html, href, new_href, critical_css)
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(new_html)
+
+    stats.update({
+        "stylesheet": new_href,
+        "stylesheet_before": len(css.encode('utf-8')),
+        "stylesheet_after": len(kept_css.encode('utf-8')),
+        "critical_bytes": len(critical_css.encode('utf-8')),
+        # Bytes that must arrive before first paint: the HTML plus any
+        # render-blocking local stylesheet
+        "critical_path_before": len(html.encode('utf-8')) + len(css.encode('utf-8')),
+        "critical_path_after": len(new_html.encode('utf-8')),
+    })
+    return stats
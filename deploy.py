@@ -5,10 +5,32 @@ This script helps with deployment tasks and site optimization
 """
 
 import os
-import subprocess
 import json
+import time
+import sys
+import subprocess
+import cProfile
+import asyncio
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 
+from html_analysis import load_document
+from site_content import (render_site, load_content, resume_content, content_key,
+                          load_render_cache, save_render_cache, CONTENT_FILE, TEMPLATE_DIR)
+from site_scan import scan_site, find_site_files
+from link_checker import check_link_graph, link_cache_expiry, LINK_CACHE_FILE, LINK_CACHE_TTL
+from asset_build import build_site, DIST_DIR
+from runtime_css import hoist_runtime_css
+from critical_css import inline_critical_css
+from image_pipeline import optimize_page_images
+from precompress import precompress_site, brotli_available
+from search_index import write_search_index
+from service_worker import generate_service_worker, PRECACHE_MANIFEST_FILE, SW_FILENAME
+from page_budget import check_budget, METRICS, BUDGET_FILE, BUDGET_REPORT_FILE
+from deploy_sync import write_deploy_manifest, manifest_digest, hash_file, DEPLOY_MANIFEST_FILE
+
 def check_files():
     """
     Check if all required files are present for deployment
@@ -38,29 +60,114 @@ def check_files():
     print("\n✅ All required files are present!")
     return True
 
+def render_content():
+    """
+    Render the page's content sections from the content model
+
+    Each <!-- content:NAME --> region of index.html is rendered from
+    templates/NAME.html; regions whose template and content are unchanged
+    since the last render are left as they are.
+    """
+    print("\n🧩 Rendering page content...")
+    try:
+        stats = render_site()
+    except Exception as e:
+        print(f"❌ Error rendering content: {str(e)}")
+        return False
+    
+    for section in stats["sections"]:
+        note = {"cached": "unchanged", "memory": "rendered", "disk": "rendered, cached template",
+                "compiled": "rendered, template compiled"}[section["how"]]
+        print(f"✅ {section['name']:<15} {section['bytes']:>6} bytes "
+              f"{section['seconds'] * 1000:6.2f} ms ({note})")
+    for name in stats["missing"]:
+        print(f"⚠️  index.html has no content:{name} region; that section is not rendered")
+    for name in stats["overwritten"]:
+        print(f"⚠️  Hand edits to index.html's content:{name} region were replaced; "
+              f"edit {CONTENT_FILE} or {TEMPLATE_DIR}/{name}.html instead")
+    written = "index.html updated" if stats["written"] else "index.html unchanged"
+    print(f"   ⏱️  {written}, rendered in {stats['seconds'] * 1000:.1f} ms")
+    return not stats["missing"]
+
 def generate_resume():
     """
     Generate the resume PDF if the script exists
+
+    The generator is imported and called in-process instead of being run
+    through a fresh Python interpreter, so deploy no longer pays for a second
+    interpreter startup and a cold ReportLab import on every run. Compact
+    mode makes the PDF reproducible, so an unchanged resume is byte-identical
+    from one deploy to the next; it is therefore only rendered again when
+    the resume's view of the content model or the generator has changed,
+    not for edits that only show on the site.
     """
     if os.path.exists('generate_resume.py'):
         print("\n📄 Generating resume PDF...")
         try:
-            # Try to run the resume generation script
-            result = subprocess.run(['python', 'generate_resume.py'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                print("✅ Resume generated successfully!")
+            started = time.perf_counter()
+            with open('generate_resume.py', 'r', encoding='utf-8') as f:
+                key = content_key(resume_content(load_content()), f.read())
+            renders = load_render_cache(RESUME_RENDER_FILE)
+            if renders.get('resume.pdf') == key and os.path.exists('resume.pdf'):
+                print(f"✅ Resume content unchanged, keeping resume.pdf "
+                      f"({os.path.getsize('resume.pdf')} bytes, checked in "
+                      f"{(time.perf_counter() - started) * 1000:.1f} ms)")
                 return True
-            else:
-                print(f"❌ Resume generation failed: {result.stderr}")
-                return False
+            import generate_resume as resume_generator
+            result = resume_generator.create_resume(compact=True)
+            elapsed = time.perf_counter() - started
         except Exception as e:
             print(f"❌ Error running resume generator: {str(e)}")
             return False
+        
+        if result["success"]:
+            renders['resume.pdf'] = key
+            save_render_cache(renders, RESUME_RENDER_FILE)
+            print(f"✅ Resume generated successfully! ({result['size']} bytes)")
+            startup = child_startup_seconds()
+            saved = f" (~{startup * 1000:.0f} ms child interpreter startup saved)" if startup else ""
+            print(f"   ⏱️  In-process generation took {elapsed * 1000:.0f} ms{saved}")
+            return True
+        else:
+            print(f"❌ Resume generation failed: {result['error']}")
+            return False
     else:
         print("\n⚠️  Resume generator not found. Skipping PDF generation.")
         return True
 
+def child_startup_seconds():
+    """
+    Return the wall time of a cold `python -c "import generate_resume"`
+
+    That is what running the generator as a child process cost on top of
+    the rendering itself. It is measured once per interpreter and cached in
+    STARTUP_COST_FILE; None if it cannot be measured.
+    """
+    try:
+        with open(STARTUP_COST_FILE, 'r') as f:
+            measured = json.load(f)
+    except (OSError, ValueError):
+        measured = {}
+    if sys.executable in measured:
+        return measured[sys.executable]
+    try:
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import generate_resume'], check=True,
+                       capture_output=True, timeout=60)
+        measured[sys.executable] = round(time.perf_counter() - started, 4)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(STARTUP_COST_FILE, 'w') as f:
+            json.dump(measured, f, indent=2)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return measured[sys.executable]
+
+def format_position(node):
+    """
+    Format a model node's source position as line:col
+    """
+    return f"{node.line}:{node.col}"
+
 def validate_html():
     """
     Basic HTML validation checks
@@ -68,62 +175,93 @@ def validate_html():
     print("\n🔍 Validating HTML structure...")
     
     try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        document = load_document('index.html')
+        
+        html = document.find('html')
+        title = document.find('title')
+        charset = next((meta for meta in document.find_all('meta')
+                        if (meta.attrs.get('charset') or '').lower() == 'utf-8'), None)
+        stylesheet = next((ref.element for ref in document.hrefs
+                           if ref.element.tag == 'link' and ref.value.endswith('styles.css')), None)
+        script = next((ref.element for ref in document.srcs
+                       if ref.element.tag == 'script' and ref.value.endswith('script.js')), None)
         
-        # Basic checks
+        # Basic checks: (name, element proving the check, or None)
         checks = [
-            ('DOCTYPE declaration', '<!DOCTYPE html>' in html_content),
-            ('HTML lang attribute', 'lang="en"' in html_content),
-            ('Meta charset', 'charset="UTF-8"' in html_content),
-            ('Meta viewport', 'viewport' in html_content),
-            ('Title tag', '<title>' in html_content),
-            ('CSS link', 'styles.css' in html_content),
-            ('JavaScript link', 'script.js' in html_content),
+            ('DOCTYPE declaration', (document.doctype or '').lower() == 'doctype html'),
+            ('HTML lang attribute', html if html is not None and html.attrs.get('lang') == 'en' else None),
+            ('Meta charset', charset),
+            ('Meta viewport', document.find('meta', name='viewport')),
+            ('Title tag', title),
+            ('CSS link', stylesheet),
+            ('JavaScript link', script),
         ]
         
         all_passed = True
-        for check_name, passed in checks:
-            if passed:
+        for check_name, found in checks:
+            if found is True:
                 print(f"✅ {check_name}")
+            elif found:
+                print(f"✅ {check_name} ({format_position(found)})")
             else:
                 print(f"❌ {check_name}")
                 all_passed = False
         
+        for element in document.duplicate_ids:
+            print(f"❌ Duplicate id \"{element.attrs['id']}\" at index.html:{format_position(element)}")
+            all_passed = False
+        
         return all_passed
         
     except Exception as e:
         print(f"❌ Error validating HTML: {str(e)}")
         return False
 
+# Placeholder and suspicious strings flagged anywhere in the site's text assets
+PLACEHOLDER_PATTERNS = [
+    'href="#"',
+    'https://linkedin.com/in/anurag-mishra',
+    'https://github.com/anuragmishra',
+    'anurag.mishra@email.com',
+    '+91 98765 43210',
+    'via.placeholder.com',
+    'yourusername',
+    'example.com',
+    'lorem ipsum',
+    'TODO:',
+    'FIXME',
+]
+
 def check_links():
     """
     Check for placeholder links that need to be updated
+
+    Every HTML, CSS, JS and JSON file under the site root is scanned for all
+    placeholder patterns in a single pass per file.
     """
     print("\n🔗 Checking for placeholder links...")
     
     try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        started = time.perf_counter()
+        results = scan_site(PLACEHOLDER_PATTERNS)
+        elapsed = time.perf_counter() - started
         
-        # Look for placeholder links
-        placeholder_patterns = [
-            'href="#"',
-            'https://linkedin.com/in/anurag-mishra',
-            'https://github.com/anuragmishra',
-            'anurag.mishra@email.com',
-            '+91 98765 43210'
-        ]
+        placeholders_found = [(result["path"], line, col, pattern)
+                              for result in results
+                              for pattern, line, col in result["hits"]]
         
-        placeholders_found = []
-        for pattern in placeholder_patterns:
-            if pattern in html_content:
-                placeholders_found.append(pattern)
+        # Per-file scan timing, slowest first
+        total_bytes = sum(result["bytes"] for result in results)
+        print(f"   ⏱️  Scanned {len(results)} files ({total_bytes} bytes) in {elapsed * 1000:.1f} ms")
+        for result in sorted(results, key=lambda r: r["seconds"], reverse=True)[:10]:
+            rate = result["bytes"] / result["seconds"] / 1e6 if result["seconds"] else 0.0
+            print(f"      {result['path']}: {result['bytes']} bytes, "
+                  f"{result['seconds'] * 1000:.1f} ms ({rate:.1f} MB/s)")
         
         if placeholders_found:
             print("⚠️  Placeholder links found (update these with real information):")
-            for placeholder in placeholders_found:
-                print(f"   • {placeholder}")
+            for path, line, col, pattern in sorted(placeholders_found):
+                print(f"   • {path}:{line}:{col}: {pattern}")
             return False
         else:
             print("✅ No placeholder links found!")
@@ -133,31 +271,325 @@ def check_links():
         print(f"❌ Error checking links: {str(e)}")
         return False
 
-def optimize_images():
+def check_link_graph_stage():
     """
-    Check for image optimization opportunities
+    Check that every link on the site's pages resolves
+
+    In-page anchors must name a real id and local paths must exist; both
+    are checked offline. External URLs are checked concurrently with a
+    per-host rate limit, and working ones are cached for a day so repeat
+    deploys skip them. Broken links fail the stage; servers that cannot be
+    reached or that turn away automated checks only produce warnings.
     """
-    print("\n🖼️  Checking image optimization...")
+    print("\n🕸️  Checking the link graph...")
     
-    # Look for image references in HTML
     try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        
-        # Count placeholder images
-        placeholder_count = html_content.count('via.placeholder.com')
-        
-        if placeholder_count > 0:
-            print(f"⚠️  Found {placeholder_count} placeholder images")
-            print("   Consider replacing with actual optimized images")
-            return False
+        report = check_link_graph('index.html')
+    except Exception as e:
+        print(f"❌ Error checking link graph: {str(e)}")
+        return False
+    
+    counts = report["counts"]
+    print(f"   📄 {len(report['pages'])} page(s): {counts.get('anchor', 0)} anchors, "
+          f"{counts.get('local', 0)} local paths, {len(report['external'])} external URLs")
+    print(f"   🌐 {report['fetched']} external URLs checked in {report['seconds']:.2f} s, "
+          f"{report['cached']} cached (TTL {LINK_CACHE_TTL // 3600} h)")
+    
+    passed = True
+    for link, problem in report["local_problems"]:
+        print(f"❌ {link.location()}: {link.url} - {problem}")
+        passed = False
+    for url, (result, links) in sorted(report["external"].items()):
+        if result is None or result["state"] == 'ok':
+            continue
+        where = ', '.join(link.location() for link in links)
+        detail = result["error"] or f"HTTP {result['status']}"
+        if result["state"] == 'broken':
+            print(f"❌ {url} ({where}): {detail}")
+            passed = False
+        elif result["state"] == 'blocked':
+            print(f"⚠️  {url} ({where}): {detail} - the server refuses automated checks")
         else:
-            print("✅ No placeholder images found!")
-            return True
-            
+            print(f"⚠️  {url} ({where}): unreachable ({detail})")
+    
+    if passed:
+        print("✅ All anchors and local paths resolve, and no external link is broken")
+    return passed
+
+def build_assets():
+    """
+    Build the minified, fingerprinted site into dist/
+
+    styles.css and script.js get content-hashed filenames so they can be
+    served with long-lived cache headers; index.html is rewritten to match.
+    The source files are left untouched.
+    """
+    print(f"\n📦 Building minified site into {DIST_DIR}/...")
+    
+    try:
+        report = build_site()
+    except Exception as e:
+        print(f"❌ Error building assets: {str(e)}")
+        return False
+    
+    total_original = sum(entry["original"] for entry in report)
+    total_minified = sum(entry["minified"] for entry in report)
+    for entry in report:
+        saved = entry["original"] - entry["minified"]
+        percent = saved / entry["original"] * 100 if entry["original"] else 0.0
+        print(f"✅ {entry['source']} → {entry['output']}: "
+              f"{entry['original']} → {entry['minified']} bytes ({saved} saved, {percent:.1f}%)")
+    print(f"   📉 Total: {total_original} → {total_minified} bytes "
+          f"({total_original - total_minified} saved)")
+    return True
+
+def extract_runtime_css():
+    """
+    Move the CSS that script.js injects at runtime into the stylesheet
+
+    The <style> blocks the built script appends after load are hoisted into
+    the built stylesheet and their injection code removed, so the browser
+    parses all of the CSS up front. The stage fails if the page's rules,
+    in cascade order, would differ from those in effect once the script
+    has injected its sheets.
+    """
+    print("\n🧵 Hoisting runtime-injected CSS...")
+    
+    try:
+        stats = hoist_runtime_css(DIST_DIR)
+    except Exception as e:
+        print(f"❌ Error hoisting runtime CSS: {str(e)}")
+        return False
+    
+    if stats is None:
+        print("✅ No runtime-injected stylesheets found")
+        return True
+    
+    print(f"✅ Hoisted {len(stats['sheets'])} injected stylesheets ({stats['rules']} rules, "
+          f"{stats['css_bytes']} bytes) into {stats['stylesheet']}: {', '.join(stats['sheets'])}")
+    print(f"   📉 {stats['script']}: {stats['script_before']} → {stats['script_after']} bytes")
+    return True
+
+def extract_critical_css():
+    """
+    Inline the first screen's CSS and load the rest without blocking
+
+    Works on the built site in dist/: rules matching nothing on the page are
+    pruned, the rules needed by the navigation and the #home hero section are
+    inlined in a <style> tag, and the full stylesheet is preloaded.
+    """
+    print("\n🎨 Extracting critical CSS...")
+    
+    try:
+        stats = inline_critical_css(DIST_DIR, section_id='home')
+    except Exception as e:
+        print(f"❌ Error extracting critical CSS: {str(e)}")
+        return False
+    
+    if stats is None:
+        print("✅ No render-blocking local stylesheet left to defer")
+        return True
+    
+    print(f"✅ Pruned {stats['dropped']} of {stats['rules']} rules that match nothing: "
+          f"{stats['stylesheet_before']} → {stats['stylesheet_after']} bytes ({stats['stylesheet']})")
+    print(f"✅ Inlined {stats['critical']} critical rules ({stats['critical_bytes']} bytes)")
+    print(f"   📉 Critical-path bytes: {stats['critical_path_before']} → {stats['critical_path_after']}")
+    return True
+
+def optimize_images():
+    """
+    Generate responsive image variants for the built site
+
+    Every local image referenced from dist/index.html is resized for the
+    widths it is displayed at and encoded in modern formats, and its <img>
+    tag gets srcset, sizes and explicit dimensions. Encoded variants are
+    cached by source hash.
+    """
+    print("\n🖼️  Optimizing images...")
+    
+    try:
+        report = optimize_page_images(DIST_DIR)
+    except ImportError:
+        print("❌ Pillow library not found. Please install it using:")
+        print("   pip install Pillow")
+        return False
+    except Exception as e:
+        print(f"❌ Error optimizing images: {str(e)}")
+        return False
+    
+    if not report:
+        print("✅ No images left to optimize!")
+        return True
+    
+    for entry in report:
+        width, height = entry["dimensions"]
+        source = "cached" if entry["cached"] else "encoded"
+        print(f"✅ {entry['source']} ({width}×{height}, {entry['original']} bytes): "
+              f"{len(entry['widths'])} widths × {', '.join(entry['formats'])} ({source})")
+        print(f"   📉 Largest {entry['formats'][0]} variant: {entry['largest_variant']} bytes")
+    return True
+
+def build_search_index():
+    """
+    Build the client-side search index for the built site
+
+    The text of the project, skill and certification cards in
+    dist/index.html goes into a fingerprinted inverted index that script.js
+    fetches the first time the search box is used.
+    """
+    print("\n🔎 Building search index...")
+    
+    started = time.perf_counter()
+    try:
+        stats = write_search_index(DIST_DIR)
+    except Exception as e:
+        print(f"❌ Error building search index: {str(e)}")
+        return False
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    if stats is None:
+        print("✅ No searchable sections found")
+        return True
+    
+    cards = ', '.join(f"{count} {section}" for section, count in stats["cards"].items())
+    print(f"✅ {stats['filename']}: {stats['terms']} terms over {cards} cards")
+    print(f"   📦 {stats['bytes']} bytes, built in {elapsed:.1f} ms")
+    return True
+
+def build_service_worker():
+    """
+    Generate a service worker that precaches the built site
+
+    dist/index.html registers dist/sw.js, which precaches the page, its
+    stylesheet and script and the resume by content revision, serves pages
+    cache-first while refreshing them in the background, and caches image
+    variants and the search index on first use. Returning visitors only refetch what changed.
+    """
+    print("\n⚙️  Generating service worker...")
+    
+    try:
+        stats = generate_service_worker(DIST_DIR)
+    except Exception as e:
+        print(f"❌ Error generating service worker: {str(e)}")
+        return False
+    
+    print(f"✅ {SW_FILENAME}: {stats['entries']} precached assets "
+          f"({stats['bytes']} bytes), worker {stats['sw_bytes']} bytes")
+    if stats["first_deploy"]:
+        print("   ℹ️  No previous precache manifest - returning visitors fetch everything once")
+    elif stats["changed"]:
+        print(f"   🔄 Refetched on next visit: {', '.join(stats['changed'])} "
+              f"({stats['changed_bytes']} bytes)")
+    else:
+        print("   ✅ No precached asset changed since the last deploy")
+    return True
+
+def precompress_assets():
+    """
+    Write gzip/brotli copies of the built site's text assets
+
+    Files are compressed in parallel; a compressed copy is only kept when it
+    is meaningfully smaller. The per-file sizes and ratios are saved for
+    create_deployment_info to record.
+    """
+    print("\n🗜️  Precompressing text assets...")
+    
+    try:
+        manifest = precompress_site(DIST_DIR)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(COMPRESSION_MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    except Exception as e:
+        print(f"❌ Error precompressing assets: {str(e)}")
+        return False
+    
+    if not brotli_available():
+        print("   ℹ️  brotli package not installed - writing gzip only (pip install brotli)")
+    
+    for path, entry in manifest.items():
+        sizes = [f"{name} {entry[name]} ({entry[name + '_ratio']:.0%})"
+                 for name in ('gzip', 'brotli') if entry[name]]
+        print(f"✅ {path}: {entry['original']} bytes → {', '.join(sizes) or 'skipped, no gain'}")
+    return True
+
+def record_deploy_manifest():
+    """
+    Record every file of the built site by path, size and content hash
+
+    The manifest in .deploy-cache/deploy-manifest.json is diffed against
+    the previous build's, and is what `deploy.py sync` uses to send a
+    target only the files that changed.
+    """
+    print("\n🧾 Writing deploy manifest...")
+    
+    try:
+        manifest, diff = write_deploy_manifest(DIST_DIR)
     except Exception as e:
-        print(f"❌ Error checking images: {str(e)}")
+        print(f"❌ Error writing deploy manifest: {str(e)}")
         return False
+    
+    total = sum(entry["size"] for entry in manifest.values())
+    print(f"✅ {len(manifest)} files, {total} bytes ({DEPLOY_MANIFEST_FILE})")
+    if diff is None:
+        print("   ℹ️  No previous manifest - the next sync sends everything")
+    else:
+        changed = diff["added"] + diff["changed"]
+        changed_bytes = sum(manifest[path]["size"] for path in changed)
+        print(f"   🔄 Since the last build: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+              f"{len(diff['removed'])} removed ({changed_bytes} of {total} bytes to upload)")
+    return True
+
+def check_performance_budget():
+    """
+    Measure the built site's first visit and enforce performance-budget.json
+
+    Transfer sizes come from dist/ and its precompressed variants, and
+    include what the service worker precaches; the published PDFs and the
+    generated resume are measured too. Any metric
+    over its limit fails the stage, and with it the deploy.
+    """
+    print("\n📏 Checking performance budget...")
+    
+    try:
+        report = check_budget(DIST_DIR, pdfs=['resume.pdf'])
+    except Exception as e:
+        print(f"❌ Error checking performance budget: {str(e)}")
+        return False
+    
+    metrics = report["metrics"]
+    for metric, (label, unit) in METRICS.items():
+        limit = report["budget"].get(metric)
+        if limit is None:
+            print(f"   ➖ {label:<38} {metrics[metric]:>9} {unit} (no budget)")
+            continue
+        status = "❌" if metric in report["over"] else "✅"
+        share = f" ({metrics[metric] / limit:.0%})" if limit else ''
+        print(f"{status} {label:<38} {metrics[metric]:>9} / {limit} {unit}{share}")
+    
+    # Per-asset breakdown, heaviest first
+    print("\n   📦 Per-asset breakdown (raw → compressed):")
+    assets = sorted(report["assets"], key=lambda asset: -(asset["compressed"] or 0))
+    for asset in assets:
+        flags = [flag for flag, on in (("render-blocking", asset["blocking"] and asset["kind"] != 'document'),
+                                       ("lazy", asset["lazy"])) if on]
+        note = f" [{', '.join(flags)}]" if flags else ''
+        if asset["raw"] is None:
+            where = "external, not measured" if asset["path"] is None else "missing from dist/"
+            print(f"      {asset['kind']:<14} {'?':>9} → {'?':>7}  {asset['url']} ({where}){note}")
+        else:
+            print(f"      {asset['kind']:<14} {asset['raw']:>9} → {asset['compressed']:>7}  "
+                  f"{asset['url']}{note}")
+    unmeasured = [asset for asset in report["assets"] if asset["raw"] is None]
+    if unmeasured:
+        print(f"   ℹ️  {len(unmeasured)} request(s) could not be sized offline and are left out of the "
+              f"byte totals")
+    
+    if report["over"]:
+        labels = ', '.join(METRICS[metric][0] for metric in report["over"])
+        print(f"\n❌ Over budget: {labels}")
+        return False
+    print(f"\n✅ Within every budget in {BUDGET_FILE}")
+    return True
 
 def create_deployment_info():
     """
@@ -178,9 +610,35 @@ def create_deployment_info():
             "Portfolio website for Anurag Mishra",
             "Data Science graduate from VIT",
             "Optimized for global recruitment"
-        ]
+        ],
+        "compression": {}
     }
     
+    # Precompressed sizes from precompress_assets, if it has run
+    if os.path.exists(COMPRESSION_MANIFEST_FILE):
+        with open(COMPRESSION_MANIFEST_FILE, 'r') as f:
+            deployment_info["compression"] = json.load(f)
+    
+    # First-visit metrics from check_performance_budget, if it has run
+    if os.path.exists(BUDGET_REPORT_FILE):
+        with open(BUDGET_REPORT_FILE, 'r') as f:
+            budget = json.load(f)
+        deployment_info["performance"] = {
+            "metrics": budget["metrics"],
+            "budget": budget["budget"],
+            "over_budget": budget["over"],
+        }
+    
+    # Identifies the exact build; the full manifest stays in the build cache
+    if os.path.exists(DEPLOY_MANIFEST_FILE):
+        with open(DEPLOY_MANIFEST_FILE, 'r') as f:
+            manifest = json.load(f)
+        deployment_info["build"] = {
+            "files": len(manifest),
+            "bytes": sum(entry["size"] for entry in manifest.values()),
+            "manifest_sha256": manifest_digest(manifest),
+        }
+    
     try:
         with open('deployment-info.json', 'w') as f:
             json.dump(deployment_info, f, indent=2)
@@ -218,46 +676,859 @@ def print_deployment_instructions():
     print("2. Ensure index.html is in the root directory")
     print("3. Test all links and functionality")
 
+# Persistent build cache: stage results keyed by content hashes of their inputs
+CACHE_DIR = '.deploy-cache'
+STAGE_CACHE_FILE = os.path.join(CACHE_DIR, 'stages.json')
+
+# Default output directory for --profile
+PROFILE_DIR = os.path.join(CACHE_DIR, 'profiles')
+
+# Timing events of the latest run, one per stage
+STAGE_EVENTS_FILE = os.path.join(CACHE_DIR, 'stage-events.json')
+
+# Per-file precompression results, recorded in deployment-info.json
+COMPRESSION_MANIFEST_FILE = os.path.join(CACHE_DIR, 'compression.json')
+
+# The resume content the current resume.pdf was rendered from
+RESUME_RENDER_FILE = os.path.join(CACHE_DIR, 'resume-render.json')
+
+# Measured cold-start cost of a child interpreter importing the resume generator
+STARTUP_COST_FILE = os.path.join(CACHE_DIR, 'interpreter-startup.json')
+
+# Bump when the cache layout changes so stale entries are ignored
+CACHE_VERSION = 1
+
+# Seconds between polls of the source files in --watch mode
+WATCH_INTERVAL = 0.25
+
+# Default directory for loadtest result files
+LOADTEST_DIR = os.path.join(CACHE_DIR, 'loadtest')
+
+# Deployment stages in run order. "inputs" are hashed to decide whether a
+# stage can be skipped; "outputs" must still exist for a cached result to be
+# reused. "inputs" may also be a function returning the list, for stages
+# whose inputs depend on what is on disk. deploy.py itself is an implicit
+# input of every stage. "depends" names the stages whose outputs a stage
+# consumes: it only starts once they have finished, and always reruns when
+# one of them ran. Stages without a path between them run concurrently.
+# A "blocking" stage that fails fails the whole deploy (exit status 1)
+# instead of only lowering the readiness score. "expires", if given, is
+# called after a successful run and returns the Unix time after which its
+# cached result must not be reused even with unchanged inputs (None: never).
+STAGES = [
+    {
+        "name": "render_content",
+        "func": render_content,
+        # index.html is both read and written: only its marked regions are
+        # rendered, and the rest of the page is hand-written
+        "inputs": [CONTENT_FILE, TEMPLATE_DIR, 'site_content.py', 'index.html'],
+        "outputs": ['index.html'],
+        "hint": "Fix content/portfolio.json or the template named above",
+    },
+    {
+        "name": "check_files",
+        "func": check_files,
+        "inputs": ['index.html', 'styles.css', 'script.js', 'README.md'],
+        "outputs": [],
+        "depends": ['render_content'],
+    },
+    {
+        "name": "generate_resume",
+        "func": generate_resume,
+        "inputs": ['generate_resume.py', 'site_content.py', CONTENT_FILE],
+        "outputs": ['resume.pdf'],
+    },
+    {
+        "name": "validate_html",
+        "func": validate_html,
+        "inputs": ['index.html', 'html_analysis.py'],
+        "outputs": [],
+        "depends": ['render_content'],
+    },
+    {
+        "name": "check_links",
+        "func": check_links,
+        "inputs": lambda: find_site_files() + ['site_scan.py'],
+        "outputs": [],
+        "depends": ['render_content'],
+        "hint": "Update placeholder links with real contact information",
+    },
+    {
+        "name": "check_link_graph",
+        "func": check_link_graph_stage,
+        "inputs": lambda: [path for path in find_site_files() if path.endswith('.html')]
+                          + ['resources', 'link_checker.py'],
+        # A failed run is never cached, so broken links are rechecked every
+        # deploy; a passing one goes stale with the first external result in
+        # the link cache, or at once if a server could not be reached
+        "outputs": [LINK_CACHE_FILE],
+        "expires": link_cache_expiry,
+        "depends": ['render_content'],
+        "hint": "Fix the anchors, paths and URLs listed above",
+    },
+    {
+        "name": "build_assets",
+        "func": build_assets,
+        # The dist/ post-processing modules are inputs too, so changing any of
+        # them rebuilds dist/ from scratch instead of reprocessing its output
+        "inputs": ['index.html', 'styles.css', 'script.js', 'resources', 'html_analysis.py',
+                   'asset_build.py', 'runtime_css.py', 'critical_css.py', 'image_pipeline.py',
+                   'search_index.py', 'service_worker.py', 'precompress.py'],
+        "outputs": [os.path.join(DIST_DIR, 'index.html')],
+        "depends": ['render_content'],
+    },
+    {
+        "name": "extract_runtime_css",
+        "func": extract_runtime_css,
+        "inputs": ['runtime_css.py'],
+        "outputs": [os.path.join(DIST_DIR, 'index.html')],
+        "depends": ['build_assets'],
+    },
+    {
+        "name": "extract_critical_css",
+        "func": extract_critical_css,
+        "inputs": ['critical_css.py'],
+        "outputs": [os.path.join(DIST_DIR, 'index.html')],
+        "depends": ['extract_runtime_css'],
+    },
+    {
+        "name": "optimize_images",
+        "func": optimize_images,
+        "inputs": ['image_pipeline.py'],
+        "outputs": [os.path.join(DIST_DIR, 'index.html')],
+        "depends": ['extract_critical_css'],
+    },
+    {
+        "name": "build_search_index",
+        "func": build_search_index,
+        "inputs": ['search_index.py'],
+        "outputs": [os.path.join(DIST_DIR, 'index.html')],
+        "depends": ['optimize_images'],
+    },
+    {
+        "name": "build_service_worker",
+        "func": build_service_worker,
+        "inputs": ['service_worker.py'],
+        "outputs": [os.path.join(DIST_DIR, SW_FILENAME), PRECACHE_MANIFEST_FILE],
+        "depends": ['build_search_index'],
+    },
+    {
+        "name": "precompress_assets",
+        "func": precompress_assets,
+        "inputs": ['precompress.py'],
+        "outputs": [COMPRESSION_MANIFEST_FILE],
+        "depends": ['build_service_worker'],
+    },
+    {
+        "name": "check_performance_budget",
+        "func": check_performance_budget,
+        "inputs": ['page_budget.py', 'service_worker.py', BUDGET_FILE, 'resume.pdf'],
+        # A failed run is never cached, so an over-budget site is remeasured every deploy
+        "outputs": [BUDGET_REPORT_FILE],
+        "depends": ['precompress_assets', 'generate_resume'],
+        "blocking": True,
+        "hint": f"Trim the assets listed above or raise the limits in {BUDGET_FILE}",
+    },
+    {
+        "name": "record_deploy_manifest",
+        "func": record_deploy_manifest,
+        "inputs": ['deploy_sync.py'],
+        "outputs": [DEPLOY_MANIFEST_FILE],
+        "depends": ['precompress_assets'],
+    },
+    {
+        "name": "create_deployment_info",
+        "func": create_deployment_info,
+        "inputs": ['index.html', 'styles.css', 'script.js', 'README.md', 'resume.pdf',
+                   COMPRESSION_MANIFEST_FILE, BUDGET_REPORT_FILE, DEPLOY_MANIFEST_FILE],
+        "outputs": ['deployment-info.json'],
+        "depends": ['generate_resume', 'check_performance_budget', 'record_deploy_manifest'],
+    },
+]
+
+def expand_inputs(paths):
+    """
+    Return the files a stage's inputs cover, in a stable order
+
+    `paths` may be a list or a callable returning one; directories expand
+    to the files they contain, and deploy.py itself is always included.
+    """
+    if callable(paths):
+        paths = paths()
+    files = []
+    for path in paths + [os.path.basename(__file__)]:
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        else:
+            files.append(path)
+    return files
+
+def hash_inputs(paths, memo):
+    """
+    Hash every input path, expanding directories to the files they contain
+
+    Returns {path: digest}; missing paths map to None so that a file
+    appearing or disappearing also invalidates the stage. Digests are
+    memoized in `memo` so files shared between stages are read once per run.
+    """
+    digests = {}
+    for file in expand_inputs(paths):
+        if file not in memo:
+            memo[file] = hash_file(file) if os.path.isfile(file) else None
+        digests[file] = memo[file]
+    return digests
+
+def load_build_cache():
+    """
+    Load the stage cache, returning an empty cache if it is missing or stale
+    """
+    try:
+        with open(STAGE_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "stages": {}}
+
+def save_build_cache(cache):
+    """
+    Persist the stage cache to disk
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(STAGE_CACHE_FILE, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except OSError as e:
+        print(f"⚠️  Could not save build cache: {str(e)}")
+
+def explain_stage(stage, entry, digests, force, ran):
+    """
+    Decide whether a stage must run
+
+    Returns (must_run, reason) where reason is a short human-readable
+    explanation for --explain output.
+    """
+    if force:
+        return True, "--force given"
+    if entry is None:
+        return True, "no cached result"
+    
+    upstream = [name for name in stage.get("depends", []) if name in ran]
+    if upstream:
+        return True, f"upstream stage ran: {', '.join(upstream)}"
+    
+    changed = sorted(
+        path for path in set(digests) | set(entry["inputs"])
+        if digests.get(path) != entry["inputs"].get(path)
+    )
+    if changed:
+        shown = ', '.join(changed[:5])
+        if len(changed) > 5:
+            shown += f" (+{len(changed) - 5} more)"
+        return True, f"inputs changed: {shown}"
+    
+    missing = [path for path in stage["outputs"] if not os.path.exists(path)]
+    if missing:
+        return True, f"outputs missing: {', '.join(missing)}"
+    
+    if entry.get("expires") is not None and time.time() >= entry["expires"]:
+        return True, "cached result expired"
+    
+    return False, "inputs unchanged"
+
+def run_stage(stage, cache, memo, ran, force=False, explain=False):
+    """
+    Run a deployment stage, or reuse its cached result if its inputs are unchanged
+
+    `ran` collects the names of stages that actually ran this deploy.
+    """
+    entry = cache["stages"].get(stage["name"])
+    digests = hash_inputs(stage["inputs"], memo)
+    must_run, reason = explain_stage(stage, entry, digests, force, ran)
+    
+    if not must_run:
+        passed = entry["passed"]
+        status = "✅" if passed else "⚠️ "
+        print(f"\n⏭️  {stage['name']}: skipped, reusing cached result {status}")
+        if explain:
+            print(f"   ↳ {reason}")
+        return passed
+    
+    if explain:
+        print(f"\n▶️  {stage['name']}: running ({reason})")
+    
+    passed = stage["func"]()
+    ran.add(stage["name"])
+    
+    # Stages with outputs may have failed for environmental reasons (e.g. a
+    # missing library), so only their successes are cached
+    if passed or not stage["outputs"]:
+        # Outputs produced by this stage may be inputs to later ones
+        for path in stage["outputs"]:
+            memo.pop(path, None)
+        # A file the stage rewrites in place is recorded as it left it, so
+        # the stage's own output does not make it run again next time
+        if any(path in digests for path in stage["outputs"]):
+            digests = hash_inputs(stage["inputs"], memo)
+        cache["stages"][stage["name"]] = {"inputs": digests, "passed": passed}
+        if "expires" in stage:
+            cache["stages"][stage["name"]]["expires"] = stage["expires"]()
+    else:
+        cache["stages"].pop(stage["name"], None)
+    return passed
+
+class StageOutput:
+    """
+    sys.stdout stand-in that gives each worker thread its own buffer
+
+    Stages print as they go; when several run at once their lines are
+    collected per thread and printed as one block when the stage finishes.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        self.local.buffer = []
+
+    def release(self):
+        buffer, self.local.buffer = self.local.buffer, None
+        return ''.join(buffer)
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            return self.stream.write(text)
+        buffer.append(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def peak_rss_kb():
+    """
+    Return this process's peak resident set size in KiB, or None if unknown
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def execute_stage(stage, context, output=None):
+    """
+    Run one stage on the current thread and describe it as a timing event
+
+    `context` holds the shared run state: cache, memo, ran, force, explain,
+    profile_dir and origin (the perf_counter value the run started at).
+    Returns (event, captured_output) where event is a JSON-ready dict with
+    the stage name, start offset, duration, CPU time, peak RSS and result.
+    """
+    if output is not None:
+        output.capture()
+    profiler = None
+    if context["profile_dir"]:
+        profiler = cProfile.Profile()
+    
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            passed = run_stage(stage, context["cache"], context["memo"], context["ran"],
+                               force=context["force"], explain=context["explain"])
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    except Exception as e:
+        print(f"❌ Stage {stage['name']} crashed: {str(e)}")
+        passed = False
+    duration = time.perf_counter() - started
+    cpu = time.thread_time() - cpu_started
+    
+    if not passed and stage.get("hint"):
+        print(f"   ℹ️  {stage['hint']}")
+    if profiler is not None:
+        os.makedirs(context["profile_dir"], exist_ok=True)
+        profiler.dump_stats(os.path.join(context["profile_dir"], f"{stage['name']}.pstats"))
+    
+    event = {
+        "stage": stage["name"],
+        "start": round(started - context["origin"], 6),
+        "duration": round(duration, 6),
+        "cpu": round(cpu, 6),
+        "peak_rss_kb": peak_rss_kb(),
+        "result": "passed" if passed else "failed",
+        "cached": stage["name"] not in context["ran"],
+    }
+    return event, (output.release() if output is not None else '')
+
+def run_stages(stages, context, jobs=1, events=None):
+    """
+    Run stages as a dependency graph on a pool of `jobs` threads
+
+    A stage is submitted as soon as every stage in its "depends" list has
+    finished. With jobs=1 stages run in declaration order with live output.
+    Each finished stage's timing event is written as a JSON line to
+    `events` (a file object) if given. Returns {name: event}.
+    """
+    results = {}
+    
+    def finish(event):
+        results[event["stage"]] = event
+        if events is not None:
+            events.write(json.dumps(event) + '\n')
+            events.flush()
+    
+    if jobs <= 1:
+        for stage in stages:
+            finish(execute_stage(stage, context)[0])
+        return results
+    
+    output = StageOutput(sys.stdout)
+    pending = list(stages)
+    running = {}
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for stage in [s for s in pending if all(d in results for d in s.get("depends", []))]:
+                    pending.remove(stage)
+                    running[pool.submit(execute_stage, stage, context, output)] = stage
+                if not running:
+                    raise ValueError("stage dependencies cannot be satisfied: "
+                                     + ', '.join(stage["name"] for stage in pending))
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    event, captured = future.result()
+                    output.stream.write(captured)
+                    finish(event)
+    finally:
+        sys.stdout = output.stream
+    return results
+
+def record_stage_events(events):
+    """
+    Save this run's stage timing events to STAGE_EVENTS_FILE
+
+    They are kept out of deployment-info.json, which only changes when its
+    own stage runs.
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(STAGE_EVENTS_FILE, 'w') as f:
+            json.dump(events, f, indent=2)
+    except OSError as e:
+        print(f"⚠️  Could not record stage timings: {str(e)}")
+
+def watched_files(stages):
+    """
+    Return the source files `stages` read, leaving out files they produce
+
+    A file a stage both reads and rewrites (index.html, whose content
+    regions are rendered) is still a source and stays watched.
+    """
+    outputs = {path for stage in stages for path in stage["outputs"]
+               if path not in expand_inputs(stage["inputs"])}
+    files = set()
+    for stage in stages:
+        files.update(path for path in expand_inputs(stage["inputs"]) if path not in outputs)
+    return sorted(files)
+
+def snapshot_files(paths):
+    """
+    Return {path: (mtime_ns, size)} for each path, None for missing files
+    """
+    snapshot = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[path] = None
+    return snapshot
+
+def watch(context, jobs=1, interval=WATCH_INTERVAL):
+    """
+    Poll the source files and rebuild whatever an edit affects, until Ctrl+C
+
+    The process stays warm between rebuilds: ReportLab, the resume styles
+    and the parsed page are already loaded, and the stage cache means only
+    stages whose inputs changed (and the stages after them) run again.
+    Edits to the build scripts themselves need a restart to take effect.
+    """
+    print(f"\n👀 Watching source files for changes (every {interval * 1000:.0f} ms, Ctrl+C to stop)...")
+    snapshot = snapshot_files(watched_files(STAGES))
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot_files(watched_files(STAGES))
+            changed = sorted(path for path in set(snapshot) | set(current)
+                             if snapshot.get(path) != current.get(path))
+            snapshot = current
+            if not changed:
+                continue
+            
+            print(f"\n✏️  Changed: {', '.join(changed)}")
+            code = [path for path in changed if path.endswith('.py')]
+            if code:
+                print(f"⚠️  Build code changed ({', '.join(code)}); "
+                      f"restart deploy.py --watch to pick it up")
+                continue
+            
+            started = time.perf_counter()
+            context.update(memo={}, ran=set(), origin=started)
+            results = run_stages(STAGES, context, jobs=jobs)
+            elapsed = time.perf_counter() - started
+            save_build_cache(context["cache"])
+            # Files the rebuild itself rewrote are not edits to react to
+            snapshot = snapshot_files(watched_files(STAGES))
+            if "create_deployment_info" in context["ran"]:
+                record_stage_events([results[stage["name"]] for stage in STAGES])
+            
+            rebuilt = [stage["name"] for stage in STAGES if stage["name"] in context["ran"]]
+            failed = [name for name in rebuilt if results[name]["result"] == "failed"]
+            status = f"⚠️  check: {', '.join(failed)}" if failed else "✅"
+            print(f"\n🔁 Rebuilt {', '.join(rebuilt) or 'nothing'} in {elapsed * 1000:.0f} ms {status}")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+
+def serve_site(root=DIST_DIR, host='127.0.0.1', port=8000, log=True):
+    """
+    Serve the built site locally, with production caching behaviour, until Ctrl+C
+    """
+    from static_server import serve
+    if not os.path.isfile(os.path.join(root, 'index.html')):
+        print(f"❌ No built site in {root}/. Run python deploy.py first.")
+        return False
+    print(f"🌐 Serving {root}/ at http://{host}:{port}/ (Ctrl+C to stop)")
+    print("   ETags + 304s, byte ranges, .br/.gz variants, immutable caching for fingerprinted assets")
+    try:
+        asyncio.run(serve(root, host, port, log))
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped.")
+    except OSError as e:
+        print(f"❌ Could not start server: {str(e)}")
+        return False
+    return True
+
+def load_test_site(url, concurrency=16, duration=10.0, requests=None, output=None,
+                   compare=None, root=DIST_DIR):
+    """
+    Load-test a running server with the requests a first visit to the site makes
+    """
+    from load_test import discover_assets, run_load_test, build_report, print_report, load_report, save_report
+    try:
+        assets = discover_assets(root)
+        baseline = load_report(compare) if compare else None
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not prepare load test: {str(e)}")
+        print("   ℹ️  Build the site first with python deploy.py")
+        return False
+    
+    limit = f"{requests} requests" if requests else f"{duration:g} s"
+    print(f"🔥 Load testing {url} over {concurrency} keep-alive connections ({limit})...")
+    for label, path in assets:
+        print(f"   • {label}: {path}")
+    try:
+        stats, elapsed = asyncio.run(run_load_test(url, assets, concurrency, duration, requests))
+    except (OSError, ValueError) as e:
+        print(f"❌ Load test failed: {str(e)}")
+        print("   ℹ️  Start a local server first with python deploy.py serve")
+        return False
+    
+    report = build_report(url, stats, elapsed, concurrency)
+    print_report(report, baseline)
+    output = output or os.path.join(LOADTEST_DIR, f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json")
+    try:
+        save_report(report, output)
+        print(f"\n💾 Results written to {output}")
+    except OSError as e:
+        print(f"⚠️  Could not save results: {str(e)}")
+    return report["total"]["errors"] == 0
+
+def benchmark_build(cases=None, scales=None, repeat=None, threshold=None, history_file=None):
+    """
+    Benchmark the build on the real site and on synthetic 10x-1000x copies
+
+    Results are appended to the history file and compared with the latest
+    earlier run of each case and scale; a median time or peak memory more
+    than `threshold` above it is reported as a regression. Without
+    explicit `scales` the full deploy is capped at MAX_DEFAULT_SCALE.
+    Arguments left as None take build_benchmark's defaults.
+    """
+    from build_benchmark import (run_benchmarks, compare_with_baseline, history_entry, load_history,
+                                 save_history, CASES, DEFAULT_SCALES, DEFAULT_REPEAT, MAX_DEFAULT_SCALE,
+                                 REGRESSION_THRESHOLD, BENCHMARK_HISTORY_FILE)
+    cases = list(cases or CASES)
+    repeat = repeat or DEFAULT_REPEAT
+    threshold = REGRESSION_THRESHOLD if threshold is None else threshold
+    history_file = history_file or BENCHMARK_HISTORY_FILE
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        print(f"❌ Unknown benchmark: {', '.join(unknown)} (known: {', '.join(CASES)})")
+        return False
+    max_scale = MAX_DEFAULT_SCALE if scales is None else {}
+    scales = scales or DEFAULT_SCALES
+    history = load_history(history_file)
+    print(f"⏱️  Benchmarking {', '.join(cases)} at {', '.join(f'{scale}×' for scale in scales)} "
+          f"({repeat} runs each after a warm-up)...")
+    print(f"\n   {'case':<15} {'scale':>6} {'median':>10} {'p95':>10} {'peak RSS':>10}  runs")
+    regressions = []
+    
+    def report(case, scale, result):
+        key = f"{case}@{scale}x"
+        line = (f"   {case:<15} {scale:>5}× {result['median'] * 1000:>8.1f} ms {result['p95'] * 1000:>7.1f} ms "
+                f"{result['peak_rss_kb'] / 1024:>7.1f} MB  {result['runs']}")
+        comparison = compare_with_baseline({key: result}, history, threshold).get(key)
+        if comparison:
+            line += (f"  (median {comparison['median_change']:+.0%}, p95 {comparison['p95_change']:+.0%}, "
+                     f"memory {comparison['memory_change']:+.0%})")
+            if comparison["regressed"]:
+                line += " ⚠️"
+                regressions.append(key)
+        print(line, flush=True)
+    
+    try:
+        results = run_benchmarks(cases, scales, repeat, max_scale=max_scale, progress=report)
+    except Exception as e:
+        print(f"❌ Benchmark failed: {str(e)}")
+        return False
+    
+    # Where a full deploy's time goes, per scale
+    for key, result in results.items():
+        if result["case"] == 'deploy' and result["parts"]:
+            slowest = sorted(result["parts"].items(), key=lambda item: -item[1]["median"])[:3]
+            print(f"   ↳ deploy@{result['scale']}×: "
+                  + ', '.join(f"{stage} {part['median'] * 1000:.0f} ms" for stage, part in slowest))
+    skipped = [f"{case}@{scale}×" for case in cases for scale in scales if scale > max_scale.get(case, scale)]
+    if skipped:
+        print(f"   ℹ️  Skipped by default: {', '.join(skipped)} (pass --scales to run them)")
+    
+    history.append(history_entry(results, repeat))
+    try:
+        save_history(history, history_file)
+        print(f"\n💾 Results added to {history_file} ({len(history)} runs recorded)")
+    except OSError as e:
+        print(f"⚠️  Could not save results: {str(e)}")
+    
+    if regressions:
+        print(f"❌ Regressions beyond {threshold:.0%}: {', '.join(regressions)}")
+        return False
+    if len(history) == 1:
+        print("   ℹ️  No earlier run to compare with - this run is the baseline")
+    else:
+        print(f"✅ No regressions beyond {threshold:.0%}")
+    return True
+
+def sync_built_site(target, root=DIST_DIR):
+    """
+    Send only the changed files of the built site to a directory or tarball
+    """
+    if not os.path.isfile(os.path.join(root, 'index.html')):
+        print(f"❌ No built site in {root}/. Run python deploy.py first.")
+        return False
+    
+    from deploy_sync import sync_site
+    print(f"📤 Syncing {root}/ to {target}...")
+    try:
+        stats = sync_site(target, root)
+    except (OSError, ValueError) as e:
+        print(f"❌ Sync failed: {str(e)}")
+        return False
+    
+    diff = stats["diff"]
+    for label, paths in (('➕', diff["added"]), ('✏️ ', diff["changed"]), ('🗑️ ', diff["removed"])):
+        for path in paths:
+            print(f"   {label} {path}")
+    print(f"✅ {len(diff['added'])} added, {len(diff['changed'])} changed, "
+          f"{len(diff['removed'])} removed, {len(diff['unchanged'])} unchanged")
+    percent = stats["sent_bytes"] / stats["site_bytes"] * 100 if stats["site_bytes"] else 0.0
+    print(f"   📉 Transferred {stats['sent_bytes']} of {stats['site_bytes']} bytes ({percent:.1f}%), "
+          f"{stats['sent_files']} of {stats['files']} files")
+    if stats["archive_bytes"] is not None:
+        print(f"   📦 Delta tarball: {stats['archive_bytes']} bytes, "
+              f"against the state last applied with python deploy.py apply")
+    return True
+
+def apply_synced_tarball(tarball, directory):
+    """
+    Apply a delta tarball written by sync to a directory
+    """
+    from deploy_sync import apply_tarball
+    print(f"📥 Applying {tarball} to {directory}/...")
+    try:
+        stats = apply_tarball(tarball, directory)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Apply failed: {str(e)}")
+        return False
+    print(f"✅ {stats['written']} files written, {stats['removed']} removed; "
+          f"the next sync to {tarball} is a delta against this state")
+    return True
+
 def main():
     """
     Main deployment preparation function
     """
+    parser = argparse.ArgumentParser(description="Prepare the portfolio site for deployment")
+    parser.add_argument('--force', action='store_true',
+                        help="run every stage even if its inputs are unchanged")
+    parser.add_argument('--explain', action='store_true',
+                        help="show why each stage ran or was skipped")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, metavar='N',
+                        help="run up to N independent stages at once (default: CPU count)")
+    parser.add_argument('--profile', nargs='?', const=PROFILE_DIR, metavar='DIR',
+                        help=f"profile each stage with cProfile, writing DIR/<stage>.pstats "
+                             f"(default DIR: {PROFILE_DIR})")
+    parser.add_argument('--events', metavar='FILE',
+                        help="write one JSON timing event per stage to FILE ('-' for stderr)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after deploying, keep running and rebuild on every source change")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    serve_parser = commands.add_parser('serve', help="serve the built site locally")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="address to bind (default: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8000, help="port to listen on (default: 8000)")
+    serve_parser.add_argument('--root', default=DIST_DIR, help=f"directory to serve (default: {DIST_DIR})")
+    serve_parser.add_argument('--quiet', action='store_true', help="don't log each request")
+    loadtest_parser = commands.add_parser('loadtest', help="measure a running server's throughput and latency")
+    loadtest_parser.add_argument('--url', default='http://127.0.0.1:8000',
+                                 help="server to test (default: http://127.0.0.1:8000)")
+    loadtest_parser.add_argument('--concurrency', '-c', type=int, default=16,
+                                 help="keep-alive connections (default: 16)")
+    loadtest_parser.add_argument('--duration', type=float, default=10.0,
+                                 help="seconds to run for (default: 10)")
+    loadtest_parser.add_argument('--requests', '-n', type=int,
+                                 help="stop after N requests instead of after --duration")
+    loadtest_parser.add_argument('--output', '-o', metavar='FILE',
+                                 help=f"JSON results file (default: {LOADTEST_DIR}/loadtest-<time>.json)")
+    loadtest_parser.add_argument('--compare', metavar='FILE',
+                                 help="show changes against an earlier results file")
+    loadtest_parser.add_argument('--root', default=DIST_DIR,
+                                 help=f"built site to take the asset list from (default: {DIST_DIR})")
+    sync_parser = commands.add_parser('sync', help="send only changed files of the built site to a target")
+    sync_parser.add_argument('target', help="directory to update, or a .tar/.tar.gz/.tgz delta tarball to write")
+    sync_parser.add_argument('--root', default=DIST_DIR, help=f"built site to sync (default: {DIST_DIR})")
+    apply_parser = commands.add_parser('apply', help="apply a delta tarball written by sync to a directory")
+    apply_parser.add_argument('tarball', help="delta tarball to apply")
+    apply_parser.add_argument('directory', help="directory holding the deployed site")
+    benchmark_parser = commands.add_parser('benchmark', help="time the build on real and scaled-up inputs")
+    # Defaults live in build_benchmark, which is only imported to run a benchmark
+    benchmark_parser.add_argument('--cases',
+                                  help="comma-separated steps to time (default: all of them)")
+    benchmark_parser.add_argument('--scales',
+                                  help="comma-separated input scales (default: 1,10,100,1000, with the "
+                                       "full deploy capped at 10)")
+    benchmark_parser.add_argument('--repeat', '-n', type=int,
+                                  help="timed runs per step and scale (default: 5)")
+    benchmark_parser.add_argument('--threshold', type=float, metavar='PERCENT',
+                                  help="slowdown or memory growth counted as a regression (default: 10)")
+    benchmark_parser.add_argument('--history', metavar='FILE',
+                                  help="JSON history file (default: .deploy-cache/benchmark-history.json)")
+    args = parser.parse_args()
+    
+    if args.command == 'serve':
+        if not serve_site(args.root, args.host, args.port, log=not args.quiet):
+            sys.exit(1)
+        return
+    
+    if args.command == 'sync':
+        if not sync_built_site(args.target, args.root):
+            sys.exit(1)
+        return
+    
+    if args.command == 'apply':
+        if not apply_synced_tarball(args.tarball, args.directory):
+            sys.exit(1)
+        return
+    
+    if args.command == 'benchmark':
+        scales = [int(scale) for scale in args.scales.split(',')] if args.scales else None
+        cases = args.cases.split(',') if args.cases else None
+        threshold = args.threshold / 100 if args.threshold is not None else None
+        if not benchmark_build(cases, scales, args.repeat, threshold, args.history):
+            sys.exit(1)
+        return
+    
+    if args.command == 'loadtest':
+        if not load_test_site(args.url, args.concurrency, args.duration, args.requests,
+                              args.output, args.compare, args.root):
+            sys.exit(1)
+        return
+    
     print("🚀 PORTFOLIO DEPLOYMENT PREPARATION")
     print("=" * 50)
     print("Preparing Anurag Mishra's Data Science Portfolio for deployment...")
     
-    # Run all checks
-    checks_passed = 0
-    total_checks = 6
-    
-    if check_files():
-        checks_passed += 1
+    # Only one cProfile profiler can be active at a time (Python 3.12+)
+    if args.profile and args.jobs > 1:
+        print("ℹ️  Profiling runs stages one at a time (--jobs 1)")
+        args.jobs = 1
     
-    if generate_resume():
-        checks_passed += 1
-    
-    if validate_html():
-        checks_passed += 1
+    # Run all checks, skipping stages whose inputs are unchanged
+    cache = load_build_cache()
+    cpu_children = os.times()
+    started = time.perf_counter()
+    context = {
+        "cache": cache,
+        "memo": {},
+        "ran": set(),
+        "force": args.force,
+        "explain": args.explain,
+        "profile_dir": args.profile,
+        "origin": started,
+    }
+    events = None
+    if args.events == '-':
+        events = sys.stderr
+    elif args.events:
+        events = open(args.events, 'w')
+    try:
+        results = run_stages(STAGES, context, jobs=args.jobs, events=events)
+    finally:
+        if events is not None and events is not sys.stderr:
+            events.close()
+    wall = time.perf_counter() - started
+    save_build_cache(cache)
+    record_stage_events([results[stage["name"]] for stage in STAGES])
     
-    if check_links():
-        checks_passed += 1
-    else:
-        print("   ℹ️  Update placeholder links with real contact information")
+    checks_passed = sum(1 for event in results.values() if event["result"] == "passed")
+    total_checks = len(STAGES)
     
-    if optimize_images():
-        checks_passed += 1
-    else:
-        print("   ℹ️  Consider adding real profile and project images")
+    # Per-stage timings, slowest first
+    print("\n⏱️  STAGE TIMINGS")
+    for event in sorted(results.values(), key=lambda e: e["duration"], reverse=True):
+        note = " (cached)" if event["cached"] else ""
+        print(f"   {event['stage']:<24} {event['duration'] * 1000:8.1f} ms{note}")
+    if args.profile:
+        print(f"   📈 cProfile stats written to {args.profile}/<stage>.pstats")
     
-    if create_deployment_info():
-        checks_passed += 1
+    # Worker processes started by stages (scans, image encodes) count too
+    times = os.times()
+    child_cpu = (times.children_user - cpu_children.children_user
+                 + times.children_system - cpu_children.children_system)
+    stage_time = sum(event["duration"] for event in results.values())
+    stage_cpu = sum(event["cpu"] for event in results.values()) + child_cpu
+    print(f"\n⏱️  Wall clock: {wall:.2f} s with {args.jobs} job(s) | "
+          f"summed stage time: {stage_time:.2f} s | summed CPU: {stage_cpu:.2f} s")
     
     # Summary
     print(f"\n📊 DEPLOYMENT READINESS: {checks_passed}/{total_checks} checks passed")
+    blocked = [stage["name"] for stage in STAGES
+               if stage.get("blocking") and results[stage["name"]]["result"] == "failed"]
     
-    if checks_passed == total_checks:
+    if blocked:
+        print(f"❌ Deploy blocked by: {', '.join(blocked)}")
+    elif checks_passed == total_checks:
         print("🎉 Portfolio is ready for deployment!")
-    elif checks_passed >= 4:
+    elif checks_passed >= total_checks - 2:
         print("⚠️  Portfolio is mostly ready. Address the warnings above.")
     else:
         print("❌ Portfolio needs more work before deployment.")
@@ -265,8 +1536,14 @@ def main():
     # Always show deployment instructions
     print_deployment_instructions()
     
+    if args.watch:
+        context["force"] = False
+        watch(context, jobs=args.jobs)
+    
     print(f"\n✨ Portfolio prepared on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}")
     print("💼 Ready to showcase Anurag's data science skills to global recruiters!")
+    if blocked:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
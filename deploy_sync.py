@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Delta Deploys for Anurag Mishra's Portfolio Website
+This module records every file of the built site by path, size and
+content hash, and uses that manifest to send a deploy target only what
+changed since it was last synced: changed files are copied into a target
+directory, or packed into a delta tarball against the state last applied
+to it, and files the site no longer has are removed.
+"""
+
+import io
+import os
+import json
+import shutil
+import hashlib
+import tarfile
+
+from asset_build import DIST_DIR
+
+# The manifest of the latest build, diffed against the one before it
+DEPLOY_MANIFEST_FILE = os.path.join('.deploy-cache', 'deploy-manifest.json')
+
+# Manifests last applied from each tarball target; a directory target keeps
+# its own copy at its root instead
+SYNCED_MANIFESTS_FILE = os.path.join('.deploy-cache', 'synced-manifests.json')
+
+# Name of the manifest written into a target directory or tarball
+TARGET_MANIFEST = '.deploy-manifest.json'
+
+TARBALL_SUFFIXES = ('.tar', '.tar.gz', '.tgz')
+
+def hash_file(path):
+    """
+    Return the SHA-256 hex digest of a file's contents
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def safe_path(directory, path):
+    """
+    Return `path` joined to `directory`, refusing paths that leave it
+
+    Raises ValueError for an absolute path or one with a ".." component,
+    as tarfile's 'data' filter does for archive members.
+    """
+    parts = path.replace('\\', '/').split('/')
+    if not path or os.path.isabs(path) or path.startswith('/') or '..' in parts:
+        raise ValueError(f"unsafe path in manifest: {path!r}")
+    return os.path.join(directory, path)
+
+def build_manifest(root=DIST_DIR):
+    """
+    Return {relative path: {"size", "sha256"}} for every file under `root`
+
+    Paths use forward slashes. The target's own manifest is left out.
+    """
+    manifest = {}
+    for directory, dirs, names in os.walk(root):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(directory, name)
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            if relative == TARGET_MANIFEST:
+                continue
+            manifest[relative] = {"size": os.path.getsize(path), "sha256": hash_file(path)}
+    return manifest
+
+def manifest_digest(manifest):
+    """
+    Return one hash identifying a whole manifest
+    """
+    return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()
+
+def diff_manifests(old, new):
+    """
+    Compare two manifests
+
+    Returns {"added", "changed", "removed", "unchanged"}, each a sorted
+    list of paths.
+    """
+    return {
+        "added": sorted(path for path in new if path not in old),
+        "changed": sorted(path for path in new
+                          if path in old and old[path]["sha256"] != new[path]["sha256"]),
+        "removed": sorted(path for path in old if path not in new),
+        "unchanged": sorted(path for path in new
+                            if path in old and old[path]["sha256"] == new[path]["sha256"]),
+    }
+
+def load_manifest(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_manifest(manifest, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def write_deploy_manifest(root=DIST_DIR, path=DEPLOY_MANIFEST_FILE):
+    """
+    Write the manifest of the built site and diff it against the previous build's
+
+    Returns (manifest, diff); the diff is None on the first build.
+    """
+    previous = load_manifest(path)
+    manifest = build_manifest(root)
+    save_manifest(manifest, path)
+    return manifest, (diff_manifests(previous, manifest) if previous is not None else None)
+
+def is_tarball(target):
+    return target.endswith(TARBALL_SUFFIXES)
+
+def _remove_empty_dirs(target, paths):
+    # Remove directories left empty by deleting `paths`, deepest first
+    directories = set()
+    for path in paths:
+        parent = os.path.dirname(path)
+        while parent:
+            directories.add(parent)
+            parent = os.path.dirname(parent)
+    for directory in sorted(directories, key=len, reverse=True):
+        full = os.path.join(target, directory)
+        if os.path.isdir(full) and not os.listdir(full):
+            os.rmdir(full)
+
+def sync_directory(source, target, manifest):
+    """
+    Make directory `target` match `source`, copying only what differs
+
+    The target's previous state is read from the manifest left there by
+    the last sync, and only files listed in it are ever deleted. Without
+    one, the target's copies of the site's own files are hashed so that
+    identical ones are not copied again, and nothing else in it (a .git
+    directory, a CNAME file) is touched. The manifest is as untrusted as a
+    tarball's, so its paths are checked with safe_path() first. Files are
+    copied to a temporary name and renamed into place; the manifest is
+    written last, so an interrupted sync is simply redone.
+    """
+    previous = load_manifest(os.path.join(target, TARGET_MANIFEST))
+    if previous is None:
+        previous = {}
+        for path in manifest:
+            full = os.path.join(target, path)
+            if os.path.isfile(full):
+                previous[path] = {"size": os.path.getsize(full), "sha256": hash_file(full)}
+    diff = diff_manifests(previous, manifest)
+    removed = [safe_path(target, path) for path in diff["removed"]]
+
+    for path in diff["added"] + diff["changed"]:
+        destination = os.path.join(target, path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        temporary = destination + '.partial'
+        shutil.copyfile(os.path.join(source, path), temporary)
+        os.replace(temporary, destination)
+    for full in removed:
+        if os.path.exists(full):
+            os.remove(full)
+    _remove_empty_dirs(target, diff["removed"])
+
+    os.makedirs(target, exist_ok=True)
+    save_manifest(manifest, os.path.join(target, TARGET_MANIFEST))
+    return diff
+
+def sync_tarball(source, target, manifest, synced_file=SYNCED_MANIFESTS_FILE):
+    """
+    Write a delta tarball for `target` holding what changed since it was last applied
+
+    The baseline is the manifest recorded when a tarball from this path
+    was last applied with apply_tarball(), or an empty site if none was.
+    Writing a tarball does not move the baseline, so each delta is
+    cumulative and replacing one that was never applied loses nothing.
+    The archive also holds a TARGET_MANIFEST listing the full new
+    manifest, the paths to delete and the digest of the baseline, which
+    apply_tarball() checks against the directory it updates. Entries are
+    written in sorted order with fixed metadata, so the same delta always
+    gives the same archive.
+    """
+    synced = load_manifest(synced_file) or {}
+    baseline = synced.get(os.path.abspath(target), {})
+    diff = diff_manifests(baseline, manifest)
+
+    def add(archive, name, data=None, path=None):
+        info = tarfile.TarInfo(name)
+        info.size = len(data) if data is not None else os.path.getsize(path)
+        info.mode = 0o644
+        info.mtime = 0
+        if data is not None:
+            archive.addfile(info, io.BytesIO(data))
+        else:
+            with open(path, 'rb') as f:
+                archive.addfile(info, f)
+
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    mode = 'w' if target.endswith('.tar') else 'w:gz'
+    temporary = target + '.partial'
+    with tarfile.open(temporary, mode, format=tarfile.PAX_FORMAT) as archive:
+        for path in diff["added"] + diff["changed"]:
+            add(archive, path, path=os.path.join(source, path))
+        record = {"files": manifest, "removed": diff["removed"], "base": manifest_digest(baseline)}
+        add(archive, TARGET_MANIFEST, data=json.dumps(record, indent=2, sort_keys=True).encode('utf-8'))
+    os.replace(temporary, target)
+    return diff
+
+def apply_tarball(tarball, directory, synced_file=SYNCED_MANIFESTS_FILE):
+    """
+    Unpack a delta tarball into `directory` and delete the files it lists as removed
+
+    The directory must be in the state the delta was made against: the
+    manifest left by the last apply, or no manifest for a delta against an
+    empty site. Removed paths are checked like the archive's members, so
+    none can point outside `directory`. The applied manifest becomes the
+    tarball path's baseline in `synced_file` (pass None when applying on a
+    host that does not build the site). Returns the number of files
+    written and removed.
+    """
+    with tarfile.open(tarball, 'r:*') as archive:
+        record = json.load(archive.extractfile(TARGET_MANIFEST))
+        removed = [safe_path(directory, path) for path in record["removed"]]
+        for path in record["files"]:
+            safe_path(directory, path)
+        current = load_manifest(os.path.join(directory, TARGET_MANIFEST)) or {}
+        if manifest_digest(current) != record["base"]:
+            raise ValueError(f"{tarball} was made against a different state than {directory}; "
+                             f"sync again to write a fresh delta")
+        members = [member for member in archive.getmembers() if member.name != TARGET_MANIFEST]
+        archive.extractall(directory, members=members, filter='data')
+    for full in removed:
+        if os.path.exists(full):
+            os.remove(full)
+    _remove_empty_dirs(directory, record["removed"])
+    save_manifest(record["files"], os.path.join(directory, TARGET_MANIFEST))
+
+    if synced_file is not None:
+        synced = load_manifest(synced_file) or {}
+        synced[os.path.abspath(tarball)] = record["files"]
+        save_manifest(synced, synced_file)
+    return {"written": len(members), "removed": len(removed)}
+
+def sync_site(target, source=DIST_DIR):
+    """
+    Sync the built site to `target`, a directory or a tarball path
+
+    Returns a stats dict: the diff, the files and bytes sent, the full
+    site's size, and for a tarball the archive's size on disk.
+    """
+    manifest = build_manifest(source)
+    if is_tarball(target):
+        diff = sync_tarball(source, target, manifest)
+    else:
+        diff = sync_directory(source, target, manifest)
+    sent = diff["added"] + diff["changed"]
+    return {
+        "diff": diff,
+        "files": len(manifest),
+        "site_bytes": sum(entry["size"] for entry in manifest.values()),
+        "sent_files": len(sent),
+        "sent_bytes": sum(manifest[path]["size"] for path in sent),
+        "archive_bytes": os.path.getsize(target) if is_tarball(target) else None,
+    }
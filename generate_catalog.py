@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Portfolio Catalog Generator for Anurag Mishra
+This script generates a PDF portfolio book with one entry per project,
+each with a skills table laid out like the resume's.
+
+Projects come from the catalog's view of content/portfolio.json, the
+model the site and the resume are built from too, and are laid out a
+chunk at a time with ReportLab's public canvas and Frame API. Only one
+chunk's flowables exist at once, but memory is not flat in the project
+count: the whole content model is loaded, and the canvas keeps every
+finished page until the PDF is saved.
+--benchmark charts build time and peak memory against the project count.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+import site_content
+from generate_resume import pdf_toolkit, PDF_METADATA
+
+# Structured site, resume and catalog content
+CONTENT_FILE = site_content.CONTENT_FILE
+
+# Default output file
+CATALOG_FILE = 'portfolio-catalog.pdf'
+
+# Projects laid out per chunk; only one chunk's flowables exist at a time
+CHUNK_SIZE = 25
+
+# Project counts measured by --benchmark
+BENCHMARK_COUNTS = (10, 100, 500, 1000, 2000)
+
+def peak_rss_kb():
+    """
+    Return this process's peak resident set size in KiB, or None if unknown
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def draw_page_number(canvas, page, page_size, margin):
+    """
+    Draw the catalog footer on the current page
+    """
+    canvas.saveState()
+    canvas.setFont('Helvetica', 8)
+    canvas.setFillGray(0.6)
+    canvas.drawCentredString(page_size[0] / 2, margin / 2, f"Portfolio Catalog | Page {page}")
+    canvas.restoreState()
+
+def draw_catalog(canvas, chunks, page_size, margin):
+    """
+    Lay out chunks of flowables page by page; returns the page count
+
+    Each page gets a fresh Frame, which draws flowables from the front of
+    the pending list until one no longer fits; that one starts the next
+    page (entries are never split across pages). The next chunk is only
+    created once the pending flowables run out, and each page is finished
+    with showPage() as soon as it is full; the canvas still holds its
+    drawing commands until save(). A flowable taller than a whole page
+    raises ReportLab's LayoutError.
+    """
+    from reportlab.platypus import Frame
+
+    def new_frame():
+        return Frame(margin, margin, page_size[0] - 2 * margin, page_size[1] - 2 * margin, id='normal')
+
+    page = 1
+    frame = new_frame()
+    pending = []
+    for chunk in chunks:
+        pending.extend(chunk)
+        while pending:
+            frame.addFromList(pending, canvas)
+            if pending:
+                draw_page_number(canvas, page, page_size, margin)
+                canvas.showPage()
+                page += 1
+                frame = new_frame()
+    draw_page_number(canvas, page, page_size, margin)
+    canvas.showPage()
+    return page
+
+def title_flowables(model, toolkit):
+    """
+    Return the catalog's opening flowables, built from the content model
+    """
+    styles = toolkit['styles']
+    Paragraph = toolkit['Paragraph']
+    return [
+        Paragraph(model["name"], styles['name']),
+        Paragraph(f"<b>Portfolio Catalog</b><br/>{model['headline']}", styles['contact']),
+    ]
+
+def project_flowables(project, toolkit):
+    """
+    Lay one catalog project record out as a list of ReportLab flowables
+    """
+    styles = toolkit['styles']
+    Paragraph = toolkit['Paragraph']
+    inch = toolkit['inch']
+
+    flowables = [
+        Paragraph(project["name"], styles['job_title']),
+        Paragraph(project["description"], styles['normal']),
+        toolkit['Spacer'](1, 6),
+    ]
+
+    # Skills table in the same two-column layout as the resume's
+    if project.get("skills"):
+        skills_table = toolkit['Table'](project["skills"], colWidths=[2*inch, 4.5*inch])
+        skills_table.setStyle(toolkit['skills_table_style'])
+        flowables.append(skills_table)
+
+    for label, url in project.get("links", []):
+        flowables.append(Paragraph(f"{escape(label)}: {escape(url)}", styles['date']))
+    flowables.append(toolkit['Spacer'](1, 12))
+    return flowables
+
+def iter_chunks(projects, toolkit, chunk_size=CHUNK_SIZE):
+    """
+    Group a stream of projects into lists of flowables, `chunk_size`
+    projects at a time
+    """
+    projects = iter(projects)
+    while True:
+        batch = list(itertools.islice(projects, chunk_size))
+        if not batch:
+            return
+        yield [flowable for project in batch for flowable in project_flowables(project, toolkit)]
+
+def create_catalog(filename=CATALOG_FILE, content_path=CONTENT_FILE, chunk_size=CHUNK_SIZE,
+                   chunked=True):
+    """
+    Create the portfolio catalog PDF from the content model
+
+    Flowables are built a chunk at a time, so their memory is bounded by
+    `chunk_size`; the content model and the finished pages still grow with
+    the project count. With chunked=False the whole story is built up
+    front before any of it is drawn, as the resume's is; that is only kept
+    for benchmark comparisons. The output is reproducible (fixed metadata, invariant
+    mode) and byte-identical either way.
+
+    Returns a result dict: {"success", "filename", "size", "pages", "error"}
+    """
+    try:
+        toolkit = pdf_toolkit()
+        from reportlab.pdfgen.canvas import Canvas
+    except ImportError:
+        return {
+            "success": False,
+            "filename": filename,
+            "size": 0,
+            "pages": 0,
+            "error": "ReportLab library not found. Please install it using: pip install reportlab"
+        }
+
+    page_size = toolkit['page_sizes']['letter']
+    margin = 0.75*toolkit['inch']
+    metadata = dict(PDF_METADATA, title='Anurag Mishra - Portfolio Catalog')
+    canvas = Canvas(filename, pagesize=page_size, invariant=1)
+    canvas.setTitle(metadata['title'])
+    canvas.setAuthor(metadata['author'])
+    canvas.setSubject(metadata['subject'])
+    canvas.setCreator(metadata['creator'])
+    canvas.setProducer(metadata['producer'])
+
+    try:
+        model = site_content.load_content(content_path)
+        chunks = itertools.chain(
+            [title_flowables(model, toolkit)],
+            iter_chunks(site_content.catalog_projects(model), toolkit, chunk_size),
+        )
+        if not chunked:
+            chunks = [[flowable for chunk in chunks for flowable in chunk]]
+        pages = draw_catalog(canvas, chunks, page_size, margin)
+        canvas.save()
+    except Exception as e:
+        return {"success": False, "filename": filename, "size": 0, "pages": 0, "error": str(e)}
+    return {
+        "success": True,
+        "filename": filename,
+        "size": os.path.getsize(filename),
+        "pages": pages,
+        "error": None,
+    }
+
+def write_synthetic_content(path, count, source=CONTENT_FILE):
+    """
+    Write a copy of the content model to `path` with `count` catalog
+    projects, cycling through the real ones
+
+    The first copy of each project keeps its id, so the roles' project
+    orders stay valid; later copies get numbered ids and names.
+    """
+    model = site_content.load_content(source)
+    real = [project for project in model["projects"] if "catalog" in project]
+    projects = []
+    for index in range(count):
+        project = real[index % len(real)]
+        if index >= len(real):
+            project = dict(project, id=f"{project['id']}-{index + 1}",
+                           name=f"{project['name']} #{index + 1}")
+        projects.append(project)
+    model["projects"] = projects + [project for project in model["projects"]
+                                    if "catalog" not in project]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(model, f, ensure_ascii=False)
+
+def _measure(job):
+    # Runs in a fresh worker process so the peak RSS is this build's own
+    content_path, filename, chunk_size, chunked = job
+    started = time.perf_counter()
+    result = create_catalog(filename, content_path, chunk_size, chunked)
+    result["seconds"] = time.perf_counter() - started
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+def run_benchmark(counts=BENCHMARK_COUNTS, chunk_size=CHUNK_SIZE):
+    """
+    Build catalogs of increasing size, chunked and all-at-once
+
+    Every build runs in its own process. Returns one row per build:
+    {"projects", "mode", "seconds", "peak_rss_kb", "pages", "size"}, with
+    peak_rss_kb None where the platform cannot report it.
+    """
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in counts:
+            content_path = os.path.join(workdir, f'portfolio-{count}.json')
+            write_synthetic_content(content_path, count)
+            for mode in ('chunked', 'eager'):
+                job = (content_path, os.path.join(workdir, f'catalog-{count}-{mode}.pdf'),
+                       chunk_size, mode == 'chunked')
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    result = pool.submit(_measure, job).result()
+                if not result["success"]:
+                    raise RuntimeError(result["error"])
+                rows.append({
+                    "projects": count,
+                    "mode": mode,
+                    "seconds": round(result["seconds"], 3),
+                    "peak_rss_kb": result["peak_rss_kb"],
+                    "pages": result["pages"],
+                    "size": result["size"],
+                })
+    return rows
+
+def print_benchmark_chart(rows, width=40):
+    """
+    Print build time and peak RSS per project count as a bar chart
+    """
+    peak = max((row["peak_rss_kb"] or 0 for row in rows), default=0) or 1
+    print(f"\n{'projects':>8}  {'mode':<9}  {'pages':>5}  {'time':>8}  {'peak RSS':>9}")
+    for row in rows:
+        if row["peak_rss_kb"] is None:
+            memory, bar = f"{'n/a':>9}", ''
+        else:
+            memory = f"{row['peak_rss_kb'] / 1024:>6.1f} MB"
+            bar = '█' * max(1, round(width * row["peak_rss_kb"] / peak))
+        print(f"{row['projects']:>8}  {row['mode']:<9}  {row['pages']:>5}  "
+              f"{row['seconds']:>6.2f} s  {memory}  {bar}")
+
+def main():
+    """
+    Main function to execute catalog generation or the memory benchmark
+    """
+    parser = argparse.ArgumentParser(description="Generate the portfolio catalog PDF from content/portfolio.json")
+    parser.add_argument('--input', default=CONTENT_FILE, help=f"content model (default: {CONTENT_FILE})")
+    parser.add_argument('--output', default=CATALOG_FILE, help=f"output file (default: {CATALOG_FILE})")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f"projects laid out per chunk (default: {CHUNK_SIZE})")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="chart build time and peak memory against project count")
+    parser.add_argument('--counts', default=','.join(str(count) for count in BENCHMARK_COUNTS),
+                        help="comma-separated project counts for --benchmark")
+    parser.add_argument('--benchmark-output', metavar='FILE',
+                        help="also write the --benchmark results as JSON")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        counts = [int(count) for count in args.counts.split(',')]
+        print(f"📊 Benchmarking catalog builds for {', '.join(map(str, counts))} projects...")
+        try:
+            rows = run_benchmark(counts, args.chunk_size)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"❌ Benchmark failed: {e}")
+            sys.exit(1)
+        print_benchmark_chart(rows)
+        if args.benchmark_output:
+            with open(args.benchmark_output, 'w', encoding='utf-8') as f:
+                json.dump(rows, f, indent=2)
+            print(f"\n💾 Results written to {args.benchmark_output}")
+        return
+
+    print(f"🚀 Generating portfolio catalog from {args.input}...")
+    started = time.perf_counter()
+    result = create_catalog(args.output, args.input, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    if result["success"]:
+        print(f"✅ Catalog successfully generated: {result['filename']}")
+        print(f"📄 {result['pages']} pages, {result['size']} bytes in {elapsed:.2f} s")
+        peak = peak_rss_kb()
+        if peak is not None:
+            print(f"📈 Peak memory: {peak / 1024:.1f} MB")
+    else:
+        print(f"❌ Error generating catalog: {result['error']}")
+        sys.exit(1)
+
+# Execute the script when run directly
+if __name__ == "__main__":
+    main()
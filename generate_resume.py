@@ -3,154 +3,144 @@
 Resume Generator Script for Anurag Mishra
 This script generates a professional PDF resume using Python libraries.
 Updated with actual professional details and experience.
+
+The resume content is the resume's view of content/portfolio.json, the
+model the site's pages are rendered from too; this script only lays it
+out. Tailored variants (by role, region and page size) can be rendered in
+bulk with --batch.
 """
 
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor, black, white
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.platypus import PageBreak, KeepTogether
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import argparse
+import itertools
 import os
+import tempfile
+import time
+
+import site_content
+
+# Structured site and resume content, plus the resume's role and region overrides
+CONTENT_FILE = site_content.CONTENT_FILE
+
+# Default output directory for --batch
+BATCH_DIR = 'resumes'
 
-def create_resume():
+# Fixed document metadata for compact mode, so output depends only on content
+PDF_METADATA = {
+    'title': 'Anurag Mishra - Resume',
+    'author': 'Anurag Mishra',
+    'subject': 'Data Scientist & ML Engineer',
+    'creator': 'generate_resume.py',
+    'producer': 'ReportLab',
+}
+
+# Paragraph styles and ReportLab classes, built once per process by pdf_toolkit()
+_TOOLKIT = None
+
+def pdf_toolkit():
     """
-    Create a professional PDF resume for Anurag Mishra
-    This function generates a comprehensive resume with all sections using actual professional details
+    Import ReportLab and build the resume's paragraph styles, once per process
+
+    ReportLab is imported here rather than at module level so that callers
+    such as deploy.py can import this module cheaply and only pay for the
+    PDF toolkit when a resume is actually built. generate_catalog.py lays
+    its pages out with the same styles. Raises ImportError if ReportLab
+    is not installed.
     """
-    
-    # Define file path for the resume PDF output
-    filename = "resume.pdf"
-    
-    # Create document with letter size and standard margins for professional appearance
-    doc = SimpleDocTemplate(
-        filename,
-        pagesize=letter,
-        rightMargin=0.75*inch,
-        leftMargin=0.75*inch,
-        topMargin=0.75*inch,
-        bottomMargin=0.75*inch
-    )
-    
+    global _TOOLKIT
+    if _TOOLKIT is not None:
+        return _TOOLKIT
+
+    from reportlab.lib.pagesizes import letter, A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.colors import HexColor
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.enums import TA_CENTER
+
     # Define custom styles for different sections to ensure consistent formatting
     styles = getSampleStyleSheet()
-    
-    # Custom style for name/header - large, bold, centered with brand color
-    name_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=6,
-        alignment=TA_CENTER,
-        textColor=HexColor('#4f46e5'),
-        fontName='Helvetica-Bold'
-    )
-    
-    # Custom style for section headers - consistent branding with borders
-    section_style = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceAfter=12,
-        spaceBefore=20,
-        textColor=HexColor('#4f46e5'),
-        fontName='Helvetica-Bold',
-        borderWidth=1,
-        borderColor=HexColor('#4f46e5'),
-        borderPadding=5
-    )
-    
-    # Custom style for contact information - centered and readable
-    contact_style = ParagraphStyle(
-        'Contact',
-        parent=styles['Normal'],
-        fontSize=10,
-        alignment=TA_CENTER,
-        spaceAfter=20
-    )
-    
-    # Custom style for job titles and project names - bold and prominent
-    job_title_style = ParagraphStyle(
-        'JobTitle',
-        parent=styles['Normal'],
-        fontSize=12,
-        fontName='Helvetica-Bold',
-        spaceAfter=6
-    )
-    
-    # Custom style for company/institution names - distinguishable from job titles
-    company_style = ParagraphStyle(
-        'Company',
-        parent=styles['Normal'],
-        fontSize=11,
-        fontName='Helvetica-Bold',
-        textColor=HexColor('#6b7280'),
-        spaceAfter=4
-    )
-    
-    # Custom style for dates - subtle but clear
-    date_style = ParagraphStyle(
-        'Date',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=HexColor('#9ca3af'),
-        spaceAfter=8
-    )
-    
-    # Custom style for bullet points - proper indentation and spacing
-    bullet_style = ParagraphStyle(
-        'Bullet',
-        parent=styles['Normal'],
-        fontSize=10,
-        leftIndent=20,
-        spaceAfter=4,
-        bulletIndent=10
-    )
-    
-    # Story list to hold all content elements for PDF generation
-    story = []
-    
-    # Header Section with Name and Contact Information
-    story.append(Paragraph("ANURAG MISHRA", name_style))
-    
-    # Contact information with actual details and professional title
-    contact_info = """
-    <b>Data Scientist & ML Engineer | LLM Specialist</b><br/>
-    📧 officiallyanurag1@gmail.com | 📱 +91-9911210461<br/>
-    🔗 linkedin.com/in/anuragmishra02/ | 💻 github.com/OPanurag<br/>
-    📍 California, US (Open to Global Opportunities)
-    """
-    story.append(Paragraph(contact_info, contact_style))
-    
-    # Professional Summary Section - Updated with actual experience and skills
-    story.append(Paragraph("PROFESSIONAL SUMMARY", section_style))
-    summary_text = """
-    Data Scientist and ML Engineer with hands-on experience developing and deploying scalable LLM-based 
-    solutions & ML models in production environments. Skilled in designing sustainable ML pipelines, optimizing 
-    model performance, & translating complex data into strategic insights. Adept with modern NLP frameworks, 
-    cloud platforms (GCP) & MLOps best practices to drive data-driven decision-making & automation at scale.
-    """
-    story.append(Paragraph(summary_text, styles['Normal']))
-    story.append(Spacer(1, 12))
-    
-    # Technical Skills Section - Updated with actual technology stack
-    story.append(Paragraph("TECHNICAL STACK AND SKILLS", section_style))
-    
-    # Create skills table for better organization with actual skills
-    skills_data = [
-        ['Programming Languages:', 'Python, R, Bash, Git, HTML'],
-        ['Data Science:', 'Pandas, Scikit-Learn, Transformers, LLM, Flask, PyTorch, TensorFlow, MLOps'],
-        ['Tools:', 'JIRA, Notion, Jupyter, Power BI, Tableau, Git, Docker, Kubernetes, NLTK, ZenML'],
-        ['Cloud Platforms:', 'Google Cloud Platform (GCP), Amazon Web Services (AWS)'],
-        ['Databases:', 'SQL, Milvus Vector DB'],
-        ['Data Analytics:', 'Seaborn, Dask, Matplotlib, Plotly, Bokeh, SciPy, Spacy']
-    ]
-    
-    # Configure skills table layout and styling
-    skills_table = Table(skills_data, colWidths=[2*inch, 4.5*inch])
-    skills_table.setStyle(TableStyle([
+
+    custom = {
+        # Custom style for name/header - large, bold, centered with brand color
+        'name': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=6,
+            alignment=TA_CENTER,
+            textColor=HexColor('#4f46e5'),
+            fontName='Helvetica-Bold'
+        ),
+        # Custom style for section headers - consistent branding with borders
+        'section': ParagraphStyle(
+            'SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceAfter=12,
+            spaceBefore=20,
+            textColor=HexColor('#4f46e5'),
+            fontName='Helvetica-Bold',
+            borderWidth=1,
+            borderColor=HexColor('#4f46e5'),
+            borderPadding=5
+        ),
+        # Custom style for contact information - centered and readable
+        'contact': ParagraphStyle(
+            'Contact',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        ),
+        # Custom style for job titles and project names - bold and prominent
+        'job_title': ParagraphStyle(
+            'JobTitle',
+            parent=styles['Normal'],
+            fontSize=12,
+            fontName='Helvetica-Bold',
+            spaceAfter=6
+        ),
+        # Custom style for company/institution names - distinguishable from job titles
+        'company': ParagraphStyle(
+            'Company',
+            parent=styles['Normal'],
+            fontSize=11,
+            fontName='Helvetica-Bold',
+            textColor=HexColor('#6b7280'),
+            spaceAfter=4
+        ),
+        # Custom style for dates - subtle but clear
+        'date': ParagraphStyle(
+            'Date',
+            parent=styles['Normal'],
+            fontSize=10,
+            textColor=HexColor('#9ca3af'),
+            spaceAfter=8
+        ),
+        # Custom style for bullet points - proper indentation and spacing
+        'bullet': ParagraphStyle(
+            'Bullet',
+            parent=styles['Normal'],
+            fontSize=10,
+            leftIndent=20,
+            spaceAfter=4,
+            bulletIndent=10
+        ),
+        # Footer style - small, centered and muted
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            alignment=TA_CENTER,
+            textColor=HexColor('#9ca3af')
+        ),
+        'normal': styles['Normal'],
+    }
+
+    # Skills table layout and styling, shared by every resume
+    skills_table_style = TableStyle([
         ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),  # Bold labels
         ('FONTSIZE', (0, 0), (-1, -1), 10),               # Consistent font size
         ('VALIGN', (0, 0), (-1, -1), 'TOP'),              # Top alignment
@@ -158,181 +148,336 @@ def create_resume():
         ('RIGHTPADDING', (0, 0), (-1, -1), 6),            # Right padding for spacing
         ('TOPPADDING', (0, 0), (-1, -1), 3),              # Top padding
         ('BOTTOMPADDING', (0, 0), (-1, -1), 3),           # Bottom padding
-    ]))
-    
+    ])
+
+    _TOOLKIT = {
+        'styles': custom,
+        'skills_table_style': skills_table_style,
+        'page_sizes': {'letter': letter, 'A4': A4},
+        'inch': inch,
+        'SimpleDocTemplate': SimpleDocTemplate,
+        'Paragraph': Paragraph,
+        'Spacer': Spacer,
+        'Table': Table,
+    }
+    return _TOOLKIT
+
+def load_resume_content(path=CONTENT_FILE):
+    """
+    Load the content model and return the resume's view of it
+    """
+    return site_content.resume_content(site_content.load_content(path))
+
+def resolve_variant(content, role=None, region=None, page_size=None):
+    """
+    Apply a role's and a region's overrides to the base resume content
+
+    Roles may override the headline and summary and reorder projects by id;
+    regions may override the location line and default page size. Returns
+    (resolved_content, page_size_name).
+    """
+    defaults = content.get("defaults", {})
+    role = role or defaults.get("role")
+    region = region or defaults.get("region")
+    role_overrides = content.get("roles", {}).get(role, {}) if role else {}
+    region_overrides = content.get("regions", {}).get(region, {}) if region else {}
+    if role and role not in content.get("roles", {}):
+        raise ValueError(f"unknown role: {role}")
+    if region and region not in content.get("regions", {}):
+        raise ValueError(f"unknown region: {region}")
+
+    resolved = dict(content)
+    for overrides in (role_overrides, region_overrides):
+        for key in ('headline', 'summary', 'location'):
+            if key in overrides:
+                resolved[key] = overrides[key]
+
+    order = role_overrides.get("project_order")
+    if order:
+        by_id = {project["id"]: project for project in content["projects"]}
+        resolved["projects"] = [by_id[project_id] for project_id in order]
+
+    page_size = page_size or region_overrides.get("page_size", "letter")
+    return resolved, page_size
+
+def content_date(content):
+    """
+    Return the fixed date printed on compact resumes
+
+    SOURCE_DATE_EPOCH (the reproducible-builds convention) wins if set,
+    otherwise the content file's "updated" date is used.
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    return datetime.strptime(content["updated"], '%Y-%m-%d')
+
+def build_story(content, toolkit, generated_on=None):
+    """
+    Lay the resume content out as a list of ReportLab flowables
+
+    `generated_on` is the date printed in the footer (default: today).
+    """
+    styles = toolkit['styles']
+    Paragraph = toolkit['Paragraph']
+    Spacer = toolkit['Spacer']
+    inch = toolkit['inch']
+
+    # Story list to hold all content elements for PDF generation
+    story = []
+
+    # Header Section with Name and Contact Information
+    story.append(Paragraph(content["name"], styles['name']))
+    contact_info = '<br/>'.join(
+        [f"<b>{content['headline']}</b>"] + content["contact"] + [content["location"]]
+    )
+    story.append(Paragraph(contact_info, styles['contact']))
+
+    # Professional Summary Section
+    story.append(Paragraph("PROFESSIONAL SUMMARY", styles['section']))
+    story.append(Paragraph(content["summary"], styles['normal']))
+    story.append(Spacer(1, 12))
+
+    # Technical Skills Section as a two-column table
+    story.append(Paragraph("TECHNICAL STACK AND SKILLS", styles['section']))
+    skills_table = toolkit['Table'](content["skills"], colWidths=[2*inch, 4.5*inch])
+    skills_table.setStyle(toolkit['skills_table_style'])
     story.append(skills_table)
     story.append(Spacer(1, 12))
-    
-    # Professional Experience Section - Updated with actual work experience
-    story.append(Paragraph("PROFESSIONAL EXPERIENCE", section_style))
-    
-    # Current Position - Kounsel
-    story.append(Paragraph("Graduate Data Scientist", job_title_style))
-    story.append(Paragraph("Kounsel – https://kounsel.io | California, US", company_style))
-    story.append(Paragraph("Oct 2024 – Present", date_style))
-    
-    # Kounsel experience details
-    kounsel_details = [
-        "Utilized GCP and specialized NLP libraries to scale and optimize the LLM development process",
-        "Developing a Large Language Model (LLM) focused on medical benefits, especially in recipe and diet generation",
-        "Extracting and structuring nutritional data from diverse sources to build a large-scale ingredient nutrition dataset",
-        "Collaborated with medical professionals & researchers ensuring accuracy & relevance of dietary recommendations"
-    ]
-    
-    # Add each detail as a bullet point
-    for detail in kounsel_details:
-        story.append(Paragraph(f"• {detail}", bullet_style))
-    
-    story.append(Spacer(1, 8))
-    
-    # Previous Position - Omdena
-    story.append(Paragraph("Machine Learning Engineer – Intern", job_title_style))
-    story.append(Paragraph("Omdena – https://www.omdena.com | California, US", company_style))
-    story.append(Paragraph("Jul 2024 – Sep 2024", date_style))
-    
-    # Omdena experience details
-    omdena_details = [
-        "Worked on 'AudioShield' project to distinguish deepfake audio from original audio samples",
-        "Utilized XGBoost to optimize audio threat detection, reducing false positives by 25%",
-        "Enhanced audio classification model with a 20% accuracy improvement through feature engineering and tuning"
-    ]
-    
-    # Add each detail as a bullet point
-    for detail in omdena_details:
-        story.append(Paragraph(f"• {detail}", bullet_style))
-    
+
+    # Professional Experience Section
+    story.append(Paragraph("PROFESSIONAL EXPERIENCE", styles['section']))
+    for index, job in enumerate(content["experience"]):
+        if index:
+            story.append(Spacer(1, 8))
+        story.append(Paragraph(job["title"], styles['job_title']))
+        story.append(Paragraph(job["company"], styles['company']))
+        story.append(Paragraph(job["dates"], styles['date']))
+        for detail in job["details"]:
+            story.append(Paragraph(f"• {detail}", styles['bullet']))
     story.append(Spacer(1, 12))
-    
-    # Hands-On Projects Section - Updated with actual projects
-    story.append(Paragraph("HANDS-ON PROJECTS", section_style))
-    
-    # Project 1 - AudioShield
-    story.append(Paragraph("AudioShield: Deepfake Audio Detection", job_title_style))
-    story.append(Paragraph("Technologies: Python, XGBoost, Audio Processing, Hugging Face", company_style))
-    story.append(Paragraph("Deployed: https://huggingface.co/spaces/savinshynu/audioshield-hugg", date_style))
-    
-    # AudioShield project details
-    audioshield_details = [
-        "Developed an audio classification model to detect deepfake audio, deployed on Hugging Face",
-        "Deepfake audio classification model through feature engineering and model tuning",
-        "Fine-tuned XGBoost for better threat detection with improved accuracy metrics"
-    ]
-    
-    for detail in audioshield_details:
-        story.append(Paragraph(f"• {detail}", bullet_style))
-    
-    story.append(Spacer(1, 8))
-    
-    # Project 2 - Singapore Energy Analysis
-    story.append(Paragraph("Singapore: Recycled Energy Saved", job_title_style))
-    story.append(Paragraph("Technologies: Python, Data Analytics, Visualization, Statistical Analysis", company_style))
-    story.append(Paragraph("GitHub: https://github.com/OPanurag/Singapore_Recycled_Energy_Saved.git", date_style))
-    
-    # Singapore project details
-    singapore_details = [
-        "Analyzed 18+ years of recycling and waste data to quantify energy savings and trends",
-        "Revealed energy savings of up to 500 GWh annually from five waste types, supporting sustainability decisions",
-        "Recommended a strategy that could reduce landfill dependency by 30%"
-    ]
-    
-    for detail in singapore_details:
-        story.append(Paragraph(f"• {detail}", bullet_style))
-    
-    story.append(Spacer(1, 8))
-    
-    # Project 3 - AI Chatbot
-    story.append(Paragraph("Generative AI Chat Bot", job_title_style))
-    story.append(Paragraph("Technologies: Python, NLP, Generative AI, Web Integration", company_style))
-    story.append(Paragraph("GitHub: https://github.com/OPanurag/AI_ChatBot_System", date_style))
-    
-    # Chatbot project details
-    chatbot_details = [
-        "Developed a chatbot using NLP that handles 1,000+ monthly interactions with environment-personalized responses",
-        "Boosted engagement by 35% through personalization based on 5 environmental and historical data factors",
-        "Integrated chatbot into web platforms for seamless deployment"
-    ]
-    
-    for detail in chatbot_details:
-        story.append(Paragraph(f"• {detail}", bullet_style))
-    
-    story.append(Spacer(1, 8))
-    
+
+    # Hands-On Projects Section
+    story.append(Paragraph("HANDS-ON PROJECTS", styles['section']))
+    for project in content["projects"]:
+        story.append(Paragraph(project["name"], styles['job_title']))
+        story.append(Paragraph(f"Technologies: {project['technologies']}", styles['company']))
+        story.append(Paragraph(project["link"], styles['date']))
+        for detail in project["details"]:
+            story.append(Paragraph(f"• {detail}", styles['bullet']))
+        story.append(Spacer(1, 8))
+
     # Additional projects mention
-    story.append(Paragraph("Additional Portfolio", job_title_style))
-    story.append(Paragraph("12+ Projects covering AI Engineer, ML Engineer, Data Analyst & Data Scientist roles", bullet_style))
-    
+    if content.get("additional_portfolio"):
+        story.append(Paragraph("Additional Portfolio", styles['job_title']))
+        story.append(Paragraph(content["additional_portfolio"], styles['bullet']))
     story.append(Spacer(1, 12))
-    
-    # Education Section - Updated with actual education details
-    story.append(Paragraph("EDUCATION", section_style))
-    
-    # Education details
-    story.append(Paragraph("Bachelor's of Technology - Computer Science Engineering", job_title_style))
-    story.append(Paragraph("Specialization in Artificial Intelligence and Machine Learning", job_title_style))
-    story.append(Paragraph("Vellore Institute of Technology", company_style))
-    story.append(Paragraph("Percentage: 83.5%", date_style))
-    
+
+    # Education Section
+    education = content["education"]
+    story.append(Paragraph("EDUCATION", styles['section']))
+    for line in education["degree"]:
+        story.append(Paragraph(line, styles['job_title']))
+    story.append(Paragraph(education["institution"], styles['company']))
+    story.append(Paragraph(education["grade"], styles['date']))
     story.append(Spacer(1, 12))
-    
-    # Certifications and Training Section - Updated with actual certifications
-    story.append(Paragraph("CERTIFICATIONS AND TRAININGS", section_style))
-    
-    # List of actual certifications
-    certifications = [
-        "<b>Data Science</b> – IBM",
-        "<b>Python</b> – Google",
-        "<b>Applied Machine Learning in Python</b> – University of Michigan",
-        "<b>SQL</b> – Kaggle"
-    ]
-    
-    # Add each certification as a bullet point
-    for cert in certifications:
-        story.append(Paragraph(f"• {cert}", bullet_style))
-    
+
+    # Certifications and Training Section
+    story.append(Paragraph("CERTIFICATIONS AND TRAININGS", styles['section']))
+    for cert in content["certifications"]:
+        story.append(Paragraph(f"• {cert}", styles['bullet']))
+
     # Footer with generation date and professional note
     story.append(Spacer(1, 20))
-    footer_text = f"<i>Resume generated on {datetime.now().strftime('%B %d, %Y')} | Available for immediate opportunities globally</i>"
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        alignment=TA_CENTER,
-        textColor=HexColor('#9ca3af')
+    generated_on = generated_on or datetime.now()
+    footer_text = f"<i>Resume generated on {generated_on.strftime('%B %d, %Y')} | {content['footer']}</i>"
+    story.append(Paragraph(footer_text, styles['footer']))
+    return story
+
+def render_resume(content, filename, page_size='letter', compact=False):
+    """
+    Render resolved resume content to a PDF file
+
+    In compact mode the output is deterministic: fixed metadata replaces
+    the creation timestamp and document ID, and the footer shows the
+    content date instead of today's, so identical content always produces
+    an identical file. Page streams are compressed in either mode, which
+    is ReportLab's default, and the standard PDF fonts the resume uses are
+    never embedded, so compact output is no smaller than the default.
+
+    Returns a result dict: {"success", "filename", "size", "error"}
+    """
+    try:
+        toolkit = pdf_toolkit()
+    except ImportError:
+        return {
+            "success": False,
+            "filename": filename,
+            "size": 0,
+            "error": "ReportLab library not found. Please install it using: pip install reportlab"
+        }
+
+    options = {}
+    generated_on = None
+    if compact:
+        options = dict(PDF_METADATA, invariant=1)
+        generated_on = content_date(content)
+
+    # Create document with standard margins for professional appearance
+    doc = toolkit['SimpleDocTemplate'](
+        filename,
+        pagesize=toolkit['page_sizes'][page_size],
+        rightMargin=0.75*toolkit['inch'],
+        leftMargin=0.75*toolkit['inch'],
+        topMargin=0.75*toolkit['inch'],
+        bottomMargin=0.75*toolkit['inch'],
+        **options
     )
-    story.append(Paragraph(footer_text, footer_style))
-    
+
     # Build the PDF document with error handling
     try:
-        doc.build(story)
-        print(f"✅ Resume successfully generated: {filename}")
-        print(f"📄 File size: {os.path.getsize(filename)} bytes")
-        return True
+        doc.build(build_story(content, toolkit, generated_on))
+        return {
+            "success": True,
+            "filename": filename,
+            "size": os.path.getsize(filename),
+            "error": None
+        }
     except Exception as e:
-        print(f"❌ Error generating resume: {str(e)}")
-        return False
+        return {
+            "success": False,
+            "filename": filename,
+            "size": 0,
+            "error": str(e)
+        }
+
+def create_resume(filename="resume.pdf", role=None, region=None, page_size=None, compact=False):
+    """
+    Create a professional PDF resume for Anurag Mishra
+    This function generates a comprehensive resume with all sections using actual professional details
+
+    Without arguments it renders the default role and region from the
+    content file; see render_resume() for compact mode. Returns a result
+    dict: {"success", "filename", "size", "error"}
+    """
+    try:
+        content, page_size = resolve_variant(load_resume_content(), role, region, page_size)
+    except (OSError, ValueError, KeyError) as e:
+        return {"success": False, "filename": filename, "size": 0, "error": str(e)}
+    return render_resume(content, filename, page_size, compact)
+
+def default_size(role=None, region=None, page_size=None):
+    """
+    Return the size of the same resume rendered without compact mode, or None
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        result = create_resume(os.path.join(directory, 'resume.pdf'), role, region, page_size)
+    return result["size"] if result["success"] else None
+
+# Resume content loaded once per batch worker process
+_BATCH_CONTENT = None
+
+def _init_batch_worker(content_path):
+    global _BATCH_CONTENT
+    _BATCH_CONTENT = load_resume_content(content_path)
+    try:
+        pdf_toolkit()
+    except ImportError:
+        pass
+
+def _render_variant(job):
+    role, region, page_size, filename, compact = job
+    try:
+        content, page_size = resolve_variant(_BATCH_CONTENT, role, region, page_size)
+    except (ValueError, KeyError) as e:
+        return {"success": False, "filename": filename, "size": 0, "error": str(e)}
+    return render_resume(content, filename, page_size, compact)
+
+def render_batch(variants, output_dir=BATCH_DIR, workers=None, content_path=CONTENT_FILE,
+                 compact=False):
+    """
+    Render many (role, region, page_size) variants across a process pool
+
+    Each worker loads the content and builds the styles once, then renders
+    its share of the variants. Returns (results, elapsed_seconds).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [
+        (role, region, page_size,
+         os.path.join(output_dir, f"resume-{role}-{region}-{page_size}.pdf"), compact)
+        for role, region, page_size in variants
+    ]
+
+    started = time.perf_counter()
+    if workers == 1:
+        _init_batch_worker(content_path)
+        results = [_render_variant(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(content_path,)) as pool:
+            results = list(pool.map(_render_variant, jobs))
+    return results, time.perf_counter() - started
 
 def main():
     """
     Main function to execute resume generation
     Includes dependency checking and success reporting
     """
+    parser = argparse.ArgumentParser(description="Generate PDF resumes from content/portfolio.json")
+    parser.add_argument('--role', help="role variant to render (default from the content file)")
+    parser.add_argument('--region', help="region variant to render (default from the content file)")
+    parser.add_argument('--page-size', choices=['letter', 'A4'],
+                        help="override the region's page size")
+    parser.add_argument('--output', default='resume.pdf', help="output file for a single resume")
+    parser.add_argument('--compact', action='store_true',
+                        help="reproducible output with fixed metadata and footer date")
+    parser.add_argument('--batch', action='store_true',
+                        help="render every role × region × page size combination")
+    parser.add_argument('--roles', help="comma-separated roles for --batch (default: all)")
+    parser.add_argument('--regions', help="comma-separated regions for --batch (default: all)")
+    parser.add_argument('--page-sizes', default='letter,A4',
+                        help="comma-separated page sizes for --batch (default: letter,A4)")
+    parser.add_argument('--workers', type=int,
+                        help="worker processes for --batch (default: CPU count)")
+    parser.add_argument('--output-dir', default=BATCH_DIR,
+                        help=f"output directory for --batch (default: {BATCH_DIR})")
+    args = parser.parse_args()
+
+    if args.batch:
+        content = load_resume_content()
+        roles = args.roles.split(',') if args.roles else list(content.get("roles", {}))
+        regions = args.regions.split(',') if args.regions else list(content.get("regions", {}))
+        page_sizes = args.page_sizes.split(',')
+        variants = list(itertools.product(roles, regions, page_sizes))
+
+        print(f"🚀 Rendering {len(variants)} resume variants into {args.output_dir}/...")
+        results, elapsed = render_batch(variants, args.output_dir, args.workers,
+                                        compact=args.compact)
+
+        failed = [result for result in results if not result["success"]]
+        for result in failed:
+            print(f"❌ {result['filename']}: {result['error']}")
+        rendered = len(results) - len(failed)
+        rate = rendered / elapsed if elapsed else 0.0
+        print(f"✅ Rendered {rendered}/{len(results)} resumes in {elapsed:.2f} s ({rate:.1f} PDFs/s)")
+        return
+
     print("🚀 Starting resume generation for Anurag Mishra...")
     print("📝 Creating professional PDF resume with actual experience and projects...")
-    
-    # Check if required ReportLab library is available
-    try:
-        from reportlab.lib.pagesizes import letter
-        print("✅ ReportLab library found")
-    except ImportError:
-        print("❌ ReportLab library not found. Please install it using:")
-        print("   pip install reportlab")
-        return
-    
+
     # Generate the resume with actual professional details
-    success = create_resume()
-    
+    # (create_resume reports a missing ReportLab install in its result)
+    result = create_resume(args.output, args.role, args.region, args.page_size, args.compact)
+
     # Provide detailed feedback on generation results
-    if success:
+    if result["success"]:
+        print(f"✅ Resume successfully generated: {result['filename']}")
+        print(f"📄 File size: {result['size']} bytes")
+        if args.compact:
+            default = default_size(args.role, args.region, args.page_size)
+            if default:
+                print(f"📏 Without --compact: {default} bytes "
+                      f"({result['size'] - default:+d} bytes in compact mode)")
         print("\n🎉 Resume generation completed successfully!")
         print("📋 The resume includes:")
         print("   • Current professional summary as Data Scientist & ML Engineer")
@@ -344,8 +489,9 @@ def main():
         print("\n💼 Ready to share with potential employers worldwide!")
         print("🌍 Updated with current California location and global availability!")
     else:
+        print(f"❌ Error generating resume: {result['error']}")
         print("\n❌ Resume generation failed. Please check the error messages above.")
 
 # Execute the script when run directly
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
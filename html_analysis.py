@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+HTML Analysis for Anurag Mishra's Portfolio Website
+This module parses a page once with html.parser and builds a compact
+document model that every deploy check can query, instead of each check
+re-reading the file and scanning the raw string.
+"""
+
+import os
+from html.parser import HTMLParser
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'source', 'track', 'wbr'
+}
+
+class Element:
+    """
+    A single start tag: its name, attributes, source position and parent
+    """
+    __slots__ = ('tag', 'attrs', 'line', 'col', 'parent', 'index')
+
+    def __init__(self, tag, attrs, line, col, parent, index):
+        self.tag = tag
+        self.attrs = attrs
+        self.line = line
+        self.col = col
+        self.parent = parent
+        self.index = index
+
+    def classes(self):
+        return (self.attrs.get('class') or '').split()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+class Reference:
+    """
+    A URL-bearing attribute value (href or src) and where it appears
+    """
+    __slots__ = ('value', 'attr', 'element', 'line', 'col')
+
+    def __init__(self, value, attr, element, line, col):
+        self.value = value
+        self.attr = attr
+        self.element = element
+        self.line = line
+        self.col = col
+
+class TextRun:
+    """
+    A run of character data, positioned at its first character
+    """
+    __slots__ = ('text', 'line', 'col', 'element')
+
+    def __init__(self, text, line, col, element):
+        self.text = text
+        self.line = line
+        self.col = col
+        self.element = element
+
+    def position_of(self, index):
+        """
+        Return the (line, col) of character `index` within this run
+        """
+        newlines = self.text.count('\n', 0, index)
+        if newlines == 0:
+            return self.line, self.col + index
+        return self.line + newlines, index - self.text.rindex('\n', 0, index)
+
+class HTMLDocument:
+    """
+    Compact model of one HTML page
+
+    Lines and columns are 1-based so they can be printed as editor positions.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.doctype = None
+        self.elements = []
+        self.ids = {}
+        self.duplicate_ids = []
+        self.hrefs = []
+        self.srcs = []
+        self.text = []
+
+    def find(self, tag, **attrs):
+        """
+        Return the first element with this tag whose attributes match
+        (case-insensitively) the given values
+        """
+        for element in self.find_all(tag, **attrs):
+            return element
+        return None
+
+    def find_all(self, tag, **attrs):
+        for element in self.elements:
+            if element.tag != tag:
+                continue
+            if all((element.attrs.get(name) or '').lower() == value.lower()
+                   for name, value in attrs.items()):
+                yield element
+
+class _ModelBuilder(HTMLParser):
+    """
+    Streaming parser that fills in an HTMLDocument as it goes
+    """
+
+    def __init__(self, document):
+        super().__init__(convert_charrefs=True)
+        self.document = document
+        self.open_elements = []
+
+    def _attribute_position(self, name, line, col):
+        # Locate the attribute inside the raw start tag so references can be
+        # reported at their own position rather than the tag's
+        raw = self.get_starttag_text() or ''
+        index = raw.lower().find(f' {name}=')
+        if index < 0:
+            return line, col
+        index += 1
+        newlines = raw.count('\n', 0, index)
+        if newlines == 0:
+            return line, col + index
+        return line + newlines, index - raw.rindex('\n', 0, index)
+
+    def handle_decl(self, decl):
+        self.document.doctype = decl
+
+    def handle_starttag(self, tag, attrs):
+        line, offset = self.getpos()
+        col = offset + 1
+        parent = self.open_elements[-1] if self.open_elements else None
+        element = Element(tag, dict(attrs), line, col, parent, len(self.document.elements))
+        self.document.elements.append(element)
+
+        element_id = element.attrs.get('id')
+        if element_id:
+            if element_id in self.document.ids:
+                self.document.duplicate_ids.append(element)
+            else:
+                self.document.ids[element_id] = element
+
+        for name, bucket in (('href', self.document.hrefs), ('src', self.document.srcs)):
+            value = element.attrs.get(name)
+            if value is not None:
+                ref_line, ref_col = self._attribute_position(name, line, col)
+                bucket.append(Reference(value, name, element, ref_line, ref_col))
+
+        if tag not in VOID_ELEMENTS:
+            self.open_elements.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS and self.open_elements:
+            self.open_elements.pop()
+
+    def handle_endtag(self, tag):
+        # Pop back to the matching open element, tolerating unclosed tags
+        for depth in range(len(self.open_elements) - 1, -1, -1):
+            if self.open_elements[depth].tag == tag:
+                del self.open_elements[depth:]
+                break
+
+    def handle_data(self, data):
+        if not data.strip():
+            return
+        line, offset = self.getpos()
+        parent = self.open_elements[-1] if self.open_elements else None
+        self.document.text.append(TextRun(data, line, offset + 1, parent))
+
+def parse_html(path, chunk_size=1 << 16):
+    """
+    Parse an HTML file into an HTMLDocument in a single streaming pass
+    """
+    document = HTMLDocument(path)
+    builder = _ModelBuilder(document)
+    with open(path, 'r', encoding='utf-8') as f:
+        for chunk in iter(lambda: f.read(chunk_size), ''):
+            builder.feed(chunk)
+    builder.close()
+    return document
+
+# Parsed documents keyed by path, reused while the file is unchanged
+_documents = {}
+
+def load_document(path):
+    """
+    Return the parsed model for `path`, parsing it at most once per version
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _documents.get(path)
+    if cached is None or cached[0] != key:
+        cached = (key, parse_html(path))
+        _documents[path] = cached
+    return cached[1]
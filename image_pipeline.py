@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Responsive Images for Anurag Mishra's Portfolio Website
+This module generates resized, modern-format variants of every image the
+built page references and rewrites each <img> into a <picture> with srcset,
+sizes and explicit dimensions, so devices only download the pixels they show.
+
+Encoded variants are cached by source hash, so an unchanged image is never
+re-encoded. Pillow is imported lazily and only needed when encoding.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from html_analysis import parse_html
+from critical_css import SelectorMatcher, parse_css, split_selector_list
+
+# Encoder processes are spawned: forking while other deploy stages run in
+# threads can leave a lock held in the child
+_SPAWN = multiprocessing.get_context('spawn')
+
+# Encoded variants, one directory per source image hash and settings
+IMAGE_CACHE_DIR = os.path.join('.deploy-cache', 'images')
+
+# Widths used when the page's CSS gives no fixed display width
+DEFAULT_WIDTHS = (320, 640, 960, 1280, 1920)
+
+# Modern formats in order of preference: (Pillow format, extension, MIME type)
+MODERN_FORMATS = (
+    ('AVIF', 'avif', 'image/avif'),
+    ('WEBP', 'webp', 'image/webp'),
+)
+
+# Encoder quality per format
+QUALITY = {'AVIF': 60, 'WEBP': 80, 'JPEG': 82, 'PNG': None}
+
+def _is_local(url):
+    return bool(url) and not re.match(r'^(?:[a-z]+:)?//|^data:', url, re.IGNORECASE)
+
+def available_formats():
+    """
+    Return the MODERN_FORMATS entries this Pillow build can encode
+    """
+    from PIL import features
+    return [entry for entry in MODERN_FORMATS if features.check(entry[1])]
+
+def display_widths(document, element, blocks):
+    """
+    Work out the CSS pixel widths an image is displayed at
+
+    Returns (base_width, [(max_width_query, width), ...]) from rules that
+    match the element and set a fixed px width; base_width is None when the
+    image is sized fluidly.
+    """
+    matcher = SelectorMatcher(document)
+    base = None
+    queries = []
+
+    def fixed_width(body):
+        match = re.search(r'(?:^|;)\s*width\s*:\s*(\d+(?:\.\d+)?)px\s*(?:;|$)', body)
+        return round(float(match.group(1))) if match else None
+
+    for kind, head, body in blocks:
+        if kind == 'rule':
+            width = fixed_width(body)
+            if width and any(matcher.matches(element, s) for s in split_selector_list(head)):
+                base = width
+        elif isinstance(body, list) and head.startswith('@media'):
+            query = re.search(r'\(\s*max-width\s*:\s*(\d+)px\s*\)', head)
+            if not query:
+                continue
+            for inner_kind, inner_head, inner_body in body:
+                width = fixed_width(inner_body) if inner_kind == 'rule' else None
+                if width and any(matcher.matches(element, s) for s in split_selector_list(inner_head)):
+                    queries.append((int(query.group(1)), width))
+    return base, sorted(queries)
+
+def sizes_attribute(base, queries):
+    """
+    Build a sizes="" value from display_widths()
+    """
+    if base is None:
+        return '100vw'
+    parts = [f'(max-width: {limit}px) {width}px' for limit, width in queries]
+    return ', '.join(parts + [f'{base}px'])
+
+def variant_widths(original_width, base, queries):
+    """
+    Pick variant widths: each display width at 1x and 2x density, or the
+    defaults for fluid images, never upscaling past the original
+    """
+    if base is None:
+        wanted = DEFAULT_WIDTHS
+    else:
+        shown = [base] + [width for _, width in queries]
+        wanted = shown + [width * 2 for width in shown]
+    return sorted({min(width, original_width) for width in wanted})
+
+def _encode_variant(job):
+    # Runs in a worker process: resize one image and encode it in one format
+    from PIL import Image
+    source, width, fmt, destination = job
+    with Image.open(source) as image:
+        image.load()
+        source_format = image.format
+        palette = image.mode == 'P'
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        image = image.convert('RGBA' if has_alpha and fmt != 'JPEG' else 'RGB')
+        if width < image.width:
+            height = round(image.height * width / image.width)
+            image = image.resize((width, height), Image.LANCZOS)
+        if fmt == 'PNG' and palette:
+            # Resizing needs true colour; go back to a palette so the
+            # fallback stays as small as the source
+            image = image.quantize(256)
+        options = {'optimize': True} if fmt in ('JPEG', 'PNG') else {}
+        if QUALITY.get(fmt):
+            options['quality'] = QUALITY[fmt]
+        image.save(destination, fmt, **options)
+
+    # Re-encoding a full-size image in its own format rarely beats the source
+    if source_format == fmt and os.path.getsize(destination) > os.path.getsize(source):
+        shutil.copyfile(source, destination)
+    return destination
+
+def _source_info(path):
+    # Size, dimensions and fallback format of a source image
+    from PIL import Image
+    with Image.open(path) as image:
+        has_alpha = image.mode in ('RGBA', 'LA') or 'transparency' in image.info
+        return image.width, image.height, ('PNG' if has_alpha else 'JPEG')
+
+def build_variants(source, widths, formats, workers=None):
+    """
+    Encode (or fetch from cache) every width/format variant of `source`
+
+    Returns (variants, cached) where variants maps a Pillow format to a list
+    of (width, cache_path) and cached says whether nothing had to be encoded.
+    """
+    with open(source, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    settings = json.dumps([widths, formats, QUALITY], sort_keys=True)
+    key = hashlib.sha256((digest + settings).encode('utf-8')).hexdigest()[:16]
+    directory = os.path.join(IMAGE_CACHE_DIR, key)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    extensions = {'JPEG': 'jpg', 'PNG': 'png'}
+    extensions.update({fmt: ext for fmt, ext, _ in MODERN_FORMATS})
+
+    variants = {}
+    jobs = []
+    for fmt in formats:
+        for width in widths:
+            path = os.path.join(directory, f'{stem}.{digest[:8]}-{width}w.{extensions[fmt]}')
+            variants.setdefault(fmt, []).append((width, path))
+            if not os.path.exists(path):
+                jobs.append((source, width, fmt, path))
+
+    if jobs:
+        os.makedirs(directory, exist_ok=True)
+        if len(jobs) <= 2 or workers == 1:
+            for job in jobs:
+                _encode_variant(job)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_SPAWN) as pool:
+                list(pool.map(_encode_variant, jobs))
+    return variants, not jobs
+
+def _stylesheet_blocks(document, dist_dir):
+    # Parsed blocks of the page's local stylesheet, deferred or not
+    for element in document.find_all('link'):
+        href = element.attrs.get('href')
+        rel = (element.attrs.get('rel') or '').lower()
+        if _is_local(href) and (rel == 'stylesheet' or element.attrs.get('as') == 'style'):
+            with open(os.path.join(dist_dir, href), 'r', encoding='utf-8') as f:
+                return parse_css(f.read())
+    return []
+
+_IMG_TAG = re.compile(r'''<img\b(?:"[^"]*"|'[^']*'|[^'">])*>''', re.IGNORECASE)
+
+def _with_attributes(tag, attributes):
+    # Replace or add attributes on a raw start tag
+    for name, value in attributes.items():
+        pattern = re.compile(rf'''\s{name}\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)''', re.IGNORECASE)
+        replacement = f' {name}="{value}"'
+        if pattern.search(tag):
+            tag = pattern.sub(lambda m: replacement, tag, count=1)
+        else:
+            tag = re.sub(r'\s*/?>$', lambda m: replacement + m.group(0), tag, count=1)
+    return tag
+
+def optimize_page_images(dist_dir, workers=None):
+    """
+    Generate responsive variants for every local <img> in dist/index.html
+
+    Returns one report dict per image: source, original bytes, dimensions,
+    variant widths, formats, bytes of the largest modern variant, and
+    whether the variants came from cache.
+    """
+    html_path = os.path.join(dist_dir, 'index.html')
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    document = parse_html(html_path)
+    blocks = _stylesheet_blocks(document, dist_dir)
+    modern = available_formats()
+
+    images = list(document.find_all('img'))
+    tags = list(_IMG_TAG.finditer(html))
+    if len(images) != len(tags):
+        raise ValueError("could not line up <img> tags with the parsed page")
+
+    report = []
+    replacements = []
+    for element, tag in zip(images, tags):
+        src = element.attrs.get('src')
+        source = os.path.join(dist_dir, src) if _is_local(src) else None
+        if (source is None or not os.path.isfile(source) or 'srcset' in element.attrs
+                or (element.parent is not None and element.parent.tag == 'picture')):
+            continue
+
+        original_width, original_height, fallback = _source_info(source)
+        base, queries = display_widths(document, element, blocks)
+        widths = variant_widths(original_width, base, queries)
+        formats = [fmt for fmt, _, _ in modern] + [fallback]
+        variants, cached = build_variants(source, widths, formats, workers)
+
+        # Copy variants next to the original image in dist/
+        target_dir = os.path.dirname(src)
+        urls = {}
+        for fmt, entries in variants.items():
+            for width, path in entries:
+                url = '/'.join(filter(None, [target_dir, os.path.basename(path)]))
+                shutil.copyfile(path, os.path.join(dist_dir, url))
+                urls.setdefault(fmt, []).append((width, url))
+
+        sizes = sizes_attribute(base, queries)
+
+        def srcset(fmt):
+            return ', '.join(f'{url} {width}w' for width, url in urls[fmt])
+
+        sources = ''.join(
+            f'<source type="{mime}" srcset="{srcset(fmt)}" sizes="{sizes}">'
+            for fmt, _, mime in modern
+        )
+        img = _with_attributes(tag.group(0), {
+            'src': urls[fallback][-1][1],
+            'srcset': srcset(fallback),
+            'sizes': sizes,
+            'width': original_width,
+            'height': original_height,
+            'decoding': 'async',
+        })
+        replacements.append((tag.start(), tag.end(), f'<picture>{sources}{img}</picture>'))
+
+        largest = variants[formats[0]][-1][1]
+        report.append({
+            "source": src,
+            "original": os.path.getsize(source),
+            "dimensions": (original_width, original_height),
+            "widths": widths,
+            "formats": formats,
+            "largest_variant": os.path.getsize(largest),
+            "cached": cached,
+        })
+
+    for start, end, markup in reversed(replacements):
+        html = html[:start] + markup + html[end:]
+    if replacements:
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+    return report
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Link Checking for Anurag Mishra's Portfolio Website
+This module walks the link graph of the site's pages: in-page anchors must
+name a real id, local paths must exist, and external URLs are checked
+concurrently over pooled keep-alive connections with a per-host rate
+limit. Working external links are cached on disk for a while so repeat
+deploys do not fetch them again.
+"""
+
+import os
+import ssl
+import json
+import time
+import asyncio
+from urllib.parse import urlsplit, urljoin, unquote
+
+from html_analysis import load_document
+
+# Where external results are kept between deploys, and for how long
+LINK_CACHE_FILE = os.path.join('.deploy-cache', 'links.json')
+LINK_CACHE_TTL = 24 * 60 * 60
+
+# Requests in flight overall, pooled connections per host, and the minimum
+# gap between two requests to the same host
+MAX_CONCURRENCY = 16
+MAX_PER_HOST = 2
+HOST_INTERVAL = 0.25
+
+REQUEST_TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+MAX_HEAD_BYTES = 64 * 1024
+USER_AGENT = 'Mozilla/5.0 (compatible; portfolio-link-checker/1.0)'
+
+# Answers that mean the server turns away automated clients, not that the
+# page is gone (LinkedIn answers 999)
+BLOCKED_STATUSES = {401, 403, 429, 999}
+
+# Links that cannot be fetched, only clicked
+SKIPPED_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'sms:')
+
+class Link:
+    """
+    One href or src in a page, and where it appears
+    """
+    __slots__ = ('page', 'url', 'line', 'col')
+
+    def __init__(self, page, url, line, col):
+        self.page = page
+        self.url = url
+        self.line = line
+        self.col = col
+
+    def location(self):
+        return f"{self.page}:{self.line}:{self.col}"
+
+def classify(url):
+    """
+    Return 'anchor', 'local', 'external' or 'skipped' for a link target
+    """
+    url = url.strip()
+    if url.startswith('#'):
+        return 'anchor'
+    if url.lower().startswith(SKIPPED_SCHEMES):
+        return 'skipped'
+    parts = urlsplit(url)
+    if parts.scheme in ('http', 'https') or url.startswith('//'):
+        return 'external'
+    if parts.scheme:
+        return 'skipped'
+    return 'local'
+
+def collect_links(entry='index.html'):
+    """
+    Crawl the local HTML pages reachable from `entry`
+
+    Returns (links, pages): every Link found, and the parsed document of
+    each page visited, keyed by its path.
+    """
+    links = []
+    pages = {}
+    pending = [os.path.normpath(entry)]
+    while pending:
+        page = pending.pop()
+        if page in pages:
+            continue
+        document = load_document(page)
+        pages[page] = document
+        for reference in document.hrefs + document.srcs:
+            links.append(Link(page, reference.value, reference.line, reference.col))
+            if classify(reference.value) == 'local':
+                target = local_target(page, reference.value)
+                if target.endswith(('.html', '.htm')) and os.path.isfile(target):
+                    pending.append(target)
+    return links, pages
+
+def local_target(page, url):
+    """
+    Return the file path a local link on `page` points to
+    """
+    path = unquote(urlsplit(url).path)
+    if path.startswith('/'):
+        target = path.lstrip('/')
+    else:
+        target = os.path.join(os.path.dirname(page), path)
+    target = os.path.normpath(target or page)
+    if os.path.isdir(target):
+        target = os.path.join(target, 'index.html')
+    return target
+
+def check_local_links(links, pages):
+    """
+    Check anchors and local paths without touching the network
+
+    Returns [(link, problem)] for each anchor naming no id in its page and
+    each local path that does not exist. A bare "#" links to the top of
+    the page and is always valid.
+    """
+    problems = []
+    for link in links:
+        kind = classify(link.url)
+        if kind == 'anchor':
+            fragment = unquote(link.url[1:])
+            if fragment and fragment not in pages[link.page].ids:
+                problems.append((link, f"no element with id \"{fragment}\""))
+        elif kind == 'local':
+            target = local_target(link.page, link.url)
+            if not os.path.exists(target):
+                problems.append((link, f"{target} does not exist"))
+                continue
+            fragment = unquote(urlsplit(link.url).fragment)
+            if fragment and target.endswith(('.html', '.htm')):
+                document = pages.get(target) or load_document(target)
+                if fragment not in document.ids:
+                    problems.append((link, f"no element with id \"{fragment}\" in {target}"))
+    return problems
+
+class ConnectionPool:
+    """
+    Idle keep-alive connections, kept per (scheme, host, port)
+
+    At most `per_host` connections to one host are open at once; further
+    requests wait for one to be released.
+    """
+
+    def __init__(self, per_host=MAX_PER_HOST, timeout=REQUEST_TIMEOUT, ssl_context=None):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.idle = {}
+        self.slots = {}
+
+    async def acquire(self, key):
+        """
+        Return (reader, writer, reused) for `key`, reusing an idle connection if there is one
+        """
+        slot = self.slots.setdefault(key, asyncio.Semaphore(self.per_host))
+        await slot.acquire()
+        idle = self.idle.get(key, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = key
+        context = None
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=context, limit=MAX_HEAD_BYTES,
+                                        server_hostname=host if context else None),
+                self.timeout)
+        except BaseException:
+            slot.release()
+            raise
+        return reader, writer, False
+
+    def release(self, key, reader, writer, reusable):
+        if reusable:
+            self.idle.setdefault(key, []).append((reader, writer))
+        else:
+            writer.close()
+        self.slots[key].release()
+
+    def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+class HostRateLimiter:
+    """
+    Space out request starts to each host by at least `interval` seconds
+    """
+
+    def __init__(self, interval=HOST_INTERVAL):
+        self.interval = interval
+        self.next_start = {}
+        self.locks = {}
+
+    async def wait(self, host):
+        async with self.locks.setdefault(host, asyncio.Lock()):
+            delay = self.next_start.get(host, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_start[host] = time.monotonic() + self.interval
+
+async def _read_head(reader):
+    # Returns (version, status, headers) for one response head
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    version, status = lines[0].split()[:2]
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return version, int(status), headers
+
+async def _request(pool, limiter, method, url):
+    """
+    Make one request and return (status, headers), without following redirects
+
+    HEAD responses have no body, so their connection goes back to the pool.
+    A GET is sent with Connection: close and its body is never read. A
+    pooled connection the server has since closed is retried once on a
+    fresh one.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme or 'https'
+    key = (scheme, parts.hostname, parts.port or (443 if scheme == 'https' else 80))
+    target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+    host = parts.netloc.rpartition('@')[2]
+    request = (f'{method} {target} HTTP/1.1\r\nHost: {host}\r\nUser-Agent: {USER_AGENT}\r\n'
+               f'Accept: */*\r\nConnection: {"keep-alive" if method == "HEAD" else "close"}\r\n\r\n')
+
+    await limiter.wait(parts.hostname)
+    for attempt in range(2):
+        reader, writer, reused = await pool.acquire(key)
+        reusable = False
+        try:
+            writer.write(request.encode('latin-1'))
+            await writer.drain()
+            version, status, headers = await asyncio.wait_for(_read_head(reader), pool.timeout)
+            reusable = (method == 'HEAD' and version == 'HTTP/1.1'
+                        and headers.get('connection', '').lower() != 'close')
+            return status, headers
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused or attempt:
+                raise
+        finally:
+            pool.release(key, reader, writer, reusable)
+
+async def check_url(pool, limiter, url):
+    """
+    Check one external URL, following redirects
+
+    Servers that refuse or mishandle HEAD are asked again with GET.
+    Returns {"status", "final_url", "state", "error"} where state is 'ok',
+    'blocked' (the server turns away checkers), 'broken' or 'unreachable'.
+    """
+    current = url.split('#')[0]
+    if current.startswith('//'):
+        current = 'https:' + current
+    status = None
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers = await _request(pool, limiter, 'HEAD', current)
+            if status >= 400:
+                status, headers = await _request(pool, limiter, 'GET', current)
+            if status in (301, 302, 303, 307, 308) and headers.get('location'):
+                current = urljoin(current, headers['location'])
+                continue
+            break
+        else:
+            return {"status": status, "final_url": current, "state": 'broken',
+                    "error": f"more than {MAX_REDIRECTS} redirects"}
+    except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError) as e:
+        return {"status": None, "final_url": current, "state": 'unreachable',
+                "error": str(e) or type(e).__name__}
+
+    if status < 400:
+        state = 'ok'
+    elif status in BLOCKED_STATUSES:
+        state = 'blocked'
+    else:
+        state = 'broken'
+    return {"status": status, "final_url": current, "state": state, "error": None}
+
+async def check_external_urls(urls, concurrency=MAX_CONCURRENCY, per_host=MAX_PER_HOST,
+                              interval=HOST_INTERVAL, timeout=REQUEST_TIMEOUT, ssl_context=None):
+    """
+    Check `urls` concurrently; returns {url: result} as check_url does
+    """
+    pool = ConnectionPool(per_host, timeout, ssl_context)
+    limiter = HostRateLimiter(interval)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def run(url):
+        async with gate:
+            return url, await check_url(pool, limiter, url)
+
+    try:
+        return dict(await asyncio.gather(*(run(url) for url in urls)))
+    finally:
+        pool.close()
+
+def load_link_cache(path=LINK_CACHE_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_link_cache(cache, path=LINK_CACHE_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+def link_cache_expiry(entry='index.html', cache_file=LINK_CACHE_FILE, ttl=LINK_CACHE_TTL):
+    """
+    Return the time at which a link check of `entry` is out of date
+
+    That is when the oldest cached result for one of its external URLs
+    expires, or now if one of them has no fresh cached result (it was
+    broken or unreachable and must be checked again). None if the pages
+    link nowhere external.
+    """
+    links, _ = collect_links(entry)
+    urls = {link.url.split('#')[0] for link in links if classify(link.url) == 'external'}
+    cache = load_link_cache(cache_file)
+    now = time.time()
+    expiry = None
+    for url in urls:
+        cached = cache.get(url)
+        if not cached or now - cached.get("checked", 0) >= ttl:
+            return now
+        expires = cached["checked"] + ttl
+        expiry = expires if expiry is None else min(expiry, expires)
+    return expiry
+
+def check_link_graph(entry='index.html', cache_file=LINK_CACHE_FILE, ttl=LINK_CACHE_TTL,
+                     external=True, **options):
+    """
+    Check every link reachable from `entry`
+
+    Anchors and local paths are checked offline. External URLs are
+    checked over the network unless a result younger than `ttl` seconds
+    is cached; only 'ok' and 'blocked' results are cached, so broken or
+    unreachable links are retried on the next deploy. `options` are passed
+    to check_external_urls. Returns a report dict.
+    """
+    links, pages = collect_links(entry)
+    local_problems = check_local_links(links, pages)
+
+    external_links = {}
+    for link in links:
+        if classify(link.url) == 'external':
+            external_links.setdefault(link.url.split('#')[0], []).append(link)
+
+    now = time.time()
+    cache = load_link_cache(cache_file)
+    results = {}
+    stale = []
+    for url in external_links:
+        cached = cache.get(url)
+        if cached and now - cached.get("checked", 0) < ttl:
+            results[url] = cached
+        else:
+            stale.append(url)
+
+    started = time.perf_counter()
+    if external:
+        fresh = asyncio.run(check_external_urls(stale, **options)) if stale else {}
+        for url, result in fresh.items():
+            results[url] = result
+            if result["state"] in ('ok', 'blocked'):
+                cache[url] = dict(result, checked=now)
+        save_link_cache({url: result for url, result in cache.items()
+                         if now - result.get("checked", 0) < ttl}, cache_file)
+    elapsed = time.perf_counter() - started
+
+    kinds = {}
+    for link in links:
+        kind = classify(link.url)
+        kinds[kind] = kinds.get(kind, 0) + 1
+    return {
+        "pages": sorted(pages),
+        "counts": kinds,
+        "local_problems": local_problems,
+        "external": {url: (results.get(url), external_links[url]) for url in external_links},
+        "fetched": len(stale) if external else 0,
+        "cached": len(external_links) - len(stale),
+        "seconds": elapsed,
+    }
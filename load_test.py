@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Testing for Anurag Mishra's Portfolio Website
+This module replays the requests a visitor makes (the page, its stylesheet
+and script, the profile image and the resume PDF) against a running
+server over a pool of keep-alive connections, and reports throughput and
+latency percentiles per asset so hosting changes can be compared by
+numbers rather than impressions.
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from html_analysis import parse_html
+from asset_build import DIST_DIR
+from page_budget import largest_candidate
+
+# Percentiles reported for each asset
+PERCENTILES = (50, 95, 99)
+
+# Headers a browser would send for every asset
+ACCEPT_ENCODING = 'br, gzip'
+
+# Image types the simulated browser decodes, so it picks a <picture>'s first
+# <source> of one of these over the <img> fallback
+SUPPORTED_IMAGE_TYPES = ('image/avif', 'image/webp', 'image/png', 'image/jpeg', 'image/gif',
+                         'image/svg+xml')
+
+def _is_local(url):
+    return bool(url) and not re.match(r'^(?:[a-z]+:)?//|^(?:data|mailto|tel):|^#', url, re.IGNORECASE)
+
+def discover_assets(dist_dir=DIST_DIR):
+    """
+    Find the URLs a first visit to the built page requests
+
+    Returns [(label, path)] for the page itself, its local stylesheet and
+    script, the first local image and the first linked PDF, skipping any
+    the page does not have. An image inside <picture> is requested the way
+    a browser would: from the first <source> with a supported type, taking
+    its largest srcset candidate, as a high-density screen does.
+    """
+    document = parse_html(os.path.join(dist_dir, 'index.html'))
+    assets = [('index.html', '/')]
+
+    def first(tag, attr, accept=lambda element: True):
+        for element in document.find_all(tag):
+            value = element.attrs.get(attr)
+            if _is_local(value) and accept(element):
+                return '/' + value.lstrip('/')
+        return None
+
+    candidates = [
+        ('stylesheet', first('link', 'href', lambda e: (e.attrs.get('rel') or '').lower() == 'stylesheet'
+                                                      or e.attrs.get('as') == 'style')),
+        ('script', first('script', 'src')),
+        ('image', first_image(document)),
+        ('resume', first('a', 'href', lambda e: e.attrs['href'].lower().endswith('.pdf'))),
+    ]
+    assets.extend((label, path) for label, path in candidates if path)
+    return assets
+
+def _supported(source):
+    # A <source> without a type applies to any browser
+    media_type = (source.attrs.get('type') or '').split(';')[0].strip().lower()
+    return not media_type or media_type in SUPPORTED_IMAGE_TYPES
+
+def first_image(document):
+    """
+    Return the path a browser loads for the page's first local image, or None
+    """
+    for element in document.find_all('img'):
+        url = element.attrs.get('src')
+        picture = element.parent
+        if picture is not None and picture.tag == 'picture':
+            source = next((node for node in document.elements
+                           if node.tag == 'source' and node.parent is picture
+                           and node.attrs.get('srcset') and _supported(node)), None)
+            if source is not None:
+                url = largest_candidate(source.attrs['srcset'])
+        if _is_local(url):
+            return '/' + url.lstrip('/')
+    return None
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+class AssetStats:
+    """
+    Latencies, bytes and status codes collected for one asset
+    """
+    __slots__ = ('label', 'path', 'latencies', 'bytes', 'statuses', 'errors')
+
+    def __init__(self, label, path):
+        self.label = label
+        self.path = path
+        self.latencies = []
+        self.bytes = 0
+        self.statuses = {}
+        self.errors = 0
+
+    def summary(self, elapsed):
+        latencies = sorted(self.latencies)
+        result = {
+            "path": self.path,
+            "requests": len(latencies),
+            "errors": self.errors,
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+            "bytes_per_second": round(self.bytes / elapsed) if elapsed else 0,
+        }
+        for pct in PERCENTILES:
+            value = percentile(latencies, pct)
+            result[f"p{pct}_ms"] = round(value * 1000, 3) if value is not None else None
+        return result
+
+async def _read_response(reader):
+    # Returns (status, headers, body) for one HTTP/1.1 response
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise ValueError("chunked responses are not supported")
+    length = int(headers.get('content-length') or 0)
+    body = await reader.readexactly(length) if length else b''
+    return status, headers, body
+
+async def _worker(host, port, assets, stats, deadline, budget, offset):
+    # One keep-alive connection cycling through the assets until time or
+    # the shared request budget runs out; reconnects when the server closes
+    reader = writer = None
+    index = offset
+    try:
+        while time.perf_counter() < deadline:
+            if budget is not None:
+                if budget[0] <= 0:
+                    break
+                budget[0] -= 1
+            label, path = assets[index % len(assets)]
+            index += 1
+            entry = stats[label]
+            request = (f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n'
+                       f'Accept-Encoding: {ACCEPT_ENCODING}\r\n\r\n').encode('latin-1')
+            started = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                writer.write(request)
+                status, headers, body = await _read_response(reader)
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                entry.errors += 1
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            entry.latencies.append(time.perf_counter() - started)
+            entry.bytes += len(body)
+            entry.statuses[status] = entry.statuses.get(status, 0) + 1
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                reader = writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def run_load_test(url, assets, concurrency=16, duration=10.0, requests=None):
+    """
+    Request `assets` from `url` over `concurrency` keep-alive connections
+
+    Runs for `duration` seconds, or until `requests` requests have been
+    made if that is given. Returns (stats by label, elapsed seconds).
+    """
+    parts = urlsplit(url)
+    if parts.scheme != 'http':
+        raise ValueError(f"only http:// URLs are supported: {url}")
+    host = parts.hostname or '127.0.0.1'
+    port = parts.port or 80
+    prefix = parts.path.rstrip('/')
+    assets = [(label, prefix + path) for label, path in assets]
+
+    # Fail fast, with a clear error, if nothing is listening
+    _, writer = await asyncio.open_connection(host, port)
+    writer.close()
+
+    stats = {label: AssetStats(label, path) for label, path in assets}
+    budget = [requests] if requests is not None else None
+    deadline = time.perf_counter() + (duration if requests is None else float('inf'))
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _worker(host, port, assets, stats, deadline, budget, offset)
+        for offset in range(concurrency)
+    ))
+    return stats, time.perf_counter() - started
+
+def build_report(url, stats, elapsed, concurrency):
+    """
+    Summarize a run as a JSON-ready dict with per-asset and overall figures
+    """
+    total = AssetStats('total', None)
+    for entry in stats.values():
+        total.latencies.extend(entry.latencies)
+        total.bytes += entry.bytes
+        total.errors += entry.errors
+        for code, count in entry.statuses.items():
+            total.statuses[code] = total.statuses.get(code, 0) + count
+    return {
+        "url": url,
+        "started": datetime.now().isoformat(timespec='seconds'),
+        "duration": round(elapsed, 3),
+        "concurrency": concurrency,
+        "assets": {label: entry.summary(elapsed) for label, entry in stats.items()},
+        "total": total.summary(elapsed),
+    }
+
+def print_report(report, baseline=None):
+    """
+    Print a per-asset table, with changes against an earlier report if given
+    """
+    print(f"\n{'asset':<12} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'KB/s':>9}  errors")
+    rows = list(report["assets"].items()) + [('total', report["total"])]
+    for label, row in rows:
+        line = (f"{label:<12} {row['requests']:>7} {row['rps']:>8.1f} {row['p50_ms'] or 0:>8.2f} "
+                f"{row['p95_ms'] or 0:>8.2f} {row['p99_ms'] or 0:>8.2f} "
+                f"{row['bytes_per_second'] / 1024:>9.1f}  {row['errors']}")
+        before = (baseline or {}).get("assets", {}).get(label) if label != 'total' else (baseline or {}).get("total")
+        if before and before["rps"] and before["p95_ms"]:
+            line += (f"  (req/s {row['rps'] / before['rps'] - 1:+.0%}, "
+                     f"p95 {(row['p95_ms'] or 0) / before['p95_ms'] - 1:+.0%})")
+        print(line)
+    unexpected = {code: count for code, count in report["total"]["statuses"].items() if code != '200'}
+    if unexpected:
+        print(f"   ⚠️  Non-200 responses: {unexpected}")
+
+def load_report(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_report(report, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Performance Budget for Anurag Mishra's Portfolio Website
+This module measures the built site the way a first visit loads it: the
+requests dist/index.html makes, the service worker it registers and the
+files that worker precaches on install, their raw and compressed transfer
+sizes, how much CSS and JS blocks the first render (and how many blocking
+requests go to other origins), the page's DOM size, the largest image and
+the PDFs, and compares each metric with the limits in
+performance-budget.json.
+"""
+
+import os
+import re
+import json
+from urllib.parse import urlsplit, unquote
+
+from html_analysis import parse_html
+from service_worker import read_precache_manifest, REGISTRATION_SNIPPET, SW_FILENAME
+
+# The limits, and where the last measurement is kept for deployment-info.json
+BUDGET_FILE = 'performance-budget.json'
+BUDGET_REPORT_FILE = os.path.join('.deploy-cache', 'budget.json')
+
+# Metric keys as used in the budget file, with their labels and units
+METRICS = {
+    'transfer_bytes': ('Total transfer (raw)', 'bytes'),
+    'transfer_compressed_bytes': ('Total transfer (compressed)', 'bytes'),
+    'requests': ('Requests', 'requests'),
+    'render_blocking_bytes': ('Render-blocking CSS/JS (compressed)', 'bytes'),
+    'render_blocking_external': ('Render-blocking external CSS/JS', 'requests'),
+    'dom_nodes': ('DOM nodes', 'elements'),
+    'largest_image_bytes': ('Largest image', 'bytes'),
+    'pdf_bytes': ('Largest PDF', 'bytes'),
+}
+
+# What the server sends instead of a file when the browser accepts it
+COMPRESSED_SUFFIXES = ('.br', '.gz')
+
+IMAGE_EXTENSIONS = ('.avif', '.webp', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico')
+
+_CSS_URL = re.compile(r'''url\(\s*(['"]?)(?P<url>[^'")]+)\1\s*\)''')
+
+# Inline data: URLs, whose contents may hold url(#fragment) references of their own
+_CSS_DATA_URL = re.compile(r'''url\(\s*(?:(['"])data:.*?\1|data:[^)]*)\s*\)''', re.DOTALL)
+
+def _is_local(url):
+    return bool(url) and not re.match(r'^(?:[a-z]+:)?//', url, re.IGNORECASE) \
+        and not url.lower().startswith(('data:', '#', 'mailto:', 'tel:', 'javascript:'))
+
+def largest_candidate(srcset):
+    """
+    Return the URL of the widest (or densest) candidate in a srcset
+
+    That is the one a high-density screen downloads, so budgets are
+    checked against the worst case.
+    """
+    best = None
+    best_size = -1.0
+    for candidate in srcset.split(','):
+        parts = candidate.split()
+        if not parts:
+            continue
+        size = 1.0
+        if len(parts) > 1 and parts[1][-1:] in ('w', 'x'):
+            try:
+                size = float(parts[1][:-1])
+            except ValueError:
+                pass
+        if size > best_size:
+            best, best_size = parts[0], size
+    return best
+
+def page_requests(document):
+    """
+    List the subresources a first visit to the page requests
+
+    Returns [{"url", "kind", "blocking", "lazy", "line"}] in page order,
+    one entry per URL. Stylesheets block rendering unless they only apply
+    to print; scripts block it when they sit in <head> without async,
+    defer or type="module". Anything inside <noscript> is ignored, since a
+    browser running scripts never loads it. A <picture> counts only its
+    first <source>, which modern browsers pick.
+    """
+    requests = {}
+
+    def add(url, kind, element, blocking=False, lazy=False):
+        url = url.strip()
+        if not url or url.startswith(('data:', '#')):
+            return
+        entry = requests.get(url)
+        if entry is None:
+            requests[url] = {"url": url, "kind": kind, "blocking": blocking, "lazy": lazy,
+                             "line": element.line}
+        else:
+            entry["blocking"] = entry["blocking"] or blocking
+            entry["lazy"] = entry["lazy"] and lazy
+
+    picked_source = set()
+    for element in document.elements:
+        ancestors = list(element.ancestors())
+        if any(node.tag == 'noscript' for node in ancestors):
+            continue
+        attrs = element.attrs
+        if element.tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            href = attrs.get('href') or ''
+            if 'stylesheet' in rel:
+                add(href, 'stylesheet', element, blocking=(attrs.get('media') or 'all') != 'print')
+            elif 'preload' in rel:
+                add(href, 'stylesheet' if attrs.get('as') == 'style' else attrs.get('as') or 'preload', element)
+            elif rel and set(rel) & {'icon', 'apple-touch-icon', 'manifest'}:
+                add(href, 'icon' if 'manifest' not in rel else 'manifest', element)
+        elif element.tag == 'script' and attrs.get('src'):
+            in_head = any(node.tag == 'head' for node in ancestors)
+            deferred = 'async' in attrs or 'defer' in attrs or attrs.get('type') == 'module'
+            add(attrs['src'], 'script', element, blocking=in_head and not deferred)
+        elif element.tag == 'source' and element.parent is not None and element.parent.tag == 'picture':
+            if element.parent.index in picked_source or not attrs.get('srcset'):
+                continue
+            picked_source.add(element.parent.index)
+            image = next((node for node in document.elements[element.index:]
+                          if node.tag == 'img' and node.parent is element.parent), None)
+            lazy = image is not None and (image.attrs.get('loading') or '').lower() == 'lazy'
+            add(largest_candidate(attrs['srcset']), 'image', element, lazy=lazy)
+        elif element.tag == 'img':
+            if element.parent is not None and element.parent.index in picked_source:
+                continue
+            source = largest_candidate(attrs['srcset']) if attrs.get('srcset') else attrs.get('src')
+            if source:
+                add(source, 'image', element, lazy=(attrs.get('loading') or '').lower() == 'lazy')
+    return list(requests.values())
+
+def local_path(dist_dir, url):
+    """
+    Return the file under `dist_dir` a local URL on the page points to
+    """
+    return os.path.join(dist_dir, unquote(urlsplit(url).path).lstrip('/'))
+
+def transfer_sizes(path):
+    """
+    Return (raw, compressed) byte counts for one file
+
+    The compressed size is that of the smallest precompressed variant
+    written next to the file, or the raw size if there is none.
+    """
+    raw = os.path.getsize(path)
+    compressed = raw
+    for suffix in COMPRESSED_SUFFIXES:
+        if os.path.exists(path + suffix):
+            compressed = min(compressed, os.path.getsize(path + suffix))
+    return raw, compressed
+
+def stylesheet_urls(path):
+    """
+    Return the local url() references in a stylesheet (fonts, backgrounds)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        css = f.read()
+    css = _CSS_DATA_URL.sub('', css)
+    return [match.group('url') for match in _CSS_URL.finditer(css) if _is_local(match.group('url'))]
+
+def service_worker_requests(dist_dir, html):
+    """
+    List what the page's service worker downloads on a first visit
+
+    Nothing unless the page registers sw.js and it was built: otherwise
+    the worker script, then each precached file the page has not already
+    requested. The precached page itself ('./') is the document.
+    """
+    path = os.path.join(dist_dir, SW_FILENAME)
+    if REGISTRATION_SNIPPET not in html or not os.path.isfile(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    requests = [{"url": SW_FILENAME, "kind": 'service-worker', "blocking": False, "lazy": False,
+                 "line": None}]
+    for entry in read_precache_manifest(source):
+        url = 'index.html' if entry["url"] == './' else entry["url"]
+        requests.append({"url": url, "kind": 'precache', "blocking": False, "lazy": False,
+                         "line": None})
+    return requests
+
+def measure_site(dist_dir, pdfs=()):
+    """
+    Measure the built site's first visit
+
+    `pdfs` are extra PDF paths to measure besides those under `dist_dir`.
+    Returns (metrics, assets): metrics keyed as in METRICS, and one dict
+    per request or PDF with its url, kind, path, raw and compressed size,
+    blocking and lazy flags. External requests are counted but cannot be
+    sized offline; their sizes are None, and render-blocking ones are
+    counted separately since their bytes are missing from the totals.
+    """
+    html_path = os.path.join(dist_dir, 'index.html')
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    document = parse_html(html_path)
+    requests = [{"url": 'index.html', "kind": 'document', "blocking": True, "lazy": False, "line": 1}]
+    requests.extend(page_requests(document))
+
+    # Stylesheets pull in their own fonts and images
+    for entry in list(requests):
+        if entry["kind"] == 'stylesheet' and _is_local(entry["url"]):
+            path = local_path(dist_dir, entry["url"])
+            if os.path.isfile(path):
+                base = os.path.dirname(entry["url"])
+                for url in stylesheet_urls(path):
+                    url = os.path.normpath(os.path.join(base, url)).replace(os.sep, '/')
+                    if all(other["url"] != url for other in requests):
+                        kind = 'image' if url.lower().endswith(IMAGE_EXTENSIONS) else 'font'
+                        requests.append({"url": url, "kind": kind, "blocking": False,
+                                         "lazy": False, "line": None})
+
+    # The service worker installs after load and fetches its precache list
+    for entry in service_worker_requests(dist_dir, html):
+        if all(other["url"] != entry["url"] for other in requests):
+            requests.append(entry)
+
+    assets = []
+    for entry in requests:
+        asset = dict(entry, path=None, raw=None, compressed=None)
+        if _is_local(entry["url"]):
+            path = local_path(dist_dir, entry["url"])
+            asset["path"] = path
+            if os.path.isfile(path):
+                asset["raw"], asset["compressed"] = transfer_sizes(path)
+        assets.append(asset)
+
+    pdf_paths = sorted({os.path.normpath(path) for path in pdfs if os.path.isfile(path)})
+    for directory, dirs, names in os.walk(dist_dir):
+        dirs.sort()
+        pdf_paths.extend(os.path.join(directory, name) for name in sorted(names)
+                         if name.lower().endswith('.pdf'))
+    for path in pdf_paths:
+        raw, compressed = transfer_sizes(path)
+        assets.append({"url": path, "kind": 'pdf', "blocking": False, "lazy": False, "line": None,
+                       "path": path, "raw": raw, "compressed": compressed})
+
+    loaded = [asset for asset in assets if asset["kind"] != 'pdf']
+    sized = [asset for asset in loaded if asset["raw"] is not None]
+    images = [asset["raw"] for asset in sized if asset["kind"] == 'image']
+    blocking = [asset for asset in loaded if asset["blocking"] and asset["kind"] in ('stylesheet', 'script')]
+    metrics = {
+        'transfer_bytes': sum(asset["raw"] for asset in sized),
+        'transfer_compressed_bytes': sum(asset["compressed"] for asset in sized),
+        'requests': len(loaded),
+        'render_blocking_bytes': sum(asset["compressed"] for asset in blocking if asset["raw"] is not None),
+        'render_blocking_external': sum(1 for asset in blocking if not _is_local(asset["url"])),
+        'dom_nodes': len(document.elements),
+        'largest_image_bytes': max(images, default=0),
+        'pdf_bytes': max((asset["raw"] for asset in assets if asset["kind"] == 'pdf'), default=0),
+    }
+    return metrics, assets
+
+def load_budget(path=BUDGET_FILE):
+    """
+    Load the budget file: {metric: limit} for any of the METRICS keys
+
+    Raises ValueError for an unknown metric or a limit that is not a
+    non-negative number.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+    for metric, limit in budget.items():
+        if metric not in METRICS:
+            raise ValueError(f"{path}: unknown metric {metric!r} (known: {', '.join(METRICS)})")
+        if isinstance(limit, bool) or not isinstance(limit, (int, float)) or limit < 0:
+            raise ValueError(f"{path}: limit for {metric} must be a non-negative number")
+    return budget
+
+def check_budget(dist_dir, budget_file=BUDGET_FILE, pdfs=(), report_file=BUDGET_REPORT_FILE):
+    """
+    Measure the built site and compare it with the budget
+
+    Returns a report dict: the metrics, the budget, the metrics over their
+    limit, and the per-asset breakdown. The report is also written to
+    `report_file` without the breakdown's file paths.
+    """
+    budget = load_budget(budget_file)
+    metrics, assets = measure_site(dist_dir, pdfs)
+    over = [metric for metric, limit in budget.items() if metrics[metric] > limit]
+    report = {"metrics": metrics, "budget": budget, "over": over, "assets": assets}
+    os.makedirs(os.path.dirname(report_file) or '.', exist_ok=True)
+    with open(report_file, 'w') as f:
+        json.dump({"metrics": metrics, "budget": budget, "over": over,
+                   "assets": [{key: asset[key] for key in ('url', 'kind', 'raw', 'compressed', 'blocking')}
+                              for asset in assets]}, f, indent=2)
+    return report
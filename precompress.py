@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Precompression for Anurag Mishra's Portfolio Website
+This module writes gzip (and, when the brotli package is installed, brotli)
+copies next to every text asset of the built site, so a static host can
+serve them without compressing on each request.
+"""
+
+import os
+import gzip
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Workers are spawned, not forked: the pool is started from deploy's worker
+# threads, and forking a multi-threaded process can deadlock in the child
+_SPAWN = multiprocessing.get_context('spawn')
+
+# Text assets worth precompressing; images and PDFs are already compressed
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg', '.xml', '.txt', '.map')
+
+# Files smaller than this fit in a single packet either way
+MIN_SIZE = 256
+
+# A compressed copy is only kept if it is at most this fraction of the original
+MAX_RATIO = 0.9
+
+def _brotli():
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+def find_compressible(dist_dir):
+    """
+    Return every text asset under `dist_dir` large enough to compress
+    """
+    files = []
+    for root, dirs, names in os.walk(dist_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and os.path.getsize(path) >= MIN_SIZE:
+                files.append(path)
+    return files
+
+def compress_file(path):
+    """
+    Write path.gz (and path.br) where compression pays off
+
+    Returns {"original", "gzip", "brotli"} byte counts, with None for a
+    variant that was skipped or is unavailable.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    result = {"original": len(data), "gzip": None, "brotli": None}
+
+    # mtime=0 keeps the output byte-for-byte reproducible
+    variants = [('gzip', '.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    brotli = _brotli()
+    if brotli is not None:
+        variants.append(('brotli', '.br', lambda d: brotli.compress(d, quality=11)))
+
+    for name, suffix, compress in variants:
+        compressed = compress(data)
+        if len(compressed) <= len(data) * MAX_RATIO:
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            result[name] = len(compressed)
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return result
+
+def precompress_site(dist_dir, workers=None):
+    """
+    Precompress every text asset in `dist_dir` across all cores
+
+    Returns a manifest {relative path: {"original", "gzip", "brotli",
+    "gzip_ratio", "brotli_ratio"}} covering every file considered.
+    """
+    files = find_compressible(dist_dir)
+    if len(files) <= 2 or workers == 1:
+        results = [compress_file(path) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_SPAWN) as pool:
+            results = list(pool.map(compress_file, files))
+
+    manifest = {}
+    for path, result in zip(files, results):
+        for name in ('gzip', 'brotli'):
+            size = result[name]
+            result[f'{name}_ratio'] = round(size / result["original"], 4) if size else None
+        manifest[os.path.relpath(path, dist_dir).replace(os.sep, '/')] = result
+    return manifest
+
+def brotli_available():
+    return _brotli() is not None
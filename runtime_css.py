@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Runtime CSS Extraction for Anurag Mishra's Portfolio Website
+This module finds the stylesheets the built script injects with
+document.createElement('style') after the page loads, moves their rules
+into the built stylesheet and strips the injection code from the shipped
+script. The browser then parses all of the CSS once, up front, instead of
+recalculating styles and layout each time a <style> block is appended.
+"""
+
+import os
+import re
+
+from html_analysis import parse_html
+from asset_build import minify_css, fingerprint, strip_fingerprint
+from critical_css import parse_css, split_selector_list, SelectorMatcher, dynamic_names
+
+# const sheet = document.createElement('style'); sheet.id = '...';
+# sheet.textContent = css; document.head.appendChild(sheet);
+_INJECTION = re.compile(r'''
+    const\s+(?P<sheet>\w+)\s*=\s*document\.createElement\(\s*(?P<q1>['"])style(?P=q1)\s*\)\s*;?\s*
+    (?:(?P=sheet)\.id\s*=\s*(?P<q2>['"])(?P<id>[\w-]+)(?P=q2)\s*;?\s*)?
+    (?P=sheet)\.textContent\s*=\s*(?P<css>\w+)\s*;?\s*
+    document\.head\.appendChild\(\s*(?P=sheet)\s*\)\s*;?
+''', re.VERBOSE)
+
+def _guard(element_id, negated):
+    # document.querySelector('#id') as written in an if condition
+    bang = r'!\s*' if negated else ''
+    return rf'''if\s*\(\s*{bang}document\.querySelector\(\s*(?P<gq>['"])\#{re.escape(element_id)}(?P=gq)\s*\)\s*\)'''
+
+def find_injections(js):
+    """
+    Locate the stylesheets a script injects at runtime
+
+    Two shapes are recognised, both guarded by a check for the <style>
+    element's id: a function whose whole body injects one sheet (its calls
+    are removed too), and an if block injecting a sheet declared earlier
+    in the same function. Returns one dict per injection: id, css, the
+    (start, end) spans to delete, and the function name if any. Anything
+    else is left alone.
+    """
+    injections = []
+    for match in _INJECTION.finditer(js):
+        element_id = match.group('id')
+        if not element_id:
+            continue
+        declarations = list(re.finditer(
+            rf'const\s+{match.group("css")}\s*=\s*`(?P<body>[^`$\\]*)`\s*;?', js[:match.start()]))
+        if not declarations:
+            continue
+        declaration = declarations[-1]
+        css = declaration.group('body')
+
+        # function addXStyles() { if (document.querySelector('#id')) return; const css = `...`; ... }
+        function = None
+        for candidate in re.finditer(
+                rf'function\s+(?P<name>\w+)\s*\(\s*\)\s*\{{\s*{_guard(element_id, False)}\s*return\s*;?\s*$',
+                js[:declaration.start()], re.MULTILINE):
+            function = candidate
+        closing = re.match(r'\s*\}', js[match.end():])
+        if (function is not None and closing
+                and not js[function.end():declaration.start()].strip()
+                and not js[declaration.end():match.start()].strip()):
+            injections.append({
+                "id": element_id,
+                "css": css,
+                "spans": [(function.start(), match.end() + closing.end())],
+                "function": function.group('name'),
+            })
+            continue
+
+        # const css = `...`; ... if (!document.querySelector('#id')) { ...inject... }
+        guard = None
+        for candidate in re.finditer(rf'{_guard(element_id, True)}\s*\{{\s*$', js[:match.start()]):
+            guard = candidate
+        if guard is not None and closing:
+            injections.append({
+                "id": element_id,
+                "css": css,
+                "spans": [(declaration.start(), declaration.end()),
+                          (guard.start(), match.end() + closing.end())],
+                "function": None,
+            })
+    return injections
+
+def strip_injections(js, injections):
+    """
+    Remove the injection code (and calls to injecting functions) from a script
+
+    A function that is still referenced after its calls are removed is
+    kept as an empty function so the script stays valid.
+    """
+    spans = sorted(span for injection in injections for span in injection["spans"])
+    out = []
+    position = 0
+    for start, end in spans:
+        out.append(js[position:start])
+        position = end
+    out.append(js[position:])
+    js = ''.join(out)
+
+    for injection in injections:
+        name = injection["function"]
+        if name is None:
+            continue
+        js = re.sub(rf'(?<![\w.]){name}\s*\(\s*\)\s*;', '', js)
+        if re.search(rf'(?<![\w.]){name}\b', js):
+            js += f'\nfunction {name}() {{}}\n'
+    return js
+
+def canonical_rules(blocks, context=()):
+    """
+    Flatten parsed CSS blocks into (at-rule context, selector, body) tuples
+    with whitespace normalised, in cascade order
+    """
+    rules = []
+    for kind, head, body in blocks:
+        if kind == 'rule':
+            for selector in split_selector_list(head):
+                rules.append((context, minify_css(selector), minify_css(body).rstrip(';')))
+        elif isinstance(body, list):
+            rules.extend(canonical_rules(body, context + (minify_css(head),)))
+        else:
+            rules.append((context, minify_css(head), minify_css(body or '').rstrip(';')))
+    return rules
+
+def runtime_order(js, injections):
+    """
+    Return the injections in the order the script appends their sheets
+
+    That is the order of their first call sites (or guarded blocks) in the
+    source, which is the order they run in when each is reached once, as
+    page-load setup code is.
+    """
+    def first_use(injection):
+        start, end = injection["spans"][-1]
+        if injection["function"] is None:
+            return start
+        calls = [call.start() for call in re.finditer(
+                     rf'(?<![\w.]){injection["function"]}\s*\(\s*\)\s*;', js)
+                 if not start <= call.start() < end]
+        return min(calls, default=start)
+    return sorted(injections, key=first_use)
+
+def page_cascade(document, link, link_css, injected_rules):
+    """
+    List the page's effective rules in cascade order
+
+    Stylesheets are taken in document order: `link`'s rules come from
+    `link_css`, a <style> element's from its text, and any other
+    stylesheet stands for itself as one opaque entry. `injected_rules`
+    are placed at the end of <head>, where document.head.appendChild()
+    inserts a runtime <style> element, before any stylesheet in <body>.
+    """
+    rules = []
+    placed = False
+    for element in document.elements:
+        if element.tag == 'link':
+            if 'stylesheet' not in (element.attrs.get('rel') or '').lower().split():
+                continue
+        elif element.tag != 'style':
+            continue
+        ancestors = list(element.ancestors())
+        if any(node.tag == 'noscript' for node in ancestors):
+            continue
+        if not placed and not any(node.tag == 'head' for node in ancestors):
+            rules.extend(injected_rules)
+            placed = True
+        if element.tag == 'style':
+            text = ''.join(run.text for run in document.text if run.element is element)
+            rules.extend(canonical_rules(parse_css(text)))
+        elif element.attrs.get('href') == link:
+            rules.extend(canonical_rules(parse_css(link_css)))
+        else:
+            rules.append((('@stylesheet',), element.attrs.get('href') or '', ''))
+    if not placed:
+        rules.extend(injected_rules)
+    return rules
+
+def verify_hoisted(document, link, css, injections, new_css, new_js, inline_scripts=()):
+    """
+    Check that hoisting preserved the page's effective rule set
+
+    The rules the runtime sees - the page's stylesheets, then each
+    injected sheet parsed on its own from the script's CSS text, at the
+    end of <head> and outside any at-rule - must equal the rules of the
+    page with the new stylesheet in place of `link`, in the same order.
+    This fails if the hoisted rules would move before a stylesheet that
+    follows `link` in <head>, or if the old stylesheet leaves them inside
+    an unclosed at-rule. @import and @charset are refused outright, since
+    they are ignored anywhere but the start of a stylesheet. No hoisted
+    rule may look unused to the critical CSS pruning once the injection
+    code is gone. Raises ValueError.
+    """
+    injected = []
+    for injection in injections:
+        rules = canonical_rules(parse_css(injection["css"]))
+        for context, selector, _ in rules:
+            if not context and selector.lower().startswith(('@import', '@charset')):
+                raise ValueError(f"#{injection['id']} uses {selector.split()[0]}, which only "
+                                 f"works at the start of a stylesheet")
+        injected.extend(rules)
+    expected = page_cascade(document, link, css, injected)
+    actual = page_cascade(document, link, new_css, [])
+    if actual != expected:
+        position = next((i for i, (a, b) in enumerate(zip(actual, expected)) if a != b),
+                        min(len(actual), len(expected)))
+        raise ValueError(f"hoisting into {link} changes the cascade at rule {position + 1}: "
+                         f"the page's rules no longer match those in effect after the injections")
+
+    matcher = SelectorMatcher(document, dynamic_names('\n'.join([new_js, *inline_scripts])))
+    for injection in injections:
+        for _, selector, _ in canonical_rules(parse_css(injection["css"])):
+            if not selector.startswith('@') and not matcher.matching_elements(selector):
+                raise ValueError(f"hoisted rule {selector!r} from #{injection['id']} "
+                                 f"would be pruned as unused")
+
+def _is_local(url):
+    return bool(url) and not re.match(r'^(?:[a-z]+:)?//', url, re.IGNORECASE)
+
+def hoist_runtime_css(dist_dir):
+    """
+    Move the built script's injected stylesheets into the built stylesheet
+
+    The injected rules are appended after the existing ones in the order
+    the script appends them, which is where the runtime <style> elements
+    sat in the cascade as long as no other stylesheet follows the built
+    one in <head>; verify_hoisted() refuses the change otherwise. Both files are
+    re-fingerprinted and dist/index.html updated. Returns a stats dict, or
+    None if the script injects nothing.
+    """
+    html_path = os.path.join(dist_dir, 'index.html')
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    document = parse_html(html_path)
+
+    script = next((element.attrs['src'] for element in document.find_all('script')
+                   if _is_local(element.attrs.get('src'))), None)
+    link = next((element.attrs['href'] for element in document.find_all('link', rel='stylesheet')
+                 if _is_local(element.attrs.get('href'))), None)
+    if script is None or link is None:
+        return None
+    with open(os.path.join(dist_dir, script), 'r', encoding='utf-8') as f:
+        js = f.read()
+    with open(os.path.join(dist_dir, link), 'r', encoding='utf-8') as f:
+        css = f.read()
+
+    injections = runtime_order(js, find_injections(js))
+    if not injections:
+        return None
+    new_js = strip_injections(js, injections)
+    hoisted = ''.join(minify_css(injection["css"]) for injection in injections)
+    new_css = css + hoisted
+    inline_scripts = [run.text for run in document.text
+                      if run.element is not None and run.element.tag == 'script']
+    verify_hoisted(document, link, css, injections, new_css, new_js, inline_scripts)
+
+    # Everything checks out: write the new files and point the page at them
+    renames = {}
+    for old, content in ((script, new_js), (link, new_css)):
+        new = fingerprint(strip_fingerprint(old), content)
+        if new != old:
+            os.remove(os.path.join(dist_dir, old))
+        with open(os.path.join(dist_dir, new), 'w', encoding='utf-8') as f:
+            f.write(content)
+        renames[old] = new
+    for old, new in renames.items():
+        pattern = r'''((?:src|href)\s*=\s*["']?)''' + re.escape(old) + r'''(?=["'\s>])'''
+        html = re.sub(pattern, lambda m: m.group(1) + new, html)
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    return {
+        "sheets": [injection["id"] for injection in injections],
+        "rules": sum(len(canonical_rules(parse_css(injection["css"]))) for injection in injections),
+        "css_bytes": len(hoisted.encode('utf-8')),
+        "script": renames[script],
+        "script_before": len(js.encode('utf-8')),
+        "script_after": len(new_js.encode('utf-8')),
+        "stylesheet": renames[link],
+    }
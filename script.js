@@ -602,6 +602,182 @@ function initializeSkillTags() {
     });
 }
 
+/**
+ * Site search over the index deploy.py builds from the projects, skills
+ * and certifications sections. The index is fetched the first time the
+ * search box is used; without it (an unbuilt page) the box stays hidden.
+ */
+function initializeSearch() {
+    const meta = document.querySelector('meta[name="search-index"]');
+    const container = document.querySelector('.site-search');
+    if (!meta || !container) return;
+    
+    const input = container.querySelector('.site-search-input');
+    const results = container.querySelector('.site-search-results');
+    let indexRequest = null;
+    container.hidden = false;
+    
+    function loadIndex() {
+        if (!indexRequest) {
+            indexRequest = fetch(meta.content)
+                .then(response => {
+                    if (!response.ok) throw new Error(`Search index request failed: ${response.status}`);
+                    return response.json();
+                })
+                .catch(error => {
+                    // Let the next keystroke retry
+                    indexRequest = null;
+                    throw error;
+                });
+        }
+        return indexRequest;
+    }
+    
+    input.addEventListener('focus', () => loadIndex().catch(() => {}));
+    input.addEventListener('input', debounce(function() {
+        const query = input.value;
+        loadIndex()
+            .then(index => {
+                // Ignore answers to a query the user has since changed
+                if (input.value === query) {
+                    renderSearchResults(index, searchIndex(index, query), results, query);
+                }
+            })
+            .catch(error => {
+                console.error(error);
+                results.hidden = true;
+            });
+    }, 100));
+    
+    input.addEventListener('keydown', function(e) {
+        if (e.key === 'ArrowDown') {
+            const first = results.querySelector('.site-search-result');
+            if (first) {
+                e.preventDefault();
+                first.focus();
+            }
+        } else if (e.key === 'Escape') {
+            results.hidden = true;
+        }
+    });
+    
+    results.addEventListener('keydown', function(e) {
+        const item = e.target.closest('li');
+        if (e.key === 'ArrowDown' && item && item.nextElementSibling) {
+            e.preventDefault();
+            item.nextElementSibling.querySelector('button').focus();
+        } else if (e.key === 'ArrowUp' && item) {
+            e.preventDefault();
+            const previous = item.previousElementSibling;
+            (previous ? previous.querySelector('button') : input).focus();
+        } else if (e.key === 'Escape') {
+            results.hidden = true;
+            input.focus();
+        }
+    });
+    
+    document.addEventListener('click', function(e) {
+        if (!container.contains(e.target)) {
+            results.hidden = true;
+        }
+    });
+}
+
+/**
+ * Split text into search terms the way search_index.py does
+ * @param {string} text - Text to split
+ * @returns {string[]} - Lower-case ASCII words
+ */
+function tokenizeSearchText(text) {
+    const folded = text.normalize('NFKD').replace(/[^\x00-\x7f]/g, '').toLowerCase();
+    return folded.match(/[a-z0-9]+/g) || [];
+}
+
+/**
+ * Find the cards matching every word of a query, each word as a prefix
+ * @param {Object} index - Parsed search index
+ * @param {string} query - Text typed by the user
+ * @returns {number[]} - Matching document ids in page order
+ */
+function searchIndex(index, query) {
+    const stopWords = new Set(index.stopWords);
+    const words = tokenizeSearchText(query);
+    // Stop words are not indexed, but the word being typed may still grow
+    // into one that is ("a" into "audio"), so it is only dropped if it does not
+    const prefixes = words.filter((word, i) => i === words.length - 1 || !stopWords.has(word));
+    
+    let matches = null;
+    prefixes.forEach(prefix => {
+        // Terms are sorted: binary search for the first one with this prefix
+        let low = 0;
+        let high = index.terms.length;
+        while (low < high) {
+            const middle = (low + high) >> 1;
+            if (index.terms[middle] < prefix) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        const found = new Set();
+        for (let i = low; i < index.terms.length && index.terms[i].startsWith(prefix); i++) {
+            let id = 0;
+            index.postings[i].forEach(delta => {
+                id += delta;
+                found.add(id);
+            });
+        }
+        if (!found.size && stopWords.has(prefix)) return;
+        matches = matches ? new Set([...matches].filter(id => found.has(id))) : found;
+    });
+    return matches ? [...matches].sort((a, b) => a - b) : [];
+}
+
+/**
+ * Show search results; choosing one scrolls to its card
+ * @param {Object} index - Parsed search index
+ * @param {number[]} ids - Matching document ids
+ * @param {HTMLElement} results - List to fill
+ * @param {string} query - Text typed by the user
+ */
+function renderSearchResults(index, ids, results, query) {
+    results.replaceChildren();
+    if (!query.trim()) {
+        results.hidden = true;
+        return;
+    }
+    
+    if (!ids.length) {
+        const empty = document.createElement('li');
+        empty.className = 'site-search-empty';
+        empty.textContent = 'No matches';
+        results.appendChild(empty);
+    }
+    
+    ids.slice(0, 10).forEach(id => {
+        const [section, position, title] = index.docs[id];
+        const item = document.createElement('li');
+        const button = document.createElement('button');
+        const label = document.createElement('span');
+        button.type = 'button';
+        button.className = 'site-search-result';
+        label.className = 'site-search-section';
+        label.textContent = section;
+        button.append(label, title);
+        button.addEventListener('click', function() {
+            const card = document.getElementById(section).querySelectorAll(index.sections[section])[position];
+            results.hidden = true;
+            if (!card) return;
+            card.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            card.classList.add('search-hit');
+            setTimeout(() => card.classList.remove('search-hit'), 2000);
+        });
+        item.appendChild(button);
+        results.appendChild(item);
+    });
+    results.hidden = false;
+}
+
 /**
  * Initialize lazy loading for images
  */
@@ -700,6 +876,7 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeLazyLoading();
     initializeKeyboardNavigation();
     initializePerformanceMonitoring();
+    initializeSearch();
 });
 
 // Handle page visibility changes
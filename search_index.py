@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Search Index Generation for Anurag Mishra's Portfolio Website
+This module extracts the text of the project, skill and certification
+cards from the built page and writes a compact inverted index as a
+fingerprinted JSON file. script.js fetches it the first time the search
+box is used and answers queries, including partial words, without
+scanning the page.
+"""
+
+import os
+import re
+import glob
+import json
+import unicodedata
+
+from html_analysis import parse_html
+from asset_build import fingerprint
+
+# The searchable sections and the class of one result card in each
+SEARCH_SECTIONS = {
+    'projects': 'project-card',
+    'skills': 'skill-category',
+    'certifications': 'certification-card',
+}
+
+INDEX_BASENAME = 'search-index.json'
+
+# Tells script.js where the index is; the page has no search box without it
+INDEX_META = 'search-index'
+
+# Words too common to narrow a search down
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'in', 'into',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with', 'using',
+}
+
+# Tags with no searchable text; <i> holds the Font Awesome icons
+_SKIPPED_TAGS = {'script', 'style', 'noscript', 'i'}
+
+def tokenize(text):
+    """
+    Split text into lower-case ASCII words, dropping stop words
+
+    Accents are folded so "résumé" is found by "resume"; script.js
+    normalises queries the same way.
+    """
+    folded = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return [word for word in re.findall(r'[a-z0-9]+', folded) if word not in STOP_WORDS]
+
+def extract_documents(document, sections=SEARCH_SECTIONS):
+    """
+    Collect one searchable record per card, in page order
+
+    Returns [{"section", "position", "title", "text"}] where position is
+    the card's index among its section's cards, which is how script.js
+    finds it again. The title is the card's first heading. Each element's
+    card is resolved from its parent's, so this is a single pass over the
+    document however many cards it has.
+    """
+    section_of = {}
+    card_of = {}
+    records = []
+    counts = dict.fromkeys(sections, 0)
+    for element in document.elements:
+        parent = element.parent
+        section = section_of.get(parent.index) if parent is not None else None
+        card = card_of.get(parent.index) if parent is not None else None
+        if element.tag == 'section' and element.attrs.get('id') in sections:
+            section = element.attrs['id']
+        elif section is not None and card is None and sections[section] in element.classes():
+            card = len(records)
+            records.append({"section": section, "position": counts[section], "title": None, "text": []})
+            counts[section] += 1
+        if element.tag in _SKIPPED_TAGS or (parent is not None and card_of.get(parent.index) == -1):
+            card = -1
+        section_of[element.index] = section
+        card_of[element.index] = card
+
+    for run in document.text:
+        if run.element is None:
+            continue
+        card = card_of.get(run.element.index)
+        if card is None or card == -1:
+            continue
+        text = ' '.join(run.text.split())
+        record = records[card]
+        if record["title"] is None and re.fullmatch(r'h[1-6]', run.element.tag):
+            record["title"] = text
+        record["text"].append(text)
+
+    for record in records:
+        record["text"] = ' '.join(record["text"])
+        if record["title"] is None:
+            record["title"] = record["text"][:60]
+    return records
+
+def build_index(records):
+    """
+    Build the inverted index for a list of card records
+
+    Terms are sorted so a prefix query is a binary search for its first
+    match followed by a scan. Each term's postings are the ascending ids
+    of the cards containing it, delta-encoded to keep the file small.
+    """
+    postings = {}
+    for doc_id, record in enumerate(records):
+        for term in set(tokenize(record["text"])):
+            postings.setdefault(term, []).append(doc_id)
+    terms = sorted(postings)
+    encoded = []
+    for term in terms:
+        ids = postings[term]
+        encoded.append([ids[0]] + [b - a for a, b in zip(ids, ids[1:])])
+    return {
+        "version": 1,
+        "sections": {section: '.' + card for section, card in SEARCH_SECTIONS.items()},
+        "docs": [[record["section"], record["position"], record["title"]] for record in records],
+        "stopWords": sorted(STOP_WORDS),
+        "terms": terms,
+        "postings": encoded,
+    }
+
+def add_index_meta(html, url):
+    """
+    Point the page at the index with a <meta> tag in <head>, replacing any
+    earlier one
+    """
+    tag = f'<meta name="{INDEX_META}" content="{url}">'
+    pattern = re.compile(rf'<meta name="?{INDEX_META}"?[^>]*>')
+    if pattern.search(html):
+        return pattern.sub(lambda m: tag, html, count=1)
+    index = html.lower().find('</head>')
+    if index == -1:
+        return tag + html
+    return html[:index] + tag + html[index:]
+
+def write_search_index(dist_dir):
+    """
+    Extract the searchable cards from dist/index.html and write the index
+
+    Returns a stats dict: the index's filename, its size, the number of
+    cards and terms per section, or None if the page has none of the
+    sections.
+    """
+    html_path = os.path.join(dist_dir, 'index.html')
+    document = parse_html(html_path)
+    records = extract_documents(document)
+    if not records:
+        return None
+
+    index = build_index(records)
+    content = json.dumps(index, separators=(',', ':'), ensure_ascii=False)
+    filename = fingerprint(INDEX_BASENAME, content)
+    root, ext = os.path.splitext(INDEX_BASENAME)
+    for stale in glob.glob(os.path.join(dist_dir, f'{root}.*{ext}')):
+        os.remove(stale)
+    with open(os.path.join(dist_dir, filename), 'w', encoding='utf-8') as f:
+        f.write(content)
+
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    with open(html_path, 'w', encoding='utf-8') as f:
+        f.write(add_index_meta(html, filename))
+
+    cards = {}
+    for record in records:
+        cards[record["section"]] = cards.get(record["section"], 0) + 1
+    return {
+        "filename": filename,
+        "bytes": len(content.encode('utf-8')),
+        "cards": cards,
+        "terms": len(index["terms"]),
+    }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Service Worker Generation for Anurag Mishra's Portfolio Website
+This module writes a service worker for the built site that precaches the
+page, its stylesheet and script and the resume PDF, keyed by content hash,
+so repeat visits load from the cache and a new deploy only refetches the
+assets whose contents changed.
+"""
+
+import os
+import re
+import json
+import hashlib
+
+from html_analysis import parse_html
+from search_index import INDEX_META
+
+# Written at the site root so its scope covers the whole site
+SW_FILENAME = 'sw.js'
+
+# The previous deploy's precache manifest, to report what changed
+PRECACHE_MANIFEST_FILE = os.path.join('.deploy-cache', 'precache-manifest.json')
+
+# Appended to the built page; registering after load keeps it off the critical path
+REGISTRATION_SNIPPET = (
+    "<script>if('serviceWorker'in navigator)addEventListener('load',function(){"
+    f"navigator.serviceWorker.register('{SW_FILENAME}')}})</script>"
+)
+
+SW_TEMPLATE = """\
+// Generated by deploy.py from the built site - do not edit.
+// Precached assets are keyed by content revision: a new deploy only
+// refetches entries whose revision changed, and drops the rest.
+const PRECACHE = 'precache-v1';
+const RUNTIME = 'runtime-v1';
+const PAGES = 'pages-v1';
+const MANIFEST = __MANIFEST__;
+const RUNTIME_URLS = __RUNTIME_URLS__;
+
+const resolve = url => new URL(url, self.location).href;
+const KEYS = new Map(MANIFEST.map(entry => [resolve(entry.url), `${resolve(entry.url)}?__rev=${entry.revision}`]));
+const CURRENT = new Set(RUNTIME_URLS.map(resolve));
+const MATCH = {ignoreVary: true};
+
+self.addEventListener('install', event => {
+  event.waitUntil((async () => {
+    const cache = await caches.open(PRECACHE);
+    await Promise.all(MANIFEST.map(async entry => {
+      const key = KEYS.get(resolve(entry.url));
+      if (await cache.match(key, MATCH)) return;
+      const response = await fetch(resolve(entry.url), {cache: 'no-cache'});
+      if (!response.ok) throw new Error(`precache failed: ${entry.url} (${response.status})`);
+      await cache.put(key, response);
+    }));
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil((async () => {
+    const precached = new Set(KEYS.values());
+    const precache = await caches.open(PRECACHE);
+    for (const request of await precache.keys()) {
+      if (!precached.has(request.url)) await precache.delete(request);
+    }
+    const runtime = await caches.open(RUNTIME);
+    for (const request of await runtime.keys()) {
+      if (!CURRENT.has(request.url)) await runtime.delete(request);
+    }
+    // Also drops PAGES, so the newly precached page replaces stale copies
+    for (const name of await caches.keys()) {
+      if (![PRECACHE, RUNTIME].includes(name)) await caches.delete(name);
+    }
+    await self.clients.claim();
+  })());
+});
+
+// Pages: answer from the cache at once and refresh it from the network
+async function servePage(event) {
+  const request = event.request;
+  const network = fetch(request).then(async response => {
+    if (response.ok) await (await caches.open(PAGES)).put(request, response.clone());
+    return response;
+  });
+  event.waitUntil(network.catch(() => {}));
+  let cached = await (await caches.open(PAGES)).match(request, MATCH);
+  const key = KEYS.get(new URL('./', request.url).href);
+  if (!cached && key) cached = await (await caches.open(PRECACHE)).match(key, MATCH);
+  return cached || network;
+}
+
+async function servePrecached(request, key) {
+  const cached = await (await caches.open(PRECACHE)).match(key, MATCH);
+  return cached || fetch(request);
+}
+
+// Other same-origin assets (image variants, the search index): cache first
+async function serveRuntime(request) {
+  const cache = await caches.open(RUNTIME);
+  const cached = await cache.match(request, MATCH);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok && response.type === 'basic') await cache.put(request, response.clone());
+  return response;
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || url.origin !== self.location.origin) return;
+  url.hash = '';
+  if (request.mode === 'navigate') {
+    event.respondWith(servePage(event));
+  } else if (KEYS.has(url.href)) {
+    event.respondWith(servePrecached(request, KEYS.get(url.href)));
+  } else if (CURRENT.has(url.href)) {
+    event.respondWith(serveRuntime(request));
+  }
+});
+"""
+
+def _is_local(url):
+    return bool(url) and not re.match(r'^(?:[a-z]+:)?//|^(?:data|mailto|tel|javascript):|^#', url, re.IGNORECASE)
+
+def _unique(urls):
+    seen = []
+    for url in urls:
+        if url not in seen:
+            seen.append(url)
+    return seen
+
+def precache_urls(document):
+    """
+    Return the built page's URLs worth precaching: the page itself, its
+    local stylesheets and scripts, and linked PDFs
+    """
+    urls = ['./']
+    for element in document.find_all('link'):
+        rel = (element.attrs.get('rel') or '').lower()
+        href = element.attrs.get('href')
+        if _is_local(href) and (rel == 'stylesheet' or element.attrs.get('as') == 'style'):
+            urls.append(href)
+    urls.extend(element.attrs['src'] for element in document.find_all('script')
+                if _is_local(element.attrs.get('src')))
+    urls.extend(element.attrs['href'] for element in document.find_all('a')
+                if _is_local(element.attrs.get('href')) and element.attrs['href'].lower().endswith('.pdf'))
+    return _unique(urls)
+
+def image_urls(document):
+    """
+    Return every local image URL the page may request, across all
+    srcset candidates; the browser picks one per image at runtime
+    """
+    urls = []
+    for element in document.elements:
+        if element.tag not in ('img', 'source'):
+            continue
+        if _is_local(element.attrs.get('src')):
+            urls.append(element.attrs['src'])
+        for candidate in (element.attrs.get('srcset') or '').split(','):
+            url = candidate.strip().split(' ')[0]
+            if _is_local(url):
+                urls.append(url)
+    return _unique(urls)
+
+def lazy_urls(document):
+    """
+    Return local files the page's script fetches on demand, such as the
+    search index named by a <meta> tag
+    """
+    return [element.attrs['content'] for element in document.find_all('meta', name=INDEX_META)
+            if _is_local(element.attrs.get('content'))]
+
+def build_manifest(dist_dir, urls):
+    """
+    Return [{"url", "revision", "size"}] with each revision a hash of the
+    file's contents
+    """
+    manifest = []
+    for url in urls:
+        path = os.path.join(dist_dir, 'index.html' if url == './' else url)
+        with open(path, 'rb') as f:
+            data = f.read()
+        manifest.append({
+            "url": url,
+            "revision": hashlib.sha256(data).hexdigest()[:16],
+            "size": len(data),
+        })
+    return manifest
+
+def render_service_worker(manifest, runtime_urls):
+    """
+    Fill the service worker template with the precache manifest
+    """
+    entries = [{"url": entry["url"], "revision": entry["revision"]} for entry in manifest]
+    return (SW_TEMPLATE
+            .replace('__MANIFEST__', json.dumps(entries, indent=2))
+            .replace('__RUNTIME_URLS__', json.dumps(runtime_urls, indent=2)))
+
+def read_precache_manifest(source):
+    """
+    Return the [{"url", "revision"}] entries a generated service worker
+    precaches, or [] if `source` holds no manifest
+    """
+    match = re.search(r'^const MANIFEST = (\[.*?\]);$', source, re.MULTILINE | re.DOTALL)
+    if not match:
+        return []
+    return json.loads(match.group(1))
+
+def register_service_worker(html):
+    """
+    Add the registration snippet before </body>, once
+    """
+    if REGISTRATION_SNIPPET in html:
+        return html
+    index = html.lower().rfind('</body>')
+    if index == -1:
+        return html + REGISTRATION_SNIPPET
+    return html[:index] + REGISTRATION_SNIPPET + html[index:]
+
+def generate_service_worker(dist_dir, manifest_file=PRECACHE_MANIFEST_FILE):
+    """
+    Register a service worker from dist/index.html and write dist/sw.js
+
+    The registration goes in first so that the page's revision covers it.
+    Returns a stats dict: entries, precached bytes, the URLs (and bytes)
+    whose revision differs from the previous deploy's manifest, and the
+    service worker's size.
+    """
+    html_path = os.path.join(dist_dir, 'index.html')
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    registered = register_service_worker(html)
+    if registered != html:
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(registered)
+
+    document = parse_html(html_path)
+    manifest = build_manifest(dist_dir, precache_urls(document))
+    source = render_service_worker(manifest, image_urls(document) + lazy_urls(document))
+    with open(os.path.join(dist_dir, SW_FILENAME), 'w', encoding='utf-8') as f:
+        f.write(source)
+
+    previous = {}
+    try:
+        with open(manifest_file, 'r') as f:
+            previous = {entry["url"]: entry["revision"] for entry in json.load(f)}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    changed = [entry for entry in manifest if previous.get(entry["url"]) != entry["revision"]]
+    os.makedirs(os.path.dirname(manifest_file) or '.', exist_ok=True)
+    with open(manifest_file, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    return {
+        "entries": len(manifest),
+        "bytes": sum(entry["size"] for entry in manifest),
+        "changed": [entry["url"] for entry in changed],
+        "changed_bytes": sum(entry["size"] for entry in changed),
+        "first_deploy": not previous,
+        "sw_bytes": len(source.encode('utf-8')),
+    }
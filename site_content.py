@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Site Content for Anurag Mishra's Portfolio Website
+This module holds the one structured content model (content/portfolio.json)
+that the page, the resume and the portfolio catalog are built from. The page's projects,
+skills, experience and certification sections are rendered into
+index.html through small templates that are compiled to Python code once
+and cached on disk; a section is only re-rendered when its template or
+its slice of the content changed. The resume and the catalog read their
+own views of the same model.
+"""
+
+import os
+import re
+import ast
+import sys
+import html
+import json
+import time
+import marshal
+import hashlib
+
+# The content model, and the page whose marked regions are rendered from it
+CONTENT_FILE = os.path.join('content', 'portfolio.json')
+SITE_PAGE = 'index.html'
+TEMPLATE_DIR = 'templates'
+
+# Compiled templates, and the content each rendered region came from
+TEMPLATE_CACHE_DIR = os.path.join('.deploy-cache', 'templates')
+RENDER_CACHE_FILE = os.path.join('.deploy-cache', 'render-cache.json')
+
+# Bump when the code templates compile to changes, to drop cached compilations
+ENGINE_VERSION = 1
+
+# <!-- content:projects --> ... <!-- /content:projects --> in the page; the
+# closing marker's own indentation is kept
+_REGION = re.compile(r'(<!-- content:(?P<name>[\w-]+) -->\n)(?P<body>.*?)(?=^[ \t]*<!-- /content:(?P=name) -->)',
+                     re.DOTALL | re.MULTILINE)
+
+# A tag alone on its line takes the line with it, so block tags leave no
+# blank lines behind
+_TOKEN = re.compile(r'^[ \t]*(\{%.*?%\})[ \t]*(?:\n|\Z)|(\{\{.*?\}\}|\{%.*?%\})', re.MULTILINE)
+
+# The only globals a template expression can reach besides its context
+_TEMPLATE_GLOBALS = {'len': len, 'enumerate': enumerate, 'range': range, 'sorted': sorted,
+                     'str': str, 'min': min, 'max': max, 'any': any, 'all': all}
+
+def escape(value):
+    """
+    HTML-escape a value for text or a double-quoted attribute; None is empty
+    """
+    if value is None:
+        return ''
+    return html.escape(str(value), quote=False).replace('"', '&quot;')
+
+def lookup(value, name):
+    """
+    Resolve `value.name` in a template: a dict key if `value` is a dict,
+    otherwise an attribute
+
+    A missing dict key gives None, so optional content fields can be
+    tested with {% if %} without every entry having to define them.
+    """
+    if isinstance(value, dict):
+        return value.get(name)
+    return getattr(value, name)
+
+class _ExpressionRewriter(ast.NodeTransformer):
+    # Dotted access goes through lookup(); free names are read from the context
+    def __init__(self, local_names):
+        self.local_names = local_names
+
+    def visit_Attribute(self, node):
+        value = self.visit(node.value)
+        return ast.Call(ast.Name('__lookup', ast.Load()), [value, ast.Constant(node.attr)], [])
+
+    def visit_Name(self, node):
+        if node.id in self.local_names or node.id in _TEMPLATE_GLOBALS:
+            return node
+        return ast.Subscript(ast.Name('__context', ast.Load()), ast.Constant(node.id), ast.Load())
+
+def _python_expression(expression, local_names, where):
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"{where}: invalid expression {expression.strip()!r}: {e.msg}") from None
+    tree = ast.fix_missing_locations(_ExpressionRewriter(local_names).visit(tree))
+    return ast.unparse(tree)
+
+def _loop_targets(target, where):
+    try:
+        tree = ast.parse(target.strip(), mode='eval').body
+    except SyntaxError:
+        raise ValueError(f"{where}: invalid loop target {target.strip()!r}") from None
+    names = [tree] if isinstance(tree, ast.Name) else list(getattr(tree, 'elts', []))
+    if not names or not all(isinstance(name, ast.Name) for name in names):
+        raise ValueError(f"{where}: invalid loop target {target.strip()!r}")
+    return [name.id for name in names]
+
+def compile_template(source, name='<template>'):
+    """
+    Translate a template into the Python source of a render(__context) function
+
+    {{ expr }} writes an escaped value and {{ expr | raw }} an unescaped
+    one; {% for x in expr %}, {% if %}, {% elif %}, {% else %}, {% endfor %}
+    and {% endif %} work as in Jinja. Expressions are Python, with a.b
+    resolved by lookup(). Raises ValueError for malformed templates.
+    """
+    lines = ['def render(__context):', '    __out = []', '    __write = __out.append']
+    depth = 1
+    blocks = []
+    local_names = [set()]
+    position = 0
+
+    def emit(code):
+        lines.append('    ' * depth + code)
+
+    for match in _TOKEN.finditer(source):
+        if match.start() > position:
+            emit(f'__write({source[position:match.start()]!r})')
+        position = match.end()
+        token = match.group(1) or match.group(2)
+        where = f"{name}:{source.count(chr(10), 0, match.start()) + 1}"
+        names = set().union(*local_names)
+
+        if token.startswith('{{'):
+            expression = token[2:-2]
+            raw = re.search(r'\|\s*raw\s*$', expression)
+            if raw:
+                expression = expression[:raw.start()]
+            code = _python_expression(expression, names, where)
+            emit(f'__write(str({code}))' if raw else f'__write(__escape({code}))')
+            continue
+
+        words = token[2:-2].strip().split(None, 1)
+        keyword = words[0] if words else ''
+        argument = words[1] if len(words) > 1 else ''
+        if keyword == 'for':
+            target, separator, iterable = argument.partition(' in ')
+            if not separator:
+                raise ValueError(f"{where}: expected {{% for x in items %}}")
+            targets = _loop_targets(target, where)
+            emit(f'for {", ".join(targets)} in {_python_expression(iterable, names, where)}:')
+            blocks.append('for')
+            local_names.append(set(targets))
+            depth += 1
+        elif keyword == 'if':
+            emit(f'if {_python_expression(argument, names, where)}:')
+            blocks.append('if')
+            local_names.append(set())
+            depth += 1
+        elif keyword in ('elif', 'else'):
+            if not blocks or blocks[-1] != 'if':
+                raise ValueError(f"{where}: {{% {keyword} %}} outside {{% if %}}")
+            depth -= 1
+            if keyword == 'elif':
+                emit(f'elif {_python_expression(argument, names, where)}:')
+            else:
+                emit('else:')
+            depth += 1
+        elif keyword in ('endfor', 'endif'):
+            if not blocks or blocks[-1] != keyword[3:]:
+                raise ValueError(f"{where}: unexpected {{% {keyword} %}}")
+            emit('pass')
+            blocks.pop()
+            local_names.pop()
+            depth -= 1
+        else:
+            raise ValueError(f"{where}: unknown tag {token!r}")
+
+    if blocks:
+        raise ValueError(f"{name}: {{% {blocks[-1]} %}} is never closed")
+    if position < len(source):
+        emit(f'__write({source[position:]!r})')
+    emit("return ''.join(__out)")
+    return '\n'.join(lines) + '\n'
+
+def template_key(source):
+    """
+    Return the cache key of a template's compiled code
+
+    The engine and Python versions are part of the key, since compiled
+    code from another interpreter cannot be loaded.
+    """
+    identity = f"{ENGINE_VERSION}\0{sys.version}\0{source}"
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+_LOADED = {}
+
+def load_template(name, template_dir=TEMPLATE_DIR, cache_dir=TEMPLATE_CACHE_DIR):
+    """
+    Return (render, how) for templates/<name>.html
+
+    `how` is 'memory' if this process already loaded it, 'disk' if its
+    compiled code was read from the cache, or 'compiled'. The code is
+    stored with marshal, so a cached template is loaded without parsing.
+    """
+    path = os.path.join(template_dir, f'{name}.html')
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    key = template_key(source)
+    if key in _LOADED:
+        return _LOADED[key], 'memory'
+
+    cached = os.path.join(cache_dir, f'{name}-{key[:16]}.marshal')
+    code = None
+    how = 'disk'
+    try:
+        with open(cached, 'rb') as f:
+            code = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    if code is None:
+        how = 'compiled'
+        code = compile(compile_template(source, path), path, 'exec')
+        os.makedirs(cache_dir, exist_ok=True)
+        for stale in os.listdir(cache_dir):
+            if stale.startswith(f'{name}-') and stale.endswith('.marshal'):
+                os.remove(os.path.join(cache_dir, stale))
+        temporary = cached + '.partial'
+        with open(temporary, 'wb') as f:
+            marshal.dump(code, f)
+        os.replace(temporary, cached)
+
+    namespace = dict(_TEMPLATE_GLOBALS, __builtins__={}, __escape=escape, __lookup=lookup)
+    exec(code, namespace)
+    _LOADED[key] = namespace['render']
+    return namespace['render'], how
+
+def validate_content(model):
+    """
+    Check the references inside the content model; raises ValueError
+    """
+    skills = {skill["name"] for skill in model["skills"]}
+    levels = {level["id"] for level in model["skill_levels"]}
+    for skill in model["skills"]:
+        if skill.get("level") and skill["level"] not in levels:
+            raise ValueError(f"skill {skill['name']!r} has unknown level {skill['level']!r}")
+    for group in model["skill_groups"]:
+        unknown = [name for name in group["skills"] if name not in skills]
+        if unknown:
+            raise ValueError(f"skill group {group['title']!r} lists unknown skills: {', '.join(unknown)}")
+
+    for kind in ('projects', 'experience', 'certifications'):
+        ids = [entry["id"] for entry in model[kind]]
+        duplicates = sorted({entry_id for entry_id in ids if ids.count(entry_id) > 1})
+        if duplicates:
+            raise ValueError(f"duplicate {kind} ids: {', '.join(duplicates)}")
+    for certification in model["certifications"]:
+        if certification["status"] not in model["certification_statuses"]:
+            raise ValueError(f"certification {certification['id']!r} has unknown status "
+                             f"{certification['status']!r}")
+
+    on_resume = {project["id"] for project in model["projects"] if "resume" in project}
+    for role, overrides in model.get("roles", {}).items():
+        missing = [project_id for project_id in overrides.get("project_order", [])
+                   if project_id not in on_resume]
+        if missing:
+            raise ValueError(f"role {role!r} orders projects not on the resume: {', '.join(missing)}")
+
+def load_content(path=CONTENT_FILE):
+    """
+    Load and validate the content model
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        model = json.load(f)
+    validate_content(model)
+    return model
+
+def _resume_link(link):
+    # The resume names the kind of link, not its label on the site
+    return f"{'Deployed' if link['kind'] == 'demo' else 'GitHub'}: {link['url']}"
+
+def resume_content(model):
+    """
+    Return the resume's view of the model, in the shape build_story() lays out
+
+    Only projects and certifications with a "resume" entry are included;
+    that entry may override their name, issuer or title.
+    """
+    content = {key: model[key] for key in (
+        'name', 'headline', 'contact', 'location', 'summary', 'additional_portfolio',
+        'footer', 'updated', 'roles', 'regions', 'defaults') if key in model}
+    content["skills"] = [[f"{group['title']}:", ', '.join(group["skills"])]
+                         for group in model["skill_groups"]]
+    content["experience"] = [{
+        "title": job["resume"].get("title", job["title"]),
+        "company": f"{job['company']} – {job['url']} | {job['location']}",
+        "dates": job["dates"],
+        "details": job["resume"]["details"],
+    } for job in model["experience"] if "resume" in job]
+    content["projects"] = [{
+        "id": project["id"],
+        "name": project["resume"].get("name", project["name"]),
+        "technologies": ', '.join(project["technologies"]),
+        "link": _resume_link(project["links"][0]) if project["links"] else '',
+        "details": project["resume"]["details"],
+    } for project in model["projects"] if "resume" in project]
+    education = model["education"]
+    content["education"] = {key: education[key] for key in ('degree', 'institution', 'grade')}
+    content["certifications"] = [
+        f"<b>{cert['resume'].get('name', cert.get('short', cert['name']))}</b> – "
+        f"{cert['resume'].get('issuer', cert['issuer'])}"
+        for cert in model["certifications"] if "resume" in cert
+    ]
+    return content
+
+def catalog_projects(model):
+    """
+    Yield the catalog's view of the model: one record per project with a
+    "catalog" entry, as {"id", "name", "description", "skills", "links"}
+
+    "skills" are the catalog entry's [label, skills] table rows and
+    "links" are [label, url] pairs. Records are made as they are consumed,
+    so the model's projects are not copied all at once.
+    """
+    for project in model["projects"]:
+        if "catalog" in project:
+            yield {
+                "id": project["id"],
+                "name": project["name"],
+                "description": project["description"],
+                "skills": project["catalog"]["skills"],
+                "links": [[link["label"], link["url"]] for link in project["links"]],
+            }
+
+def site_sections(model):
+    """
+    Return the context each page section is rendered with, keyed by section
+
+    Each context holds only what its template uses, so an edit to one part
+    of the model only changes the contexts of the sections that show it.
+    """
+    levels = [dict(level, skills=[skill["name"] for skill in model["skills"]
+                                  if skill.get("level") == level["id"]])
+              for level in model["skill_levels"]]
+
+    statuses = model["certification_statuses"]
+    certifications = [dict(cert, badge=statuses[cert["status"]]) for cert in model["certifications"]]
+
+    # The right-hand column of the experience section summarises the
+    # certifications and the degree instead of repeating them
+    achievements = []
+    for card in model["achievements"]:
+        if card["id"] == 'education':
+            education = model["education"]
+            card = dict(education["site"], id='education', title=education["title"],
+                        subtitle=education["institution"], location=education["location"],
+                        dates=education["dates"], badge=['education', education["site"]["badge"]])
+        elif card["id"] == 'certifications':
+            card = dict(card, credentials=[cert for cert in model["certifications"]
+                                           if cert["status"] == 'verified'])
+        achievements.append(card)
+
+    return {
+        "projects": {"projects": [project for project in model["projects"] if "site" in project]},
+        "skills": {"levels": levels},
+        "experience": {"jobs": [job for job in model["experience"] if "site" in job],
+                       "achievements": achievements},
+        "certifications": {"certifications": certifications},
+    }
+
+def content_key(*parts):
+    """
+    Return a hash identifying a rendering's inputs: template sources and
+    JSON-serialisable data
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False)
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def load_render_cache(path=RENDER_CACHE_FILE):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_render_cache(cache, path=RENDER_CACHE_FILE):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+def render_site(page=SITE_PAGE, content_path=CONTENT_FILE, template_dir=TEMPLATE_DIR,
+                cache_file=RENDER_CACHE_FILE):
+    """
+    Render every marked region of `page` from the content model
+
+    A region is skipped when its template and context hash to the key
+    recorded when it was last rendered and the page still holds that
+    output, so editing one project only re-renders the projects section.
+    The page is only written if a region changed. A region edited by hand
+    since it was last rendered is rendered over, and named in the stats'
+    "overwritten" list. Returns a stats dict with per-section timings.
+    """
+    started = time.perf_counter()
+    model = load_content(content_path)
+    contexts = site_sections(model)
+    with open(page, 'r', encoding='utf-8') as f:
+        original = f.read()
+    cache = load_render_cache(cache_file)
+    sections = []
+    overwritten = []
+
+    def render_region(match):
+        name = match.group('name')
+        section_started = time.perf_counter()
+        if name not in contexts:
+            raise ValueError(f"{page} marks a content:{name} region but the model has no {name} section")
+        with open(os.path.join(template_dir, f'{name}.html'), 'r', encoding='utf-8') as f:
+            source = f.read()
+        key = content_key(source, contexts[name])
+        body = match.group('body')
+        entry = cache.get(name, {})
+        how = 'cached'
+        if entry.get("key") != key or entry.get("output") != content_key(body):
+            render, how = load_template(name, template_dir)
+            output = render(contexts[name])
+            if entry.get("output") not in (None, content_key(body)) and output != body:
+                overwritten.append(name)
+            body = output
+            cache[name] = {"key": key, "output": content_key(body)}
+        sections.append({"name": name, "how": how, "bytes": len(body.encode('utf-8')),
+                         "seconds": time.perf_counter() - section_started})
+        return match.group(1) + body
+
+    rendered = _REGION.sub(render_region, original)
+    missing = sorted(set(contexts) - {section["name"] for section in sections})
+    if rendered != original:
+        with open(page, 'w', encoding='utf-8') as f:
+            f.write(rendered)
+    save_render_cache(cache, cache_file)
+    return {
+        "sections": sections,
+        "missing": missing,
+        "overwritten": overwritten,
+        "written": rendered != original,
+        "seconds": time.perf_counter() - started,
+    }
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Site Scanner for Anurag Mishra's Portfolio Website
+This module finds placeholder and suspicious strings across every text
+asset of the site in a single pass per file, using an Aho-Corasick automaton
+so the cost does not grow with the number of patterns.
+"""
+
+import os
+import mmap
+import time
+from collections import deque
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# check_links scans from one of deploy's stage threads; a forked child of a
+# multi-threaded process can deadlock, so the pool's workers are spawned
+_SPAWN = multiprocessing.get_context('spawn')
+
+# File types that make up the site's text assets
+SCANNED_EXTENSIONS = ('.html', '.css', '.js', '.json')
+
+# Directories that hold build output or tooling state rather than site sources
+SKIPPED_DIRECTORIES = {'dist', 'node_modules', '__pycache__'}
+
+# Files written by deploy itself, which would otherwise be rescanned every run
+SKIPPED_FILES = {'deployment-info.json'}
+
+# Files at least this large are memory-mapped instead of read into memory
+MMAP_THRESHOLD = 1 << 20
+
+# ASCII case folding table; matching is case-insensitive
+_FOLD = bytes(range(256)).lower()
+
+class PatternMatcher:
+    """
+    Aho-Corasick automaton over bytes, matching many patterns in one pass
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern.encode('utf-8').translate(_FOLD):
+                if byte not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][byte] = len(self.goto) - 1
+                state = self.goto[state][byte]
+            self.output[state].append(index)
+
+        # Breadth-first pass to compute failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, target in self.goto[state].items():
+                queue.append(target)
+                fallback = self.fail[state]
+                while fallback and byte not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[target] = self.goto[fallback].get(byte, 0)
+                self.output[target] = self.output[target] + self.output[self.fail[target]]
+
+    def scan(self, data):
+        """
+        Yield (pattern, line, col) for every match in `data`
+
+        `data` may be bytes or an mmap; lines and columns are 1-based, with
+        columns counted in bytes.
+        """
+        goto, fail, output = self.goto, self.fail, self.output
+        lengths = [len(pattern.encode('utf-8')) for pattern in self.patterns]
+        state = 0
+        line = 1
+        line_start = 0
+        for position, byte in enumerate(data.translate(_FOLD) if isinstance(data, bytes) else iter_folded(data)):
+            if byte == 10:
+                line += 1
+                line_start = position + 1
+            while state and byte not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(byte, 0)
+            for index in output[state]:
+                start = position - lengths[index] + 1
+                yield self.patterns[index], line, start - line_start + 1
+
+def iter_folded(data, chunk_size=1 << 16):
+    """
+    Iterate the case-folded bytes of a mapped file one chunk at a time
+    """
+    for offset in range(0, len(data), chunk_size):
+        yield from data[offset:offset + chunk_size].translate(_FOLD)
+
+def find_site_files(root='.'):
+    """
+    Return every scannable text asset under `root`, skipping hidden and build directories
+    """
+    files = []
+    for directory, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in SKIPPED_DIRECTORIES)
+        for name in sorted(names):
+            if name.endswith(SCANNED_EXTENSIONS) and name not in SKIPPED_FILES:
+                files.append(os.path.normpath(os.path.join(directory, name)))
+    return files
+
+# Per-worker automaton, built once by the pool initializer
+_matcher = None
+
+def _init_worker(patterns):
+    global _matcher
+    _matcher = PatternMatcher(patterns)
+
+def scan_file(path):
+    """
+    Scan one file with the worker's automaton
+
+    Returns {"path", "bytes", "seconds", "hits"} where hits are (pattern, line, col).
+    """
+    started = time.perf_counter()
+    size = os.path.getsize(path)
+    hits = []
+    if size:
+        with open(path, 'rb') as f:
+            if size >= MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    hits = list(_matcher.scan(data))
+            else:
+                hits = list(_matcher.scan(f.read()))
+    return {
+        "path": path,
+        "bytes": size,
+        "seconds": time.perf_counter() - started,
+        "hits": hits,
+    }
+
+def scan_site(patterns, root='.', workers=None):
+    """
+    Scan every text asset under `root` for `patterns`, spreading files across a process pool
+
+    Small sites are scanned in-process, where pool startup would cost more
+    than the scan itself.
+    """
+    files = find_site_files(root)
+    if len(files) <= 4 or workers == 1:
+        _init_worker(patterns)
+        return [scan_file(path) for path in files]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(list(patterns),), mp_context=_SPAWN) as pool:
+        return list(pool.map(scan_file, files))
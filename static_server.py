@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Local Static Server for Anurag Mishra's Portfolio Website
+This module serves the built site over HTTP/1.1 the way the production
+static host does: strong ETags with 304 revalidation, byte ranges,
+precompressed .br/.gz variants and long-lived caching for fingerprinted
+assets. It is a local testing stand-in, not a production server.
+"""
+
+import os
+import re
+import asyncio
+import hashlib
+import mimetypes
+from urllib.parse import unquote, urlsplit
+
+from asset_build import DIST_DIR, FINGERPRINT_LENGTH
+
+# Fingerprinted assets never change, so browsers may keep them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Everything else is revalidated with If-None-Match on every use
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Precompressed variants written by precompress.py, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Largest request head accepted, and how long an idle keep-alive connection lives
+MAX_HEAD_BYTES = 16 * 1024
+KEEP_ALIVE_SECONDS = 15
+
+# styles.3f9a1c2e.css, and image variants such as Anurag.4d97cc2b-300w.avif
+_FINGERPRINTED = re.compile(rf'\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}(?:-\d+w)?\.[^./]+$')
+
+REASONS = {
+    200: 'OK', 206: 'Partial Content', 304: 'Not Modified', 400: 'Bad Request',
+    404: 'Not Found', 405: 'Method Not Allowed', 416: 'Range Not Satisfiable',
+    500: 'Internal Server Error',
+}
+
+mimetypes.add_type('image/avif', '.avif')
+mimetypes.add_type('image/webp', '.webp')
+
+def is_fingerprinted(path):
+    return bool(_FINGERPRINTED.search(path))
+
+def cache_control(path):
+    """
+    Return the Cache-Control value for a served file
+    """
+    return IMMUTABLE_CACHE_CONTROL if is_fingerprinted(path) else REVALIDATE_CACHE_CONTROL
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header into {coding: qvalue}
+    """
+    codings = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if not name:
+            continue
+        q = 1.0
+        match = re.search(r'q\s*=\s*([0-9.]+)', params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        codings[name.strip().lower()] = q
+    return codings
+
+def parse_range(header, size):
+    """
+    Parse a single "bytes=" Range header against a body of `size` bytes
+
+    Returns (start, end) with an inclusive end, or None when the header
+    should be ignored and the whole body sent: malformed, several ranges,
+    or a last byte before the first (RFC 7233 section 2.1). Raises
+    ValueError if a valid range cannot be satisfied.
+    """
+    match = re.fullmatch(r'\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*', header or '')
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise ValueError("range starts past the end")
+    return start, end
+
+def etag_matches(header, etag):
+    """
+    Weak comparison of an If-None-Match header against an ETag
+    """
+    if header is None:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(tag.strip().removeprefix('W/') == etag for tag in header.split(','))
+
+class FileEntry:
+    """
+    A served file's bytes and ETag, valid while its mtime and size match
+    """
+    __slots__ = ('mtime_ns', 'size', 'etag', 'data')
+
+    def __init__(self, mtime_ns, size, etag, data):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.etag = etag
+        self.data = data
+
+class StaticSite:
+    """
+    Map request targets to files under `root` and build responses
+
+    File contents and their ETags are kept in memory and reloaded when a
+    file's mtime or size changes, so a rebuilt site is picked up live.
+    """
+
+    def __init__(self, root=DIST_DIR):
+        self.root = os.path.realpath(root)
+        self.files = {}
+
+    def resolve(self, target):
+        """
+        Return the file a request target refers to, or None
+
+        Raises ValueError for a target whose path is not valid UTF-8 once
+        decoded or holds a NUL byte, which no file name can.
+        """
+        path = unquote(urlsplit(target).path, errors='strict')
+        if '\0' in path:
+            raise ValueError(f"NUL byte in request target: {target!r}")
+        full = os.path.realpath(os.path.join(self.root, path.lstrip('/')))
+        if os.path.commonpath([self.root, full]) != self.root:
+            return None
+        if os.path.isdir(full):
+            full = os.path.join(full, 'index.html')
+        return full if os.path.isfile(full) else None
+
+    def load(self, path):
+        """
+        Return the FileEntry for `path`, or None if it does not exist
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.files.pop(path, None)
+            return None
+        entry = self.files.get(path)
+        if entry is None or (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+            with open(path, 'rb') as f:
+                data = f.read()
+            etag = '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+            entry = FileEntry(stat.st_mtime_ns, stat.st_size, etag, data)
+            self.files[path] = entry
+        return entry
+
+    def respond(self, method, target, headers):
+        """
+        Build the response to one request
+
+        `headers` maps lower-cased header names to values. Returns
+        (status, [(name, value), ...], body, encoding) where encoding is
+        the content coding served, or None for the identity body.
+        """
+        if method not in ('GET', 'HEAD'):
+            return 405, [('Allow', 'GET, HEAD')], b'', None
+        try:
+            path = self.resolve(target)
+        except ValueError:
+            return 400, [('Content-Type', 'text/plain; charset=utf-8')], b'Bad Request\n', None
+        if path is None:
+            return 404, [('Content-Type', 'text/plain; charset=utf-8')], b'Not Found\n', None
+
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        response = [('Content-Type', content_type), ('Cache-Control', cache_control(path))]
+
+        # Pick a precompressed variant, unless a byte range was asked for:
+        # ranges always address the identity body (as resume.pdf downloads do)
+        variants = [(coding, path + suffix) for coding, suffix in ENCODINGS
+                    if os.path.isfile(path + suffix)]
+        if variants:
+            response.append(('Vary', 'Accept-Encoding'))
+        encoding = None
+        entry = None
+        if 'range' not in headers:
+            accepted = parse_accept_encoding(headers.get('accept-encoding'))
+            for coding, variant in variants:
+                if accepted.get(coding, accepted.get('*', 0)) > 0:
+                    entry = self.load(variant)
+                    if entry is not None:
+                        encoding = coding
+                        break
+        if entry is None:
+            entry = self.load(path)
+            if entry is None:
+                return 404, [('Content-Type', 'text/plain; charset=utf-8')], b'Not Found\n', None
+
+        response.append(('ETag', entry.etag))
+        if encoding:
+            response.append(('Content-Encoding', encoding))
+        if etag_matches(headers.get('if-none-match'), entry.etag):
+            return 304, response, b'', encoding
+
+        response.append(('Accept-Ranges', 'bytes'))
+        body = entry.data
+        status = 200
+        if 'range' in headers and headers.get('if-range', entry.etag) == entry.etag:
+            try:
+                byte_range = parse_range(headers['range'], len(body))
+            except ValueError:
+                response.append(('Content-Range', f'bytes */{len(body)}'))
+                return 416, response, b'', None
+            if byte_range is not None:
+                start, end = byte_range
+                response.append(('Content-Range', f'bytes {start}-{end}/{len(body)}'))
+                body = body[start:end + 1]
+                status = 206
+        return status, response, body, encoding
+
+async def read_request(reader):
+    """
+    Read one request head; returns (method, target, version, headers) or None at EOF
+
+    Raises ValueError for a malformed request line or Content-Length, which
+    the connection answers with 400 Bad Request.
+    """
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_SECONDS)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+        raise ValueError(f"malformed request line: {lines[0]!r}")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    length = headers.get('content-length')
+    if length is not None and not length.isdigit():
+        raise ValueError(f"malformed Content-Length: {length!r}")
+    return parts[0], parts[1], parts[2], headers
+
+async def handle_connection(reader, writer, site, log=True):
+    """
+    Serve requests on one connection until the client or a timeout closes it
+    """
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except (ValueError, asyncio.LimitOverrunError):
+                writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+                break
+            if request is None:
+                break
+            method, target, version, headers = request
+
+            # Requests without a body are all this server handles; skip any sent
+            length = int(headers.get('content-length') or 0)
+            if length:
+                try:
+                    await reader.readexactly(length)
+                except asyncio.IncompleteReadError:
+                    break
+
+            try:
+                status, response, body, encoding = site.respond(method, target, headers)
+            except Exception as e:
+                # One bad request must not take the connection down unanswered
+                if log:
+                    print(f"   ⚠️  {method} {target}: {type(e).__name__}: {e}")
+                status, response, body, encoding = (
+                    500, [('Content-Type', 'text/plain; charset=utf-8')], b'Internal Server Error\n', None)
+            connection = headers.get('connection', '').lower()
+            keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                          else connection == 'keep-alive')
+            if status != 304:
+                response.append(('Content-Length', str(len(body))))
+            response.append(('Connection', 'keep-alive' if keep_alive else 'close'))
+            head = f'HTTP/1.1 {status} {REASONS.get(status, "")}\r\n'
+            head += ''.join(f'{name}: {value}\r\n' for name, value in response)
+            writer.write(head.encode('latin-1') + b'\r\n')
+            if method != 'HEAD' and status != 304:
+                writer.write(body)
+            await writer.drain()
+
+            if log:
+                note = f", {encoding}" if encoding else ''
+                print(f"   {method} {target} → {status} ({len(body)} bytes{note})")
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def serve(root=DIST_DIR, host='127.0.0.1', port=8000, log=True):
+    """
+    Serve `root` until cancelled
+    """
+    site = StaticSite(root)
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, site, log),
+        host, port, limit=MAX_HEAD_BYTES,
+    )
+    async with server:
+        await server.serve_forever()
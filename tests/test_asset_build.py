@@ -0,0 +1,96 @@
+"""
+Minification and fingerprinting tests for the asset build stage
+"""
+
+import os
+import tempfile
+import unittest
+
+from asset_build import minify_css, minify_js, minify_html, fingerprint, strip_fingerprint, build_site
+
+class MinifyTest(unittest.TestCase):
+
+    def test_css(self):
+        self.assertEqual(minify_css('/* c */ a , b > p {\n  color: red ;\n  margin: 0 auto;\n}\n'),
+                         'a,b>p{color:red;margin:0 auto}')
+        # A descendant combinator before a pseudo-class is not a compound selector
+        self.assertEqual(minify_css('nav :hover { x: 1 }'), 'nav :hover{x:1}')
+        self.assertEqual(minify_css('a::after { content: "  /* kept */  "; }'),
+                         'a::after{content:"  /* kept */  "}')
+        self.assertEqual(minify_css('@media (max-width: 600px) { .a { b: c } }'),
+                         '@media (max-width:600px){.a{b:c}}')
+
+    def test_js(self):
+        source = ("// header\n"
+                  "const url = 'http://example.com'; // trailing\n"
+                  "    const re = /\\/\\*not a comment/g;\n"
+                  "\n"
+                  "/* block */\nconst t = `line\n  ${a /* c */ + 1} // kept`;\n"
+                  "let x = a\n"
+                  "(b)\n")
+        self.assertEqual(minify_js(source),
+                         "const url = 'http://example.com';\n"
+                         "const re = /\\/\\*not a comment/g;\n"
+                         "const t = `line\n  ${a  + 1} // kept`;\n"
+                         "let x = a\n"
+                         "(b)")
+
+    def test_html(self):
+        source = ('<!DOCTYPE html>\n<html>\n<head>\n  <title> Page </title>\n'
+                  '  <style> a { color: red; } </style>\n</head>\n<body>\n'
+                  '  <!-- note -->\n  <p class="x   y"  id = "p">'
+                  '<span class="location">Remote</span>\n  <div class="date">2024</div></p>\n'
+                  '  <pre>  keep\n   this </pre>\n'
+                  '  <a href="styles.css">css</a>\n</body>\n</html>\n')
+        html = minify_html(source, {'styles.css': 'styles.0123abcd.css'})
+        self.assertTrue(html.startswith('<!DOCTYPE html><html><head><title> Page </title>'
+                                        '<style>a{color:red}</style></head><body><p '))
+        # The gap between inline(-block) elements is one space, never none
+        self.assertIn('<span class="location">Remote</span> <div class="date">', html)
+        self.assertIn('<p class="x   y" id = "p">', html)
+        self.assertIn('</p> <pre>  keep\n   this </pre> <a ', html)
+        self.assertIn('href="styles.0123abcd.css"', html)
+        self.assertNotIn('note', html)
+        self.assertTrue(html.endswith('</a></body></html>'))
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_round_trip(self):
+        path = fingerprint('css/styles.css', 'a{b:c}')
+        self.assertRegex(path, r'^css/styles\.[0-9a-f]{8}\.css$')
+        self.assertEqual(fingerprint('css/styles.css', 'a{b:c}'), path)
+        self.assertNotEqual(fingerprint('css/styles.css', 'a{b:d}'), path)
+        self.assertEqual(strip_fingerprint(path), 'css/styles.css')
+        self.assertEqual(strip_fingerprint('styles.css'), 'styles.css')
+
+    def test_build_site(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(workdir.name)
+        with open('index.html', 'w', encoding='utf-8') as f:
+            f.write('<html><head><link rel="stylesheet" href="styles.css"></head>'
+                    '<body><script src="script.js"></script></body></html>')
+        with open('styles.css', 'w', encoding='utf-8') as f:
+            f.write('body {\n  margin: 0;\n}\n')
+        with open('script.js', 'w', encoding='utf-8') as f:
+            f.write('// greet\nconsole.log("hi");\n')
+        os.makedirs(os.path.join('resources', 'images'))
+        with open(os.path.join('resources', 'images', 'a.png'), 'wb') as f:
+            f.write(b'png')
+
+        report = build_site('dist')
+        outputs = {record["source"]: record["output"] for record in report}
+        self.assertEqual(outputs['styles.css'], fingerprint('styles.css', 'body{margin:0}'))
+        with open(os.path.join('dist', 'index.html'), encoding='utf-8') as f:
+            html = f.read()
+        self.assertIn(f'href="{outputs["styles.css"]}"', html)
+        self.assertIn(f'src="{outputs["script.js"]}"', html)
+        with open(os.path.join('dist', outputs['script.js']), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'console.log("hi");')
+        self.assertTrue(os.path.isfile(os.path.join('dist', 'resources', 'images', 'a.png')))
+        for record in report[:2]:
+            self.assertLess(record["minified"], record["original"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Critical CSS tests: which rules are pruned, which are inlined, and the
+deferred stylesheet the page ends up loading
+"""
+
+import os
+import re
+import tempfile
+import unittest
+
+from critical_css import parse_css, serialize_css, inline_critical_css
+
+CSS = ("body{margin:0}"
+       ".hero h1{font-size:2em;animation:fade 1s}"
+       ".unused{color:red}"
+       ".footer{color:gray}"
+       ".menu.open{display:block}"
+       ".toast-error{color:red}"
+       "@media (max-width:600px){.hero h1{font-size:1.5em}.gone{x:y}}"
+       "@keyframes fade{from{opacity:0}to{opacity:1}}"
+       "@keyframes spin{to{transform:rotate(1turn)}}")
+
+PAGE = ('<!DOCTYPE html><html><head><link rel="stylesheet" href="styles.0123abcd.css"></head>'
+        '<body><section id="home" class="hero"><h1>Hi</h1><nav class="menu"></nav></section>'
+        '<footer class="footer">bye</footer>'
+        "<script>menu.classList.add('open'); show(`toast-${kind}`);</script></body></html>")
+
+class CriticalCssTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.dist = self.workdir.name
+        with open(os.path.join(self.dist, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(PAGE)
+        with open(os.path.join(self.dist, 'styles.0123abcd.css'), 'w', encoding='utf-8') as f:
+            f.write(CSS)
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_parse_round_trip(self):
+        self.assertEqual(serialize_css(parse_css(CSS)), CSS)
+
+    def test_prune_and_inline(self):
+        stats = inline_critical_css(self.dist)
+        with open(os.path.join(self.dist, stats["stylesheet"]), encoding='utf-8') as f:
+            kept = f.read()
+        with open(os.path.join(self.dist, 'index.html'), encoding='utf-8') as f:
+            html = f.read()
+        critical = re.search(r'<style>(.*?)</style>', html).group(1)
+
+        # Rules matching nothing go; runtime class names from the scripts stay
+        self.assertNotIn('.unused', kept)
+        self.assertNotIn('.gone', kept)
+        self.assertNotIn('spin', kept)
+        for rule in ('.footer{color:gray}', '.menu.open{display:block}', '.toast-error{color:red}',
+                     '@keyframes fade'):
+            self.assertIn(rule, kept)
+        self.assertEqual(stats["dropped"], 2)
+
+        # The first screen's rules (and the animation they use) are inlined;
+        # runtime-only and below-the-fold rules are not
+        self.assertIn('.hero h1{font-size:2em', critical)
+        self.assertIn('@media (max-width:600px){.hero h1{font-size:1.5em}}', critical)
+        self.assertIn('@keyframes fade', critical)
+        self.assertNotIn('.footer', critical)
+        self.assertNotIn('.menu.open', critical)
+
+        # The pruned sheet is re-fingerprinted and loaded without blocking
+        self.assertFalse(os.path.exists(os.path.join(self.dist, 'styles.0123abcd.css')))
+        self.assertNotIn('rel="stylesheet" href="styles.0123abcd.css"', html)
+        self.assertIn(f'<link rel="preload" href="{stats["stylesheet"]}" as="style"', html)
+        self.assertIn(f'<noscript><link rel="stylesheet" href="{stats["stylesheet"]}"></noscript>', html)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Delta sync tests: what a sync may delete, and paths it must refuse
+"""
+
+import io
+import os
+import json
+import tarfile
+import tempfile
+import unittest
+
+from deploy_sync import (sync_site, sync_directory, sync_tarball, apply_tarball, build_manifest,
+                         safe_path, TARGET_MANIFEST)
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(data)
+
+class DeploySyncTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.workdir.name, 'dist')
+        self.target = os.path.join(self.workdir.name, 'target')
+        self.synced_file = os.path.join(self.workdir.name, 'synced.json')
+        write(os.path.join(self.source, 'index.html'), '<h1>v1</h1>')
+        write(os.path.join(self.source, 'styles.css'), 'h1{color:red}')
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_unmanifested_target_keeps_foreign_files(self):
+        # A gh-pages checkout: repository metadata, a CNAME and an old copy of the page
+        write(os.path.join(self.target, '.git', 'HEAD'), 'ref: refs/heads/gh-pages')
+        write(os.path.join(self.target, 'CNAME'), 'example.com')
+        write(os.path.join(self.target, 'index.html'), '<h1>v1</h1>')
+
+        diff = sync_site(self.target, self.source)["diff"]
+        self.assertEqual(diff["removed"], [])
+        self.assertEqual(diff["unchanged"], ['index.html'])
+        self.assertEqual(diff["added"], ['styles.css'])
+        self.assertTrue(os.path.isfile(os.path.join(self.target, '.git', 'HEAD')))
+        self.assertTrue(os.path.isfile(os.path.join(self.target, 'CNAME')))
+
+        # Once synced, only files the site itself wrote are removed
+        os.remove(os.path.join(self.source, 'styles.css'))
+        diff = sync_site(self.target, self.source)["diff"]
+        self.assertEqual(diff["removed"], ['styles.css'])
+        self.assertFalse(os.path.exists(os.path.join(self.target, 'styles.css')))
+        self.assertTrue(os.path.isfile(os.path.join(self.target, 'CNAME')))
+
+    def test_manifest_paths_outside_target_are_refused(self):
+        outside = os.path.join(self.workdir.name, 'outside.txt')
+        write(outside, 'keep me')
+        write(os.path.join(self.target, TARGET_MANIFEST),
+              json.dumps({'../outside.txt': {"size": 7, "sha256": 'x'}}))
+
+        with self.assertRaises(ValueError):
+            sync_directory(self.source, self.target, build_manifest(self.source))
+        self.assertTrue(os.path.isfile(outside))
+        for path in ('/etc/passwd', 'a/../../b', ''):
+            with self.assertRaises(ValueError):
+                safe_path(self.target, path)
+
+    def test_tarball_deltas(self):
+        tarball = os.path.join(self.workdir.name, 'site.tar')
+
+        # Deltas are cumulative until applied: the second still holds index.html
+        sync_tarball(self.source, tarball, build_manifest(self.source), self.synced_file)
+        write(os.path.join(self.source, 'styles.css'), 'h1{color:blue}')
+        diff = sync_tarball(self.source, tarball, build_manifest(self.source), self.synced_file)
+        self.assertEqual(diff["added"], ['index.html', 'styles.css'])
+        stats = apply_tarball(tarball, self.target, self.synced_file)
+        self.assertEqual(stats, {"written": 2, "removed": 0})
+
+        # After the apply, a delta holds only what changed since
+        write(os.path.join(self.source, 'index.html'), '<h1>v2</h1>')
+        diff = sync_tarball(self.source, tarball, build_manifest(self.source), self.synced_file)
+        self.assertEqual(diff["changed"], ['index.html'])
+        self.assertEqual(diff["unchanged"], ['styles.css'])
+
+        # A delta made against another state is refused
+        stale = os.path.join(self.workdir.name, 'other.tar')
+        sync_tarball(self.source, stale, build_manifest(self.source), self.synced_file)
+        with self.assertRaisesRegex(ValueError, 'different state'):
+            apply_tarball(stale, self.target, self.synced_file)
+
+    def test_tarball_removed_paths_are_checked(self):
+        tarball = os.path.join(self.workdir.name, 'evil.tar')
+        outside = os.path.join(self.workdir.name, 'outside.txt')
+        write(outside, 'keep me')
+        record = json.dumps({"files": {}, "removed": ['../outside.txt'], "base": ''}).encode('utf-8')
+        with tarfile.open(tarball, 'w') as archive:
+            info = tarfile.TarInfo(TARGET_MANIFEST)
+            info.size = len(record)
+            archive.addfile(info, io.BytesIO(record))
+
+        with self.assertRaisesRegex(ValueError, 'unsafe path'):
+            apply_tarball(tarball, self.target, self.synced_file)
+        self.assertTrue(os.path.isfile(outside))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Link checker tests against a stub HTTP server on localhost
+"""
+
+import os
+import time
+import socket
+import asyncio
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from link_checker import check_external_urls, check_link_graph, link_cache_expiry, load_link_cache
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    /ok answers 200, /moved redirects to /ok, /gone is 404, /private is
+    403, and /no-head refuses HEAD but answers GET
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def _answer(self, with_body):
+        routes = {'/ok': 200, '/gone': 404, '/private': 403, '/moved': 301,
+                  '/no-head': 405 if self.command == 'HEAD' else 200}
+        status = routes.get(self.path, 404)
+        body = b'stub' if with_body else b''
+        self.send_response(status)
+        if status == 301:
+            self.send_header('Location', '/ok')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self._answer(False)
+
+    def do_GET(self):
+        self._answer(True)
+
+    def log_message(self, format, *args):
+        pass
+
+def closed_port():
+    # A port nothing listens on: bound once, then released
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class LinkCheckerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        cls.base = f'http://127.0.0.1:{cls.server.server_address[1]}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.workdir.name, 'links.json')
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def write_page(self, urls):
+        path = os.path.join(self.workdir.name, 'index.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('<!DOCTYPE html><html><body><h1 id="top">Links</h1><a href="#top">Top</a>')
+            f.writelines(f'<a href="{url}">link</a>' for url in urls)
+            f.write('</body></html>')
+        return path
+
+    def test_states(self):
+        unreachable = f'http://127.0.0.1:{closed_port()}/ok'
+        urls = [f'{self.base}/ok', f'{self.base}/moved', f'{self.base}/gone',
+                f'{self.base}/private', f'{self.base}/no-head', unreachable]
+        results = asyncio.run(check_external_urls(urls, interval=0, timeout=2.0))
+
+        self.assertEqual(results[f'{self.base}/ok']["state"], 'ok')
+        self.assertEqual(results[f'{self.base}/moved']["state"], 'ok')
+        self.assertEqual(results[f'{self.base}/moved']["final_url"], f'{self.base}/ok')
+        self.assertEqual(results[f'{self.base}/gone']["state"], 'broken')
+        self.assertEqual(results[f'{self.base}/gone']["status"], 404)
+        self.assertEqual(results[f'{self.base}/private']["state"], 'blocked')
+        self.assertEqual(results[f'{self.base}/no-head']["state"], 'ok')
+        self.assertEqual(results[unreachable]["state"], 'unreachable')
+
+    def test_only_working_links_are_cached(self):
+        unreachable = f'http://127.0.0.1:{closed_port()}/ok'
+        page = self.write_page([f'{self.base}/ok', f'{self.base}/gone', unreachable])
+        report = check_link_graph(page, cache_file=self.cache_file, interval=0, timeout=2.0)
+
+        self.assertEqual(report["local_problems"], [])
+        self.assertEqual(report["fetched"], 3)
+        self.assertEqual(sorted(load_link_cache(self.cache_file)), [f'{self.base}/ok'])
+
+        # The working link comes from the cache; the others are fetched again
+        report = check_link_graph(page, cache_file=self.cache_file, interval=0, timeout=2.0)
+        self.assertEqual(report["cached"], 1)
+        self.assertEqual(report["fetched"], 2)
+
+    def test_expiry(self):
+        page = self.write_page([f'{self.base}/ok'])
+        check_link_graph(page, cache_file=self.cache_file, ttl=60, interval=0, timeout=2.0)
+        checked = load_link_cache(self.cache_file)[f'{self.base}/ok']["checked"]
+        self.assertEqual(link_cache_expiry(page, self.cache_file, ttl=60), checked + 60)
+
+        # A link without a fresh cached result makes the check stale at once
+        page = self.write_page([f'{self.base}/ok', f'{self.base}/gone'])
+        check_link_graph(page, cache_file=self.cache_file, ttl=60, interval=0, timeout=2.0)
+        self.assertLessEqual(link_cache_expiry(page, self.cache_file, ttl=60), time.time())
+
+if __name__ == '__main__':
+    unittest.main()
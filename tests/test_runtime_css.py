@@ -0,0 +1,73 @@
+"""
+Runtime CSS hoisting tests: the cascade check must catch a hoist that
+changes where or under which at-rule the injected rules apply
+"""
+
+import os
+import glob
+import tempfile
+import unittest
+
+from runtime_css import hoist_runtime_css
+
+SCRIPT = """\
+document.addEventListener('DOMContentLoaded', function() {
+    addBadgeStyles();
+});
+
+function addBadgeStyles() {
+    if (document.querySelector('#badge-styles')) return;
+    const css = `.badge { color: red; }`;
+    const sheet = document.createElement('style');
+    sheet.id = 'badge-styles';
+    sheet.textContent = css;
+    document.head.appendChild(sheet);
+}
+"""
+
+class HoistRuntimeCssTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.dist = self.workdir.name
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def build(self, css, head_extra=''):
+        with open(os.path.join(self.dist, 'styles.css'), 'w', encoding='utf-8') as f:
+            f.write(css)
+        with open(os.path.join(self.dist, 'script.js'), 'w', encoding='utf-8') as f:
+            f.write(SCRIPT)
+        with open(os.path.join(self.dist, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write('<!DOCTYPE html><html><head><link rel="stylesheet" href="styles.css">'
+                    f'{head_extra}</head><body><span class="badge">new</span>'
+                    '<script src="script.js"></script></body></html>')
+
+    def test_hoist(self):
+        self.build('body{margin:0}')
+        stats = hoist_runtime_css(self.dist)
+        self.assertEqual(stats["sheets"], ['badge-styles'])
+        with open(os.path.join(self.dist, stats["stylesheet"]), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'body{margin:0}.badge{color:red}')
+        with open(os.path.join(self.dist, stats["script"]), encoding='utf-8') as f:
+            self.assertNotIn('createElement', f.read())
+        with open(os.path.join(self.dist, 'index.html'), encoding='utf-8') as f:
+            self.assertIn(stats["stylesheet"], f.read())
+
+    def test_unclosed_at_rule_is_refused(self):
+        # Appended to this stylesheet the injected rule would only apply in print
+        self.build('body{margin:0}@media print{p{color:black}')
+        with self.assertRaisesRegex(ValueError, 'changes the cascade'):
+            hoist_runtime_css(self.dist)
+        self.assertEqual(sorted(map(os.path.basename, glob.glob(os.path.join(self.dist, '*.css')))),
+                         ['styles.css'])
+
+    def test_later_stylesheet_in_head_is_refused(self):
+        # The runtime sheet follows this <style>; inside styles.css it would precede it
+        self.build('body{margin:0}', '<style>.badge{color:blue}</style>')
+        with self.assertRaisesRegex(ValueError, 'changes the cascade'):
+            hoist_runtime_css(self.dist)
+
+if __name__ == '__main__':
+    unittest.main()
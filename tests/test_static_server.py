@@ -0,0 +1,117 @@
+"""
+Static server tests: revalidation, byte ranges and bad input, against a
+built site in a temporary directory
+"""
+
+import os
+import gzip
+import asyncio
+import tempfile
+import unittest
+
+from static_server import StaticSite, handle_connection, parse_range, IMMUTABLE_CACHE_CONTROL
+
+PAGE = b'<!DOCTYPE html><html><body>' + b'x' * 200 + b'</body></html>'
+
+class StaticSiteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        root = self.workdir.name
+        with open(os.path.join(root, 'index.html'), 'wb') as f:
+            f.write(PAGE)
+        with open(os.path.join(root, 'index.html.gz'), 'wb') as f:
+            f.write(gzip.compress(PAGE))
+        with open(os.path.join(root, 'styles.3f9a1c2e.css'), 'wb') as f:
+            f.write(b'body{margin:0}')
+        self.site = StaticSite(root)
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_revalidation(self):
+        status, headers, body, encoding = self.site.respond('GET', '/', {'accept-encoding': 'gzip'})
+        self.assertEqual((status, encoding), (200, 'gzip'))
+        self.assertEqual(gzip.decompress(body), PAGE)
+        etag = dict(headers)['ETag']
+
+        status, headers, body, _ = self.site.respond('GET', '/', {'accept-encoding': 'gzip',
+                                                                   'if-none-match': etag})
+        self.assertEqual((status, body), (304, b''))
+        status = self.site.respond('GET', '/', {'if-none-match': etag})[0]
+        self.assertEqual(status, 200, "the identity body has its own ETag")
+
+        headers = dict(self.site.respond('GET', '/styles.3f9a1c2e.css', {})[1])
+        self.assertEqual(headers['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_ranges(self):
+        status, headers, body, encoding = self.site.respond('GET', '/', {'range': 'bytes=0-9',
+                                                                         'accept-encoding': 'gzip'})
+        self.assertEqual((status, body, encoding), (206, PAGE[:10], None))
+        self.assertEqual(dict(headers)['Content-Range'], f'bytes 0-9/{len(PAGE)}')
+        self.assertEqual(self.site.respond('GET', '/', {'range': 'bytes=-5'})[2], PAGE[-5:])
+
+        # Valid but past the end: 416
+        status, headers, _, _ = self.site.respond('GET', '/', {'range': f'bytes={len(PAGE)}-'})
+        self.assertEqual(status, 416)
+        self.assertEqual(dict(headers)['Content-Range'], f'bytes */{len(PAGE)}')
+
+        # Invalid ranges are ignored and the whole body sent
+        for header in ('bytes=5-3', 'bytes=0-1,4-5', 'items=0-1'):
+            status, _, body, _ = self.site.respond('GET', '/', {'range': header})
+            self.assertEqual((status, body), (200, PAGE), header)
+        self.assertIsNone(parse_range('bytes=5-3', 10))
+        with self.assertRaises(ValueError):
+            parse_range('bytes=-0', 10)
+
+    def test_bad_targets(self):
+        self.assertEqual(self.site.respond('GET', '/%00', {})[0], 400)
+        self.assertEqual(self.site.respond('GET', '/%ff%fe', {})[0], 400)
+        self.assertEqual(self.site.respond('GET', '/../../etc/passwd', {})[0], 404)
+        self.assertEqual(self.site.respond('POST', '/', {})[0], 405)
+
+    def exchange(self, request, site=None):
+        # Send raw bytes to a real connection handler and return everything it answers
+        site = site or self.site
+
+        async def run():
+            server = await asyncio.start_server(
+                lambda reader, writer: handle_connection(reader, writer, site, log=False), '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(request)
+                await writer.drain()
+                response = await asyncio.wait_for(reader.read(), 5)
+                writer.close()
+                return response
+
+        return asyncio.run(run())
+
+    def test_malformed_requests(self):
+        for request in (b'GARBAGE\r\n\r\n',
+                        b'GET / HTTP/1.1\r\nContent-Length: abc\r\n\r\n',
+                        b'GET / HTTP/1.1\r\nContent-Length: -1\r\n\r\n'):
+            self.assertTrue(self.exchange(request).startswith(b'HTTP/1.1 400 '), request)
+        response = self.exchange(b'GET /%00 HTTP/1.1\r\nConnection: close\r\n\r\n')
+        self.assertTrue(response.startswith(b'HTTP/1.1 400 '))
+
+    def test_unexpected_error_answers_500(self):
+        site = StaticSite(self.workdir.name)
+        calls = []
+
+        def respond(method, target, headers):
+            calls.append(target)
+            if target == '/boom':
+                raise RuntimeError('boom')
+            return StaticSite.respond(site, method, target, headers)
+
+        site.respond = respond
+        # The connection survives the failure and answers the next request too
+        response = self.exchange(b'GET /boom HTTP/1.1\r\n\r\nGET / HTTP/1.1\r\nConnection: close\r\n\r\n', site)
+        self.assertTrue(response.startswith(b'HTTP/1.1 500 '))
+        self.assertIn(b'HTTP/1.1 200 OK', response)
+        self.assertEqual(calls, ['/boom', '/'])
+
+if __name__ == '__main__':
+    unittest.main()